@@ -0,0 +1,38 @@
+# benchmarks/bench_fft.py
+#
+# Spektrum per frame 2 channel: compute_fft lama (per channel, complex FFT penuh)
+# vs SpectrumEngine.compute_batch (rfft float32 untuk semua channel sekaligus).
+# Jalankan dari folder PoC/DearPyGUI:  python -m benchmarks.bench_fft
+
+from benchmarks.harness import (DEFAULT_SIZES, SAMPLE_RATE, default_repeats, measure, print_table,
+                                run_isolated, summarize, synthetic_frame_data)
+from functions.data_processing import compute_fft
+from functions.spectrum import SpectrumEngine
+
+def _compute_fft_case(n_samples, repeats):
+    data = synthetic_frame_data(n_samples)
+
+    def spectrum():
+        for channel in data:
+            compute_fft(channel, SAMPLE_RATE)
+
+    return {"benchmark": "fft", "case": "compute_fft", "samples_per_channel": n_samples,
+            **summarize(measure(spectrum, repeats))}
+
+def _engine_case(n_samples, repeats):
+    data = synthetic_frame_data(n_samples)
+    engine = SpectrumEngine()
+    latencies = measure(lambda: engine.compute_batch(data, SAMPLE_RATE), repeats)
+    return {"benchmark": "fft", "case": "SpectrumEngine.compute_batch", "samples_per_channel": n_samples,
+            **summarize(latencies)}
+
+def run(sizes=DEFAULT_SIZES, repeats=None):
+    results = []
+    for n in sizes:
+        count = repeats or default_repeats(n)
+        results.append(run_isolated(_compute_fft_case, n, count))
+        results.append(run_isolated(_engine_case, n, count))
+    return results
+
+if __name__ == "__main__":
+    print_table(run())
@@ -0,0 +1,85 @@
+# benchmarks/bench_loader.py
+#
+# Loader: loader struct.unpack lama (baseline), load_and_process_data (file mentah
+# lama) dan load_acquisition_file + channels_to_float (frame file dengan header),
+# per ukuran capture.
+# Jalankan dari folder PoC/DearPyGUI:  python -m benchmarks.bench_loader
+
+import os
+import shutil
+import struct
+import tempfile
+
+import numpy as np
+
+from benchmarks.harness import (DEFAULT_SIZES, SAMPLE_RATE, default_repeats, measure, print_table,
+                                run_isolated, summarize, write_capture)
+from functions.data_processing import channels_to_float, load_and_process_data
+from functions.sources import load_acquisition_file
+
+# Baseline struct.unpack membuat satu objek int Python per sampel (~1.5 GB pada
+# capture 64 MiB), jadi hanya diukur sampai ukuran ini
+BASELINE_MAX_SAMPLES = 1 << 24
+
+def load_with_struct_unpack(filepath, sr):
+    """Loader sebelum optimasi NumPy (dipertahankan sebagai baseline)."""
+    if not os.path.exists(filepath):
+        return None, None, None, None
+    with open(filepath, "rb") as f:
+        data = f.read()
+    if not data:
+        return np.array([]), np.array([]), 0, sr
+    values = np.array(struct.unpack(f"<{len(data)//2}H", data), dtype=np.float32)
+    ch1 = values[::2]
+    ch2 = values[1::2]
+    ch1 -= np.mean(ch1)
+    ch2 -= np.mean(ch2)
+    return ch1, ch2, len(ch1), sr
+
+def _load_struct_case(n_samples, repeats):
+    directory = tempfile.mkdtemp(prefix="uiradar_bench_")
+    try:
+        path = write_capture(directory, n_samples, framed=False)
+        latencies = measure(lambda: load_with_struct_unpack(path, SAMPLE_RATE), repeats)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return {"benchmark": "loader", "case": "struct.unpack (baseline)", "samples_per_channel": n_samples,
+            **summarize(latencies)}
+
+def _load_raw_case(n_samples, repeats):
+    directory = tempfile.mkdtemp(prefix="uiradar_bench_")
+    try:
+        path = write_capture(directory, n_samples, framed=False)
+        latencies = measure(lambda: load_and_process_data(path, SAMPLE_RATE), repeats)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return {"benchmark": "loader", "case": "load_and_process_data", "samples_per_channel": n_samples,
+            **summarize(latencies)}
+
+def _load_frame_case(n_samples, repeats):
+    directory = tempfile.mkdtemp(prefix="uiradar_bench_")
+    try:
+        path = write_capture(directory, n_samples, framed=True)
+
+        def load():
+            _, _, _, raw_channels = load_acquisition_file(path, None)
+            channels_to_float(raw_channels)
+
+        latencies = measure(load, repeats)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return {"benchmark": "loader", "case": "frame_file+channels_to_float", "samples_per_channel": n_samples,
+            **summarize(latencies)}
+
+def run(sizes=DEFAULT_SIZES, repeats=None):
+    results = []
+    for n in sizes:
+        count = repeats or default_repeats(n)
+        if n <= BASELINE_MAX_SAMPLES:
+            results.append(run_isolated(_load_struct_case, n, count))
+        results.append(run_isolated(_load_raw_case, n, count))
+        results.append(run_isolated(_load_frame_case, n, count))
+    return results
+
+if __name__ == "__main__":
+    print_table(run())
@@ -0,0 +1,98 @@
+# benchmarks/bench_pipeline.py
+#
+# Pipeline lengkap headless: rekaman sintetis diputar ulang dengan ReplaySource
+# secepat mungkin -> acquisition_worker -> FrameHub -> worker FFT, waveform,
+# waterfall dan detektor CFAR, persis seperti mode thread di main.py. Subscriber
+# memakai queue drop-oldest seperti aplikasi, jadi frames/s per tahap adalah laju
+# yang benar-benar sanggup diproses dan frames_dropped adalah frame yang dilewati
+# tahap itu.
+# Jalankan dari folder PoC/DearPyGUI:  python -m benchmarks.bench_pipeline
+
+import shutil
+import tempfile
+import threading
+import time
+
+from benchmarks.harness import (DEFAULT_SIZES, default_repeats, print_table, run_isolated, summarize,
+                                write_recording)
+from functions.acquisition import FrameHub
+from functions.data_processing import (acquisition_worker, detection_data_worker, fft_data_worker, sinewave_data_worker,
+                                       waterfall_data_worker)
+from functions.sources import ReplaySource
+
+WORKERS = {
+    "fft": fft_data_worker,
+    "sinewave": sinewave_data_worker,
+    "waterfall": waterfall_data_worker,
+    "detection": detection_data_worker,
+}
+
+# Frame besar membuat rekaman berukuran GB; pipeline dibatasi ke ukuran frame aplikasi
+MAX_SAMPLES = 1 << 20
+
+class _ResultCollector:
+    """Pengganti kanal hasil: mencatat latensi timestamp akuisisi -> hasil selesai."""
+
+    def __init__(self):
+        self.latencies = []
+        self.last_result = None
+
+    def put(self, result, block=True, timeout=None):
+        if result.get("status") == "done":
+            self.last_result = time.perf_counter()
+            self.latencies.append(time.time() - result["timestamp"])
+        return True
+
+    def put_nowait(self, result):
+        return self.put(result)
+
+def _pipeline_case(n_samples, n_frames):
+    directory = tempfile.mkdtemp(prefix="uiradar_bench_")
+    try:
+        source = ReplaySource(write_recording(directory, n_samples, n_frames), speed=0, loop=False)
+        hub = FrameHub()
+        stop_event = threading.Event()
+        collectors = {name: _ResultCollector() for name in WORKERS}
+        frame_queues = {name: hub.subscribe() for name in WORKERS}
+        threads = [threading.Thread(target=worker, args=(frame_queues[name], collectors[name], stop_event), daemon=True)
+                   for name, worker in WORKERS.items()]
+        threads.append(threading.Thread(target=acquisition_worker, args=(hub, stop_event, source), daemon=True))
+
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        # Selesai jika semua frame sudah diputar dan semua tahap sudah menghabiskan queue-nya
+        while source.replayed < n_frames or any(q.qsize() for q in frame_queues.values()):
+            time.sleep(0.01)
+        time.sleep(0.5) # Frame terakhir yang sedang diproses
+        stop_event.set()
+        for thread in threads:
+            thread.join(timeout=5)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    results = []
+    for name, collector in collectors.items():
+        elapsed = (collector.last_result or start) - start
+        results.append({"benchmark": "pipeline", "case": name, "samples_per_channel": n_samples,
+                        **summarize(collector.latencies, elapsed), "frames_in": n_frames,
+                        "frames_dropped": frame_queues[name].dropped})
+    return results
+
+def _run_case(n_samples, n_frames):
+    # run_isolated mengharapkan satu dict; hasil per tahap dibungkus lalu dibuka di run()
+    return {"cases": _pipeline_case(n_samples, n_frames)}
+
+def run(sizes=DEFAULT_SIZES, repeats=None):
+    results = []
+    for n in sizes:
+        if n > MAX_SAMPLES:
+            continue
+        result = run_isolated(_run_case, n, repeats or min(64, default_repeats(n)))
+        for case in result["cases"]:
+            case["peak_rss_mb"] = result["peak_rss_mb"]
+            results.append(case)
+    return results
+
+if __name__ == "__main__":
+    print_table(run())
@@ -0,0 +1,56 @@
+# benchmarks/bench_queues.py
+#
+# Handoff antar thread: queue.Queue (tanpa batas), BoundedChannel dan
+# LatestValueMailbox. Produsen mengirim pesan secepatnya, konsumen mengambil
+# di thread lain; latensi = waktu diterima - waktu dikirim (perf_counter).
+# Jalankan dari folder PoC/DearPyGUI:  python -m benchmarks.bench_queues
+
+import queue
+import threading
+import time
+
+from benchmarks.harness import print_table, run_isolated, summarize
+from functions.channels import BoundedChannel, LatestValueMailbox
+
+MESSAGES = 100_000
+
+CHANNELS = {
+    "queue.Queue": lambda: queue.Queue(),
+    "BoundedChannel(block)": lambda: BoundedChannel(64, overflow="block"),
+    "BoundedChannel(drop_oldest)": lambda: BoundedChannel(64, overflow="drop_oldest"),
+    "LatestValueMailbox": lambda: LatestValueMailbox(),
+}
+
+_DONE = object()
+
+def _handoff_case(name, n_messages):
+    channel = CHANNELS[name]()
+    latencies = []
+
+    def consume():
+        while True:
+            item = channel.get()
+            if item is _DONE:
+                break
+            latencies.append(time.perf_counter() - item)
+
+    consumer = threading.Thread(target=consume)
+    start = time.perf_counter()
+    consumer.start()
+    for _ in range(n_messages):
+        channel.put(time.perf_counter())
+    # Mailbox bisa menimpa penanda selesai yang belum terbaca, jadi dikirim sampai diterima
+    while consumer.is_alive():
+        channel.put(_DONE)
+        consumer.join(timeout=0.01)
+    elapsed = time.perf_counter() - start
+
+    summary = summarize(latencies, elapsed)
+    summary["frames_dropped"] = n_messages - len(latencies)
+    return {"benchmark": "queues", "case": name, "samples_per_channel": 0, **summary}
+
+def run(n_messages=MESSAGES):
+    return [run_isolated(_handoff_case, name, n_messages) for name in CHANNELS]
+
+if __name__ == "__main__":
+    print_table(run())
@@ -0,0 +1,146 @@
+# benchmarks/bench_sources.py
+#
+# Sumber akuisisi (functions/sources.py) lewat antarmuka yang sama dengan
+# acquisition_worker: read() + channels_to_float + release() per frame. Produsen
+# (penulis file, ring, pty) menyiapkan frame di luar waktu yang diukur, kecuali
+# serial: waktu read() di sana termasuk transfer byte lewat pty.
+# Jalankan dari folder PoC/DearPyGUI:  python -m benchmarks.bench_sources
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from benchmarks.harness import (CHANNELS, DEFAULT_SIZES, SAMPLE_RATE, default_repeats, print_table,
+                                run_isolated, summarize, synthetic_interleaved)
+from config import SHM_MAX_SAMPLES
+from functions.data_processing import channels_to_float
+from functions.frame_file import write_frame_file
+from functions.shm_ring import SharedFrameRing
+from functions.sources import FileSource, RawFileSource, SerialSource, SharedMemorySource
+
+# Serial dibatasi ke frame kecil: pada line rate nyata frame besar butuh detik
+SERIAL_MAX_SAMPLES = 1 << 16
+SYNC_WORD = b"\xa5\x5a\xc3\x3c"
+
+def _measure_source(source, produce, repeats):
+    """Durasi read + unpack + release per frame; produce() menyiapkan frame berikutnya."""
+    latencies = []
+    for index in range(repeats + 1):
+        produce()
+        start = time.perf_counter()
+        raw = source.read(timeout=5.0)
+        if raw is None:
+            raise RuntimeError(f"Sumber '{source.name}' tidak mengirim frame")
+        channels_to_float(raw.data)
+        source.release(raw)
+        del raw
+        if index > 0: # Frame pertama sebagai warmup
+            latencies.append(time.perf_counter() - start)
+    return latencies
+
+def _file_case(n_samples, repeats):
+    directory = tempfile.mkdtemp(prefix="uiradar_bench_")
+    interleaved = synthetic_interleaved(n_samples)
+    path = os.path.join(directory, "capture.bin")
+    seq = [1]
+    write_frame_file(path, interleaved, CHANNELS, seq[0], SAMPLE_RATE)
+    source = FileSource(path, "auto", 0.001) # File yang sudah ada dibaca sebagai frame pertama
+
+    def produce():
+        if source.frames > 0:
+            seq[0] += 1
+            write_frame_file(path, interleaved, CHANNELS, seq[0], SAMPLE_RATE)
+
+    try:
+        latencies = _measure_source(source, produce, repeats)
+    finally:
+        source.close()
+        shutil.rmtree(directory, ignore_errors=True)
+    return latencies
+
+def _shm_case(n_samples, repeats):
+    interleaved = synthetic_interleaved(n_samples)
+    name = f"uiradar_bench_{os.getpid()}"
+    ring = SharedFrameRing.create(name, 4, n_samples, CHANNELS)
+    source = SharedMemorySource(name, untracked=False) # Penulis di proses yang sama
+    try:
+        latencies = _measure_source(source, lambda: ring.write(interleaved, SAMPLE_RATE), repeats)
+    finally:
+        source.close()
+        ring.close()
+    return latencies
+
+def _raw_case(n_samples, repeats):
+    directory = tempfile.mkdtemp(prefix="uiradar_bench_")
+    path = os.path.join(directory, "capture.bin")
+    synthetic_interleaved(n_samples).tofile(path)
+    source = RawFileSource(path, n_samples, CHANNELS, SAMPLE_RATE, realtime=False, loop=True)
+    try:
+        latencies = _measure_source(source, lambda: None, repeats)
+    finally:
+        source.close()
+        shutil.rmtree(directory, ignore_errors=True)
+    return latencies
+
+def _serial_case(n_samples, repeats):
+    import io
+    import pty
+    import tty
+
+    master, slave = pty.openpty()
+    tty.setraw(slave)
+    # Sync word frame berikutnya ikut dikirim agar decoder bisa mengonfirmasi batas frame
+    body = synthetic_interleaved(n_samples).tobytes() + SYNC_WORD
+    source = SerialSource(io.FileIO(slave, "rb"), samples_per_frame=n_samples, channels=CHANNELS,
+                          sync_word=SYNC_WORD, sample_rate=SAMPLE_RATE)
+    writers = []
+
+    def produce():
+        # Dikirim dari thread lain karena pty hanya menampung beberapa KB
+        if writers:
+            writers[-1].join()
+        data = body if writers else SYNC_WORD + body
+        writers.append(threading.Thread(target=_write_all, args=(master, data)))
+        writers[-1].start()
+
+    try:
+        latencies = _measure_source(source, produce, repeats)
+    finally:
+        if writers:
+            writers[-1].join()
+        os.close(master)
+        source.close()
+    return latencies
+
+def _write_all(fd, data):
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+CASES = {
+    "file": _file_case,
+    "shm": _shm_case,
+    "raw": _raw_case,
+    "serial(pty)": _serial_case,
+}
+
+def _source_case(name, n_samples, repeats):
+    latencies = CASES[name](n_samples, repeats)
+    return {"benchmark": "sources", "case": name, "samples_per_channel": n_samples, **summarize(latencies)}
+
+def run(sizes=DEFAULT_SIZES, repeats=None):
+    results = []
+    for n in sizes:
+        count = repeats or default_repeats(n)
+        for name in CASES:
+            if name == "shm" and n > SHM_MAX_SAMPLES:
+                continue # Kapasitas slot ring di aplikasi
+            if name == "serial(pty)" and (n > SERIAL_MAX_SAMPLES or os.name != "posix"):
+                continue
+            results.append(run_isolated(_source_case, name, n, count))
+    return results
+
+if __name__ == "__main__":
+    print_table(run())
@@ -0,0 +1,54 @@
+# benchmarks/bench_spectrum.py
+#
+# Microbenchmark: compute_fft lama vs SpectrumEngine (rfft + buffer yang dipakai ulang).
+# "alloc" adalah puncak tracemalloc selama pemanggilan berulang; untuk engine
+# yang tersisa hanya objek view kecil (ratusan byte), bukan array data.
+# Jalankan dari folder PoC/DearPyGUI:  python -m benchmarks.bench_spectrum
+
+import time
+import tracemalloc
+import numpy as np
+
+from functions.data_processing import compute_fft
+from functions.spectrum import SpectrumEngine
+
+SAMPLE_RATE = 20_000_000
+SIZES = [4096, 65536, 1 << 20]
+REPEATS = 50
+
+def time_per_call(func, repeats):
+    func() # Pemanasan (cache plan & buffer)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return (time.perf_counter() - start) / repeats
+
+def steady_state_allocations(func, repeats=10):
+    """Puncak memori (byte) yang dialokasikan selama pemanggilan berulang."""
+    func()
+    tracemalloc.start()
+    for _ in range(repeats):
+        func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'n':>9} {'baseline (us)':>14} {'engine (us)':>12} {'speedup':>8} {'baseline alloc':>15} {'engine alloc':>13}")
+    for n in SIZES:
+        channel = rng.standard_normal(n).astype(np.float32)
+        engine = SpectrumEngine()
+
+        baseline = lambda: compute_fft(channel, SAMPLE_RATE)
+        optimized = lambda: engine.compute(channel, SAMPLE_RATE)
+
+        t_base = time_per_call(baseline, REPEATS)
+        t_engine = time_per_call(optimized, REPEATS)
+        alloc_base = steady_state_allocations(baseline)
+        alloc_engine = steady_state_allocations(optimized)
+        print(f"{n:>9} {t_base * 1e6:>14.1f} {t_engine * 1e6:>12.1f} {t_base / t_engine:>7.2f}x "
+              f"{alloc_base:>15} {alloc_engine:>13}")
+
+if __name__ == "__main__":
+    main()
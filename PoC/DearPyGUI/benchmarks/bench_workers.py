@@ -0,0 +1,70 @@
+# benchmarks/bench_workers.py
+#
+# Worker loop headless (tanpa viewport Dear PyGui): fft_data_worker,
+# sinewave_data_worker dan waterfall_data_worker dijalankan di thread seperti
+# di main.py. Produsen mengirim frame secepat worker sanggup menerima
+# (kanal "block"), lalu latensi per frame = waktu hasil diterima - timestamp frame.
+# Jalankan dari folder PoC/DearPyGUI:  python -m benchmarks.bench_workers
+
+import threading
+import time
+
+from benchmarks.harness import (DEFAULT_SIZES, SAMPLE_RATE, default_repeats, print_table, run_isolated,
+                                summarize, synthetic_frame_data)
+from functions.acquisition import Frame
+from functions.channels import BoundedChannel
+from functions.data_processing import fft_data_worker, sinewave_data_worker, waterfall_data_worker
+
+WORKERS = {
+    "fft_data_worker": fft_data_worker,
+    "sinewave_data_worker": sinewave_data_worker,
+    "waterfall_data_worker": waterfall_data_worker,
+}
+
+def _worker_case(name, n_samples, n_frames):
+    data = synthetic_frame_data(n_samples)
+    frame_channel = BoundedChannel(2, overflow="block")
+    result_channel = BoundedChannel(4 * n_frames + 16, overflow="drop_oldest")
+    stop_event = threading.Event()
+    worker = threading.Thread(target=WORKERS[name], args=(frame_channel, result_channel, stop_event), daemon=True)
+    worker.start()
+
+    # Pemanasan: satu frame untuk alokasi buffer/plan, tidak diukur
+    frame_channel.put(Frame(0, time.time(), SAMPLE_RATE, data.copy()))
+    while result_channel.get().get("status") != "done":
+        pass
+
+    latencies = []
+    start = time.perf_counter()
+
+    def produce():
+        for seq in range(1, n_frames + 1):
+            frame_channel.put(Frame(seq, time.time(), SAMPLE_RATE, data.copy() if seq == 1 else data))
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    while len(latencies) < n_frames:
+        try:
+            result = result_channel.get(timeout=30)
+        except Exception:
+            break # Worker tidak menghasilkan output (misalnya frame terlalu pendek untuk STFT)
+        if result.get("status") == "done":
+            latencies.append(time.time() - result["timestamp"])
+    elapsed = time.perf_counter() - start
+
+    stop_event.set()
+    producer.join()
+    worker.join(timeout=5)
+    return {"benchmark": "workers", "case": name, "samples_per_channel": n_samples,
+            **summarize(latencies, elapsed), "frames_dropped": result_channel.dropped}
+
+def run(sizes=DEFAULT_SIZES, repeats=None):
+    results = []
+    for n in sizes:
+        count = repeats or default_repeats(n)
+        for name in WORKERS:
+            results.append(run_isolated(_worker_case, name, n, count))
+    return results
+
+if __name__ == "__main__":
+    print_table(run())
@@ -0,0 +1,159 @@
+# benchmarks/harness.py
+#
+# Helper bersama untuk suite benchmark: pengukuran latensi per frame, ringkasan
+# persentil, peak RSS, capture sintetis dan isolasi tiap kasus di proses terpisah.
+
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import time
+import numpy as np
+
+from functions.frame_file import write_frame_file
+from functions.recorder import Recorder
+from functions.signal_gen import create_scenario
+
+SAMPLE_RATE = 20_000_000
+CHANNELS = 2
+
+# 4K .. 64M sampel per channel
+DEFAULT_SIZES = [1 << 12, 1 << 16, 1 << 20, 1 << 24, 1 << 26]
+
+# --- Pengukuran --- #
+
+def default_repeats(n_samples, budget=1 << 25, minimum=3, maximum=200):
+    """Jumlah ulangan agar setiap kasus memproses sekitar `budget` sampel."""
+    return int(min(maximum, max(minimum, budget // n_samples)))
+
+def measure(func, repeats, warmup=1):
+    """Menjalankan func berulang dan mengembalikan durasi tiap pemanggilan (detik)."""
+    for _ in range(warmup):
+        func()
+    latencies = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+def summarize(latencies, elapsed=None):
+    """
+    frames/s dan persentil latensi per frame (ms). `elapsed` adalah waktu total
+    (untuk pipeline yang frame-nya tumpang tindih); default jumlah latensi.
+    """
+    latencies = np.asarray(latencies, dtype=np.float64)
+    if len(latencies) == 0:
+        return {"frames": 0, "frames_per_s": 0.0}
+    elapsed = latencies.sum() if elapsed is None else elapsed
+    p50, p90, p99 = np.percentile(latencies, [50, 90, 99]) * 1e3
+    return {
+        "frames": len(latencies),
+        "frames_per_s": len(latencies) / elapsed if elapsed > 0 else float("inf"),
+        "mean_ms": float(latencies.mean() * 1e3),
+        "p50_ms": float(p50), "p90_ms": float(p90), "p99_ms": float(p99),
+        "max_ms": float(latencies.max() * 1e3),
+    }
+
+def peak_rss_mb():
+    """Peak resident set size proses ini (MB), atau None jika tidak tersedia."""
+    try:
+        import resource
+    except ImportError:
+        return None # Windows
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux melaporkan KB, macOS melaporkan byte
+    return peak / (1 << 20) if platform.system() == "Darwin" else peak / 1024
+
+# --- Data Sintetis --- #
+
+def synthetic_interleaved(n_samples, channels=CHANNELS, seed=0):
+    """Sampel uint16 interleaved: nada + noise di sekitar titik tengah ADC."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(n_samples, dtype=np.float32)
+    data = np.empty((n_samples, channels), dtype=np.uint16)
+    for channel in range(channels):
+        tone = 1000 * np.sin(2 * np.pi * (0.01 + 0.005 * channel) * t)
+        noise = rng.normal(0, 50, n_samples).astype(np.float32)
+        data[:, channel] = np.clip(32768 + tone + noise, 0, 65535)
+    return data.reshape(-1)
+
+def write_capture(directory, n_samples, channels=CHANNELS, framed=True, seed=0):
+    """Menulis capture sintetis (frame file dengan header, atau data mentah lama)."""
+    interleaved = synthetic_interleaved(n_samples, channels, seed)
+    path = os.path.join(directory, f"capture_{n_samples}_{'frame' if framed else 'raw'}.bin")
+    if framed:
+        write_frame_file(path, interleaved, channels, 1, SAMPLE_RATE)
+    else:
+        interleaved.tofile(path)
+    return path
+
+def synthetic_frame_data(n_samples, channels=CHANNELS, seed=0):
+    """Data frame float32 (channels, n) seperti keluaran tahap akuisisi."""
+    interleaved = synthetic_interleaved(n_samples, channels, seed)
+    data = np.ascontiguousarray(interleaved.reshape(n_samples, channels).T, dtype=np.float32)
+    data -= data.mean(axis=1, keepdims=True)
+    return data
+
+def write_recording(directory, n_samples, n_frames, scenario="radar", channels=CHANNELS, seed=0):
+    """
+    Menulis rekaman sintetis (format functions/recorder.py) berisi `n_frames`
+    frame dari generator sinyal, dengan timestamp berjarak durasi frame.
+    Mengembalikan path rekamannya, untuk diputar ulang dengan ReplaySource.
+    """
+    generator = create_scenario(scenario, SAMPLE_RATE, channels, seed)
+    recorder = Recorder(directory, block_bytes=max(1 << 20, 4 * n_samples * channels), n_blocks=4)
+    path = recorder.start("bench")
+    start = time.time()
+    for seq in range(1, n_frames + 1):
+        interleaved = generator.generate_interleaved(n_samples)
+        while not recorder.submit(seq, start + (seq - 1) * n_samples / SAMPLE_RATE, SAMPLE_RATE,
+                                  interleaved.reshape(n_samples, channels).T):
+            time.sleep(0.01) # Buffer penuh: tunggu penulis (di benchmark tidak boleh ada frame hilang)
+    recorder.stop()
+    return path
+
+# --- Isolasi & Output --- #
+
+def _run_case(func, args):
+    result = func(*args)
+    result["peak_rss_mb"] = peak_rss_mb()
+    return result
+
+def run_isolated(func, *args):
+    """
+    Menjalankan satu kasus di proses baru ("spawn") agar peak RSS yang
+    dilaporkan milik kasus itu saja, bukan akumulasi kasus sebelumnya.
+    `func` harus fungsi level modul yang mengembalikan dict.
+    """
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        return pool.apply(_run_case, (func, args))
+
+def metadata():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+def write_results(results, filepath):
+    with open(filepath, "w") as f:
+        json.dump({"meta": metadata(), "results": results}, f, indent=2)
+
+def print_table(results):
+    print(f"{'benchmark':<10} {'case':<28} {'n/ch':>10} {'frames/s':>10} {'p50 ms':>9} "
+          f"{'p99 ms':>9} {'RSS MB':>8}")
+    for r in results:
+        rss = r.get("peak_rss_mb")
+        print(f"{r['benchmark']:<10} {r['case']:<28} {r.get('samples_per_channel', 0):>10} "
+              f"{r.get('frames_per_s', 0):>10.1f} {r.get('p50_ms', 0):>9.3f} {r.get('p99_ms', 0):>9.3f} "
+              f"{rss if rss is None else round(rss, 1):>8}")
@@ -0,0 +1,60 @@
+# benchmarks/run_all.py
+#
+# Menjalankan seluruh suite benchmark headless dan menulis hasilnya sebagai JSON,
+# agar regresi terlihat dengan membandingkan file hasil antar commit.
+# Jalankan dari folder PoC/DearPyGUI:
+#   python -m benchmarks.run_all --output bench.json
+#   python -m benchmarks.run_all --max-size 1048576 --compare bench_lama.json
+
+import argparse
+import json
+
+from benchmarks import bench_fft, bench_loader, bench_pipeline, bench_queues, bench_sources, bench_workers
+from benchmarks.harness import DEFAULT_SIZES, print_table, write_results
+
+SUITES = {
+    "loader": bench_loader.run,
+    "sources": bench_sources.run,
+    "fft": bench_fft.run,
+    "workers": bench_workers.run,
+    "pipeline": bench_pipeline.run,
+}
+
+def compare(results, baseline_path):
+    """Mencetak perubahan frames/s terhadap file hasil sebelumnya."""
+    with open(baseline_path) as f:
+        baseline = {(r["benchmark"], r["case"], r.get("samples_per_channel")): r for r in json.load(f)["results"]}
+    print(f"\n{'benchmark':<10} {'case':<28} {'n/ch':>10} {'before':>10} {'after':>10} {'change':>8}")
+    for r in results:
+        old = baseline.get((r["benchmark"], r["case"], r.get("samples_per_channel")))
+        if old is None or not old.get("frames_per_s"):
+            continue
+        change = r["frames_per_s"] / old["frames_per_s"] - 1
+        print(f"{r['benchmark']:<10} {r['case']:<28} {r.get('samples_per_channel', 0):>10} "
+              f"{old['frames_per_s']:>10.1f} {r['frames_per_s']:>10.1f} {change:>+8.1%}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Suite benchmark pipeline data_processing (headless).")
+    parser.add_argument("--suites", nargs="+", choices=[*SUITES, "queues"], default=[*SUITES, "queues"])
+    parser.add_argument("--max-size", type=int, default=DEFAULT_SIZES[-1],
+                        help="Ukuran capture terbesar (sampel per channel)")
+    parser.add_argument("--repeats", type=int, default=None, help="Jumlah frame per kasus (default: adaptif)")
+    parser.add_argument("--output", default="bench_results.json", help="File JSON hasil")
+    parser.add_argument("--compare", default=None, help="File JSON hasil sebelumnya untuk dibandingkan")
+    args = parser.parse_args()
+
+    sizes = [n for n in DEFAULT_SIZES if n <= args.max_size]
+    results = []
+    for name in args.suites:
+        print(f"Running '{name}'...")
+        results += bench_queues.run() if name == "queues" else SUITES[name](sizes, args.repeats)
+
+    print()
+    print_table(results)
+    write_results(results, args.output)
+    print(f"\nResults written to '{args.output}'.")
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == "__main__":
+    main()
@@ -11,13 +11,136 @@ PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
 # Nama file data yang akan dipantau. Path ini sekarang absolut dan andal.
 FILENAME = os.path.join(PROJECT_ROOT, "live_acquisition_ui.bin")
 
+# --- Konfigurasi Transport Akuisisi ---
+# "file"   -> frame dibaca dari FILENAME
+# "shm"    -> frame dibaca dari ring buffer shared memory (tanpa filesystem)
+# "serial" -> stream sampel dari port serial (SERIAL_PORT), lihat functions/serial_receiver.py
+# "raw"    -> memutar file capture mentah (RAW_FILE_PATH) per blok
+# "replay" -> memutar rekaman dari tombol Record (REPLAY_PATH)
+ACQUISITION_TRANSPORT = "file"
+# Jumlah channel ADC (interleaved)
+ACQUISITION_CHANNELS = 2
+
+# Nama segmen shared memory dan ukuran ring (untuk transport "shm")
+SHM_NAME = "uiradar_frames"
+SHM_SLOTS = 8
+SHM_MAX_SAMPLES = 1 << 20  # Kapasitas per slot (sampel per channel)
+
+# Transport "serial": port, baud rate, ukuran frame (sampel per channel) dan
+# sync word di awal setiap frame (None = stream mentah tanpa penanda frame)
+SERIAL_PORT = "COM2" if os.name == "nt" else "/dev/ttyUSB0"
+SERIAL_BAUD_RATE = 115200
+SERIAL_SAMPLES_PER_FRAME = 1024
+SERIAL_SYNC_WORD = b"\xa5\x5a\xc3\x3c"
+
+# Transport "replay": memutar rekaman (functions/recorder.py). REPLAY_PATH None =
+# rekaman terbaru di RECORD_DIRECTORY. REPLAY_SPEED 1.0 = kecepatan asli,
+# 4.0 = 4x lebih cepat, 0 = secepat mungkin.
+REPLAY_PATH = None
+REPLAY_SPEED = 1.0
+REPLAY_LOOP = True
+
+# Transport "raw": file capture uint16 interleaved tanpa header
+RAW_FILE_PATH = os.path.join(PROJECT_ROOT, "capture.bin")
+RAW_FILE_SAMPLES_PER_FRAME = 4096
+RAW_FILE_REALTIME = True  # True: frame dikirim sesuai SAMPLE_RATE, False: secepat mungkin
+
 # Rate sampling data dari akuisisi (dalam Hz)
 SAMPLE_RATE = 20_000_000  # 20 MHz
 
 # Seberapa sering (dalam detik) memeriksa pembaruan file
 POLLING_INTERVAL = 0.2  # 5 kali per detik
 
+# Mode pemantauan file:
+#   "auto"    -> inotify di Linux (event close-after-write), polling jika tidak tersedia
+#   "inotify" -> wajib inotify (error jika tidak didukung)
+#   "polling" -> cek os.stat setiap POLLING_INTERVAL
+FILE_WATCH_MODE = "auto"
+
+# --- Konfigurasi Perekaman ---
+# Rekaman disimpan per direktori di RECORD_DIRECTORY (lihat functions/recorder.py).
+# Buffer tulis: RECORD_BUFFER_BLOCKS blok x RECORD_BLOCK_BYTES; jika penuh, frame dibuang.
+RECORD_DIRECTORY = os.path.join(PROJECT_ROOT, "recordings")
+RECORD_CHUNK_BYTES = 1 << 30   # Ukuran maksimum satu file chunk (1 GiB)
+RECORD_BLOCK_BYTES = 16 << 20  # Ukuran satu write() ke disk (16 MiB)
+RECORD_BUFFER_BLOCKS = 8
+
+# --- Konfigurasi Backend DSP ---
+# "thread"  -> akuisisi & DSP berjalan sebagai thread di proses UI
+# "process" -> akuisisi dan setiap tahap DSP (FFT, waveform, waterfall) berjalan
+#              di proses terpisah; hasil dikirim lewat shared memory
+DSP_BACKEND = "thread"
+# Jumlah slot ring shared memory per tahap (frame masuk dan hasil)
+DSP_SHM_SLOTS = 4
+
+# --- Konfigurasi Instrumentasi ---
+# Mengukur durasi tiap tahap, frame masuk/keluar/dibuang, kedalaman queue dan
+# latensi akuisisi -> layar. Overlay ditampilkan/disembunyikan dengan F3.
+INSTRUMENTATION_ENABLED = False
+# Path file JSON hasil telemetri yang ditulis saat aplikasi ditutup (None = tidak ditulis)
+TELEMETRY_DUMP_PATH = os.path.join(PROJECT_ROOT, "telemetry.json")
+
+# --- Konfigurasi FFT ---
+# Window untuk spektrum (nama window scipy.signal, "boxcar" = tanpa window)
+FFT_WINDOW = "boxcar"
+# Jumlah thread yang dipakai scipy.fft per transformasi
+FFT_WORKERS = 1
+
+# Mode rata-rata spektrum:
+#   "none"        -> periodogram mentah per frame
+#   "welch"       -> Welch per frame (segmen + overlap), tanpa rata-rata antar frame
+#   "exponential" -> Welch + rata-rata eksponensial antar frame (FFT_AVERAGE_ALPHA)
+#   "linear"      -> Welch + rata-rata FFT_AVERAGE_COUNT frame terakhir
+FFT_AVERAGING = "none"
+WELCH_SEGMENT_SIZE = 4096
+WELCH_OVERLAP = 0.5
+WELCH_WINDOW = "hann"
+FFT_AVERAGE_ALPHA = 0.2
+FFT_AVERAGE_COUNT = 8
+
+# --- Konfigurasi Waterfall (STFT) ---
+WATERFALL_CHANNEL = 0          # Channel yang ditampilkan
+WATERFALL_NFFT = 1024          # Panjang FFT per kolom
+WATERFALL_HOP = 512            # Jarak antar kolom (sampel)
+WATERFALL_DEPTH = 256          # Jumlah kolom riwayat yang ditampilkan
+WATERFALL_MAX_COLUMNS = 32     # Batas kolom per frame; kelebihan di-decimate
+WATERFALL_DYNAMIC_RANGE_DB = 80.0
+
+# --- Konfigurasi Deteksi (CFAR) ---
+# Tahap deteksi memproses spektrum magnitudo satu channel pada setiap frame
+# akuisisi (functions/detection.py); hasilnya menjadi target di PPI.
+DETECTION_CHANNEL = 0
+DETECTION_WINDOW = "hann"      # Sidelobe rendah agar nada kuat tidak memicu deteksi di sekitarnya
+# "ca" -> cell averaging, O(n) lewat cumsum
+# "os" -> ordered statistic, lebih tahan target berdekatan tetapi O(n * training)
+DETECTION_METHOD = "ca"
+DETECTION_GUARD_CELLS = 2      # Per sisi sel uji
+DETECTION_TRAINING_CELLS = 16  # Per sisi sel uji
+DETECTION_PFA = 1e-6           # Probabilitas false alarm per bin
+DETECTION_MAX_TARGETS = 32     # Deteksi terkuat per frame
+# Frekuensi beat (Hz) yang dipetakan ke jarak maksimum PPI; deteksi di atasnya tidak diplot
+DETECTION_MAX_FREQUENCY = 2_500_000
+# Target tampil setelah DETECTION_MIN_HITS deteksi dan hilang jika tidak
+# terdeteksi lagi selama DETECTION_PERSISTENCE detik (~ satu periode sapuan)
+DETECTION_MIN_HITS = 2
+DETECTION_PERSISTENCE = 2.5
+
+# --- Konfigurasi PPI ---
+# Mode tampilan: "vector" (wedge jejak sapuan + scatter target) atau
+# "raster" (citra video return dengan persistence fosfor)
+PPI_MODE = "vector"
+# Jumlah wedge jejak sapuan (persistence). 360 ~ jejak penuh beberapa detik.
+PPI_TRAIL_LENGTH = 20
+# Mode raster: lebar citra (piksel), jumlah bin jarak per beam, dan faktor
+# peluruhan intensitas per update (~60 update/detik)
+PPI_RASTER_SIZE = 512
+PPI_RANGE_BINS = 256
+PPI_AZIMUTH_RESOLUTION = 0.25  # Derajat per bin azimuth pada LUT scan conversion
+PPI_PHOSPHOR_DECAY = 0.97
+
 # --- Konfigurasi Tampilan ---
+# Ukuran blok level terhalus piramida min/max (LOD) untuk plot waveform & spektrum
+LOD_BASE_BLOCK = 16
 APP_SPACING = 8
 APP_PADDING = 8
 
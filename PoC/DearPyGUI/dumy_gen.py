@@ -1,40 +1,93 @@
 import numpy as np
-import struct
+import argparse
 import time
 
-FILENAME = "./live_acquisition_ui.bin"
-SAMPLE_RATE = 20_000_000
-NUM_SAMPLES = 4096  # Jumlah sampel per channel
+from config import (FILENAME, SAMPLE_RATE, ACQUISITION_TRANSPORT, ACQUISITION_CHANNELS, SHM_NAME, SHM_SLOTS,
+                    SHM_MAX_SAMPLES)
+from functions.frame_file import write_frame_file
+from functions.shm_ring import SharedFrameRing
+from functions.signal_gen import create_scenario
 
-print(f"Starting simulation. Writing to '{FILENAME}' every 2 seconds.")
+TRANSPORTS = ["file", "shm"]
+
+parser = argparse.ArgumentParser(description="Simulator akuisisi data multi-channel.")
+# argparse tidak memvalidasi default: transport lain ("serial", "raw", "replay") tidak dibaca dari generator ini
+parser.add_argument("--transport", choices=TRANSPORTS,
+                    default=ACQUISITION_TRANSPORT if ACQUISITION_TRANSPORT in TRANSPORTS else "file",
+                    help="Tujuan frame: file (FILENAME) atau ring shared memory (SHM_NAME)")
+parser.add_argument("--channels", type=int, default=ACQUISITION_CHANNELS,
+                    help="Jumlah channel interleaved (default ACQUISITION_CHANNELS)")
+parser.add_argument("--interval", type=float, default=0.5, help="Jeda antar frame (detik), diabaikan jika --realtime")
+parser.add_argument("--samples", type=int, default=4096, help="Jumlah sampel per channel per frame")
+parser.add_argument("--scenario", choices=["tones", "radar"], default="tones", help="Model sinyal yang dibangkitkan")
+parser.add_argument("--seed", type=int, default=0, help="Seed generator (urutan sampel identik untuk seed yang sama)")
+parser.add_argument("--realtime", action="store_true",
+                    help="Kirim frame secepat SAMPLE_RATE (samples / SAMPLE_RATE detik per frame)")
+args = parser.parse_args()
+if args.channels < 1:
+    parser.error("--channels harus >= 1")
+if ACQUISITION_TRANSPORT not in TRANSPORTS:
+    print(f"Warning: ACQUISITION_TRANSPORT = '{ACQUISITION_TRANSPORT}' tidak membaca frame dari generator ini; "
+          f"menulis ke transport '{args.transport}'.")
+NUM_CHANNELS = args.channels
+
+generator = create_scenario(args.scenario, SAMPLE_RATE, NUM_CHANNELS, args.seed)
+period = args.samples / SAMPLE_RATE if args.realtime else args.interval
+
+ring = None
+if args.transport == "shm":
+    ring = SharedFrameRing.create(SHM_NAME, SHM_SLOTS, max(args.samples, SHM_MAX_SAMPLES), NUM_CHANNELS, np.uint16)
+    print(f"Starting simulation ({args.scenario}). Writing to shared memory ring '{SHM_NAME}' every {period} seconds.")
+else:
+    print(f"Starting simulation ({args.scenario}). Writing to '{FILENAME}' every {period} seconds.")
 print("Run main.py in another terminal to see the live updates.")
 print("Press Ctrl+C to stop.")
 
 try:
+    seq = 0
+    buffer = None
+    deadline = time.perf_counter()
+    report_time, report_samples = deadline, 0
     while True:
-        # Buat sinyal gabungan dengan frekuensi yang sedikit berubah
-        freq1 = 90000 + np.random.randint(-1000, 1000)
-        freq2 = 150000 + np.random.randint(-2000, 2000)
-        
-        t = np.linspace(0, NUM_SAMPLES / SAMPLE_RATE, NUM_SAMPLES, endpoint=False)
-        
-        # Buat data untuk dua channel
-        signal1 = (1000 * np.sin(2 * np.pi * freq1 * t)).astype(np.uint16)
-        signal2 = (800 * np.sin(2 * np.pi * freq2 * t)).astype(np.uint16)
-        
-        # Gabungkan (interleave) data seperti hardware asli
-        interleaved_data = np.empty((NUM_SAMPLES * 2,), dtype=np.uint16)
-        interleaved_data[0::2] = signal1
-        interleaved_data[1::2] = signal2
-
-        # Tulis data ke file biner
-        with open(FILENAME, "wb") as f:
-            f.write(struct.pack(f'<{len(interleaved_data)}H', *interleaved_data))
-        
-        print(f"File updated at {time.strftime('%H:%M:%S')} with freqs ~{freq1/1000:.1f}kHz and ~{freq2/1000:.1f}kHz")
-        
-        # Tunggu sebelum update berikutnya
-        time.sleep(0.5)
+        # Untuk shared memory, sampel langsung dikuantisasi ke slot ring tanpa
+        # buffer perantara; untuk file, buffer yang sama dipakai ulang.
+        if ring is not None:
+            interleaved_data = ring.begin_write(args.samples)
+        else:
+            if buffer is None:
+                buffer = np.empty((args.samples * NUM_CHANNELS,), dtype=np.uint16)
+            interleaved_data = buffer
+        generator.generate_interleaved(args.samples, out=interleaved_data)
+
+        if ring is not None:
+            seq = ring.commit(args.samples, SAMPLE_RATE)
+        else:
+            # Tulis frame secara atomik (header + data, lalu rename)
+            seq += 1
+            write_frame_file(FILENAME, interleaved_data, NUM_CHANNELS, seq, SAMPLE_RATE)
+
+        # Laporan laju sekali per detik, bukan per frame (print per frame membatasi laju)
+        report_samples += args.samples
+        now = time.perf_counter()
+        if now - report_time >= 1.0:
+            target = f" (target {SAMPLE_RATE / 1e6:.2f})" if args.realtime else ""
+            print(f"Frame #{seq} at {time.strftime('%H:%M:%S')}: {report_samples / (now - report_time) / 1e6:.2f} "
+                  f"MS/s per channel{target}, clipped {generator.clipped}")
+            report_time, report_samples = now, 0
+
+        # Tunggu sampai jadwal frame berikutnya. Deadline dijadwalkan dari awal,
+        # bukan dari akhir frame, sehingga laju rata-rata tidak melorot; jika
+        # tertinggal, frame berikutnya langsung dikirim.
+        deadline += period
+        delay = deadline - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        elif delay < -1.0:
+            deadline = time.perf_counter() # Tertinggal jauh: jangan mengejar
 
 except KeyboardInterrupt:
-    print("\nSimulation stopped.")
\ No newline at end of file
+    print("\nSimulation stopped.")
+finally:
+    if ring is not None:
+        interleaved_data = None # Lepas view ke shared memory sebelum close
+        ring.close()
@@ -0,0 +1,85 @@
+# functions/acquisition.py
+
+import queue
+import threading
+
+from functions.channels import BoundedChannel
+
+# --- Frame Akuisisi --- #
+
+class Frame:
+    """
+    Satu frame akuisisi yang sudah diproses (float32, DC offset dihapus).
+    Array `data` berbentuk (channels, n_samples) dan dibuat read-only agar
+    aman dibagikan ke banyak subscriber tanpa disalin.
+    """
+    __slots__ = ("seq", "timestamp", "sample_rate", "data")
+
+    def __init__(self, seq, timestamp, sample_rate, data):
+        data.flags.writeable = False
+        self.seq = seq
+        self.timestamp = timestamp
+        self.sample_rate = sample_rate
+        self.data = data
+
+    @property
+    def channels(self):
+        return self.data.shape[0]
+
+    @property
+    def n_samples(self):
+        return self.data.shape[1]
+
+    def channel(self, index):
+        """View read-only untuk satu channel."""
+        return self.data[index]
+
+# --- Distribusi Frame --- #
+
+class FrameHub:
+    """
+    Titik fan-out antara tahap akuisisi dan semua konsumen (FFT, waveform, detektor).
+    Setiap frame dibaca sekali lalu referensinya dikirim ke queue tiap subscriber.
+    Queue subscriber dibatasi; subscriber yang lambat kehilangan frame tertua,
+    bukan menahan tahap akuisisi.
+
+    Subscriber yang wajib menerima setiap frame (detektor) memakai overflow
+    "block": publish() menunggu sampai ada ruang (backpressure ke akuisisi),
+    paling lama `block_timeout` detik. Jika subscriber macet lebih lama, frame
+    tetap dibuang dan dihitung di `dropped` kanal tersebut agar akuisisi dan
+    subscriber lain tidak ikut berhenti.
+    """
+
+    def __init__(self, block_timeout=1.0):
+        self.block_timeout = block_timeout
+        self._subscribers = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, maxsize=2, overflow="drop_oldest"):
+        """Mendaftarkan subscriber baru dan mengembalikan queue (BoundedChannel) miliknya."""
+        frame_queue = BoundedChannel(maxsize, overflow=overflow)
+        with self._lock:
+            self._subscribers.append(frame_queue)
+        return frame_queue
+
+    def unsubscribe(self, frame_queue):
+        with self._lock:
+            if frame_queue in self._subscribers:
+                self._subscribers.remove(frame_queue)
+
+    def publish(self, frame):
+        """
+        Mengirim frame ke semua subscriber. Hanya subscriber "block" yang bisa
+        membuat akuisisi menunggu; mereka dilayani terakhir agar subscriber
+        lain sudah menerima frame ini.
+        """
+        with self._lock:
+            subscribers = sorted(self._subscribers, key=lambda channel: channel.overflow == "block")
+        for frame_queue in subscribers:
+            if frame_queue.overflow != "block":
+                frame_queue.put_nowait(frame) # Penuh: frame tertua dibuang (dropped += 1)
+                continue
+            try:
+                frame_queue.put(frame, timeout=self.block_timeout)
+            except queue.Full:
+                frame_queue.dropped += 1
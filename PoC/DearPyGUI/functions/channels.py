@@ -0,0 +1,165 @@
+# functions/channels.py
+
+import collections
+import queue
+import threading
+
+# Kanal antar thread dengan ukuran terbatas. Keduanya memakai antarmuka yang
+# sama dengan queue.Queue (put/get/get_nowait, melempar queue.Empty/queue.Full)
+# sehingga worker lama tetap bisa dipakai, ditambah get_latest/drain untuk UI
+# dan penghitung drop agar kehilangan data terlihat, bukan latensi yang tumbuh.
+
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "block")
+
+# --- Mailbox Nilai Terbaru --- #
+
+class LatestValueMailbox:
+    """
+    Menyimpan paling banyak satu nilai: put() selalu menimpa nilai yang belum
+    dibaca (dihitung sebagai dropped). Cocok untuk data yang hanya nilai
+    terbarunya berarti (hasil FFT, waveform, posisi sapuan PPI), sehingga
+    latensi tampilan tidak pernah lebih dari satu pesan.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._value = None
+        self._has_value = False
+        self.put_count = 0
+        self.get_count = 0
+        self.dropped = 0
+
+    def put(self, value, block=True, timeout=None):
+        with self._cond:
+            if self._has_value:
+                self.dropped += 1
+            self._value = value
+            self._has_value = True
+            self.put_count += 1
+            self._cond.notify()
+        return True
+
+    def put_nowait(self, value):
+        return self.put(value)
+
+    def get(self, block=True, timeout=None):
+        with self._cond:
+            if block:
+                self._cond.wait_for(lambda: self._has_value, timeout)
+            if not self._has_value:
+                raise queue.Empty
+            value = self._value
+            self._value = None
+            self._has_value = False
+            self.get_count += 1
+            return value
+
+    def get_nowait(self):
+        return self.get(block=False)
+
+    def get_latest(self):
+        """Nilai terbaru (mailbox hanya menyimpan satu). Melempar queue.Empty jika kosong."""
+        return self.get_nowait()
+
+    def drain(self):
+        """Semua nilai yang tertunda, dari terlama ke terbaru (paling banyak satu)."""
+        try:
+            return [self.get_nowait()]
+        except queue.Empty:
+            return []
+
+    def qsize(self):
+        return int(self._has_value)
+
+    def stats(self):
+        return {"put": self.put_count, "get": self.get_count, "dropped": self.dropped, "depth": self.qsize()}
+
+# --- Queue Terbatas dengan Kebijakan Overflow --- #
+
+class BoundedChannel:
+    """
+    Queue FIFO terbatas untuk pesan yang semuanya berarti (baris waterfall,
+    sektor PPI raster, frame ke subscriber). Saat penuh, `overflow` menentukan:
+
+      "drop_oldest" -> buang pesan terlama (produsen tidak pernah menunggu)
+      "drop_newest" -> tolak pesan baru
+      "block"       -> produsen menunggu sampai ada ruang (backpressure)
+    """
+
+    def __init__(self, maxsize, overflow="drop_oldest"):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Kebijakan overflow tidak dikenal: {overflow}")
+        if maxsize < 1:
+            raise ValueError("maxsize harus >= 1")
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self._items = collections.deque()
+        self._cond = threading.Condition()
+        self.put_count = 0
+        self.get_count = 0
+        self.dropped = 0
+
+    def put(self, item, block=True, timeout=None):
+        """Menambahkan item; mengembalikan False jika item ditolak (drop_newest)."""
+        with self._cond:
+            if len(self._items) >= self.maxsize:
+                if self.overflow == "drop_newest":
+                    self.dropped += 1
+                    return False
+                if self.overflow == "drop_oldest":
+                    self._items.popleft()
+                    self.dropped += 1
+                else:
+                    if not block or not self._cond.wait_for(lambda: len(self._items) < self.maxsize, timeout):
+                        raise queue.Full
+            self._items.append(item)
+            self.put_count += 1
+            self._cond.notify_all()
+        return True
+
+    def put_nowait(self, item):
+        return self.put(item, block=False)
+
+    def get(self, block=True, timeout=None):
+        with self._cond:
+            if block:
+                self._cond.wait_for(lambda: self._items, timeout)
+            if not self._items:
+                raise queue.Empty
+            item = self._items.popleft()
+            self.get_count += 1
+            self._cond.notify_all()
+            return item
+
+    def get_nowait(self):
+        return self.get(block=False)
+
+    def get_latest(self):
+        """
+        Mengambil item terbaru dan membuang sisanya (drain-to-newest, dihitung
+        sebagai dropped). Melempar queue.Empty jika kosong.
+        """
+        with self._cond:
+            if not self._items:
+                raise queue.Empty
+            item = self._items.pop()
+            self.dropped += len(self._items)
+            self._items.clear()
+            self.get_count += 1
+            self._cond.notify_all()
+            return item
+
+    def drain(self):
+        """Semua item yang tertunda, dari terlama ke terbaru."""
+        with self._cond:
+            items = list(self._items)
+            self._items.clear()
+            self.get_count += len(items)
+            self._cond.notify_all()
+            return items
+
+    def qsize(self):
+        return len(self._items)
+
+    def stats(self):
+        return {"put": self.put_count, "get": self.get_count, "dropped": self.dropped, "depth": self.qsize()}
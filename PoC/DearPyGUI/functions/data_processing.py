@@ -3,7 +3,6 @@
 import numpy as np
 import threading
 import queue
-import struct
 import os
 import time
 import math
@@ -11,7 +10,22 @@ import collections
 from scipy.fft import fft, fftfreq
 
 # Impor konfigurasi terpusat
-from config import FILENAME, SAMPLE_RATE, POLLING_INTERVAL
+from config import (FILENAME, FFT_WINDOW, FFT_WORKERS,
+                    FFT_AVERAGING, WELCH_SEGMENT_SIZE, WELCH_OVERLAP, WELCH_WINDOW,
+                    FFT_AVERAGE_ALPHA, FFT_AVERAGE_COUNT, WATERFALL_CHANNEL, WATERFALL_NFFT,
+                    WATERFALL_HOP, WATERFALL_MAX_COLUMNS, WATERFALL_DYNAMIC_RANGE_DB,
+                    LOD_BASE_BLOCK, PPI_MODE, PPI_TRAIL_LENGTH, PPI_RANGE_BINS, DETECTION_CHANNEL,
+                    DETECTION_WINDOW, DETECTION_METHOD, DETECTION_GUARD_CELLS, DETECTION_TRAINING_CELLS,
+                    DETECTION_PFA, DETECTION_MAX_TARGETS, DETECTION_MAX_FREQUENCY, DETECTION_MIN_HITS,
+                    DETECTION_PERSISTENCE)
+from functions.acquisition import Frame, FrameHub
+from functions.detection import CFARDetector, TargetPlot
+from functions.ppi_raster import synthesize_returns
+from functions.sources import create_source, load_raw_data
+from functions.spectrum import SpectrumEngine, AveragedSpectrum
+from functions.stft import StreamingSTFT
+from functions.decimation import build_pyramids
+from functions.instrumentation import telemetry
 
 # --- Helper Functions --- #
 
@@ -20,24 +34,25 @@ def polar_to_cartesian(center_x, center_y, angle_deg, radius):
     angle_rad = math.radians(angle_deg)
     return center_x + radius * math.cos(angle_rad), center_y + radius * math.sin(angle_rad)
 
+def channels_to_float(raw_channels, remove_dc=True):
+    """Konversi channel mentah (channels, n) ke float32 kontigu, opsional menghapus DC offset."""
+    data = np.ascontiguousarray(raw_channels, dtype=np.float32)
+    if remove_dc and data.shape[1] > 0:
+        data -= data.mean(axis=1, keepdims=True)
+    return data
+
 def load_and_process_data(filepath, sr):
     """Memuat data dari file biner, memisahkan channel, dan menghapus DC offset."""
     try:
-        if not os.path.exists(filepath):
+        raw_channels = load_raw_data(filepath)
+        if raw_channels is None:
             return None, None, None, None
 
-        with open(filepath, "rb") as f:
-            data = f.read()
-        
-        if not data: # Jika file kosong
+        if raw_channels.shape[1] == 0: # Jika file kosong
             return np.array([]), np.array([]), 0, sr
 
-        values = np.array(struct.unpack(f"<{len(data)//2}H", data), dtype=np.float32)
-        ch1 = values[::2]
-        ch2 = values[1::2]
-        ch1 -= np.mean(ch1)
-        ch2 -= np.mean(ch2)
-        return ch1, ch2, len(ch1), sr
+        data = channels_to_float(raw_channels)
+        return data[0], data[1], data.shape[1], sr
     except Exception as e:
         print(f"Error reading or processing file {filepath}: {e}")
         return None, None, None, None
@@ -54,107 +69,257 @@ def compute_fft(channel, sample_rate):
 
 # --- Worker Thread Functions --- #
 
-def fft_data_worker(result_queue: queue.Queue, stop_event: threading.Event):
+def acquisition_worker(hub: FrameHub, stop_event: threading.Event, source=None, recorder=None):
+    """
+    Satu-satunya tahap yang membaca data akuisisi. Sumbernya (file, shared
+    memory, serial, capture mentah) dibuat dari ACQUISITION_TRANSPORT jika
+    `source` tidak diberikan. Setiap frame baru di-unpack dan dikoreksi DC
+    tepat sekali, lalu frame immutable-nya dibagikan ke semua subscriber
+    lewat FrameHub. Jika `recorder` sedang merekam, sampel mentahnya juga
+    diserahkan ke perekam (functions/recorder.py).
+    """
+    try:
+        if source is None:
+            source = create_source()
+    except Exception as e:
+        print(f"Error creating acquisition source: {e}")
+        return
+    print(f"Acquisition worker started ({source.name}).")
+
+    try:
+        while not stop_event.is_set():
+            try:
+                # Timeout singkat agar stop_event tetap diperiksa secara berkala
+                raw = source.read(timeout=0.5)
+                if raw is None:
+                    continue
+
+                reserved = False
+                if recorder is not None and recorder.recording:
+                    # Disalin sebelum release(), tetapi baru diterbitkan setelah frame tervalidasi
+                    with telemetry.timer("acquisition.record"):
+                        reserved = recorder.reserve(raw.seq, raw.timestamp, raw.sample_rate, raw.data)
+                with telemetry.timer("acquisition.unpack"):
+                    data = channels_to_float(raw.data) # Satu-satunya salinan dari buffer sumber
+                frame = Frame(raw.seq, raw.timestamp, raw.sample_rate, data)
+                valid = source.release(raw)
+                del raw # Lepas view ke buffer sumber (mis. shared memory) sebelum read berikutnya
+                if reserved:
+                    if valid:
+                        recorder.commit()
+                    else:
+                        recorder.abort() # Frame sobek tidak boleh masuk rekaman
+                if not valid:
+                    telemetry.count("acquisition.frames_torn")
+                elif frame.n_samples > 0:
+                    hub.publish(frame)
+                    telemetry.count("acquisition.frames_in")
+
+            except Exception as e:
+                print(f"Error in acquisition worker loop: {e}")
+                time.sleep(1)
+    finally:
+        source.close()
+        print("Acquisition worker thread stopped.")
+
+def fft_data_worker(frame_queue: queue.Queue, result_queue: queue.Queue, stop_event: threading.Event):
     """
-    Worker yang memantau file dan memproses FFT jika ada perubahan.
-    Menggunakan konfigurasi dari config.py.
+    Worker yang menerima frame dari tahap akuisisi dan memproses FFT.
     """
-    print(f"FFT worker started. Monitoring '{FILENAME}' for changes...")
-    last_modified_time = 0
+    print("FFT worker started. Waiting for acquisition frames...")
+    received_any = False
+    # Buffer & plan milik thread ini
+    engine = SpectrumEngine(window=FFT_WINDOW, workers=FFT_WORKERS)
+    averager = None
+    if FFT_AVERAGING != "none":
+        averager = AveragedSpectrum(
+            mode=FFT_AVERAGING, segment_size=WELCH_SEGMENT_SIZE, overlap=WELCH_OVERLAP,
+            window=WELCH_WINDOW, alpha=FFT_AVERAGE_ALPHA, n_average=FFT_AVERAGE_COUNT,
+            workers=FFT_WORKERS,
+        )
 
     while not stop_event.is_set():
         try:
-            if not os.path.exists(FILENAME):
-                result_queue.put({"status": "waiting", "message": f"Menunggu file '{os.path.basename(FILENAME)}'..."})
-                time.sleep(1)
+            try:
+                frame = frame_queue.get(timeout=1)
+            except queue.Empty:
+                if not received_any:
+                    result_queue.put({"status": "waiting", "message": f"Menunggu file '{os.path.basename(FILENAME)}'..."})
                 continue
 
-            current_mtime = os.path.getmtime(FILENAME)
-
-            if current_mtime != last_modified_time:
-                print(f"File '{os.path.basename(FILENAME)}' changed. Processing FFT...")
-                last_modified_time = current_mtime
+            if not received_any:
+                # Sekali saja, seperti "waiting": di mailbox status per frame selalu
+                # tertimpa hasil "done" dan hanya menambah hitungan dropped
                 result_queue.put({"status": "processing"})
-                
-                ch1_data, ch2_data, n_samples, sr = load_and_process_data(FILENAME, SAMPLE_RATE)
+                received_any = True
 
-                if ch1_data is None or n_samples == 0:
-                    result_queue.put({"status": "error", "message": f"Gagal memproses file."})
-                    continue
+            sr = frame.sample_rate
+            # Semua channel dalam satu transformasi; magnitudes berbentuk (channels, bins)
+            with telemetry.timer("fft.compute"):
+                if averager is not None:
+                    freqs, magnitudes = averager.update(frame.data, sr)
+                    freq_resolution = sr / min(WELCH_SEGMENT_SIZE, frame.n_samples)
+                else:
+                    freqs, magnitudes = engine.compute_batch(frame.data, sr)
+                    freq_resolution = sr / frame.n_samples
 
-                freqs_ch1, mag_ch1 = compute_fft(ch1_data, sr)
-                freqs_ch2, mag_ch2 = compute_fft(ch2_data, sr)
-                
-                result_data = {
-                    "status": "done",
-                    "freqs_ch1": freqs_ch1, "mag_ch1": mag_ch1,
-                    "freqs_ch2": freqs_ch2, "mag_ch2": mag_ch2,
-                    "n_samples": n_samples, "sample_rate": sr
-                }
-                result_queue.put(result_data)
-            
-            time.sleep(POLLING_INTERVAL)
+            # Indeks LOD dibangun sekali di sini agar zoom di UI hanya memotong level
+            with telemetry.timer("fft.pyramids"):
+                pyramids = build_pyramids(magnitudes, LOD_BASE_BLOCK)
+
+            result_data = {
+                "status": "done",
+                "freqs": freqs, "magnitudes": magnitudes,
+                "n_samples": frame.n_samples, "sample_rate": sr,
+                "freq_resolution": freq_resolution, "seq": frame.seq,
+                "timestamp": frame.timestamp, "pyramids": pyramids
+            }
+            result_queue.put(result_data)
+            telemetry.count("fft.frames_out")
 
         except Exception as e:
             print(f"Error in FFT worker loop: {e}")
             result_queue.put({"status": "error", "message": f"Error: {e}"})
             time.sleep(1)
-    
+
     print("FFT worker thread stopped.")
 
-def sinewave_data_worker(result_queue: queue.Queue, stop_event: threading.Event):
+def sinewave_data_worker(frame_queue: queue.Queue, result_queue: queue.Queue, stop_event: threading.Event):
     """
-    Worker yang memantau file dan mengirimkan data waveform mentah.
-    Menggunakan konfigurasi dari config.py.
+    Worker yang menerima frame dari tahap akuisisi dan mengirimkan data waveform mentah.
     """
-    print(f"Sinewave worker started. Monitoring '{FILENAME}' for changes...")
-    last_modified_time = 0
+    print("Sinewave worker started. Waiting for acquisition frames...")
 
     while not stop_event.is_set():
         try:
-            if not os.path.exists(FILENAME):
-                time.sleep(1)
+            try:
+                frame = frame_queue.get(timeout=1)
+            except queue.Empty:
                 continue
 
-            current_mtime = os.path.getmtime(FILENAME)
-            if current_mtime != last_modified_time:
-                print(f"File '{os.path.basename(FILENAME)}' changed. Processing for Sinewave...")
-                last_modified_time = current_mtime
-                
-                ch1_data, ch2_data, n_samples, sr = load_and_process_data(FILENAME, SAMPLE_RATE)
+            with telemetry.timer("sinewave.pyramids"):
+                pyramids = build_pyramids(frame.data, LOD_BASE_BLOCK)
 
-                if ch1_data is None or n_samples == 0:
-                    continue
-                
-                time_axis = np.linspace(0, n_samples / sr, n_samples, endpoint=False)
-                
-                result_data = {
-                    "status": "done",
-                    "time_axis": time_axis,
-                    "ch1_data": ch1_data,
-                    "ch2_data": ch2_data
-                }
-                result_queue.put(result_data)
-            
-            time.sleep(POLLING_INTERVAL)
+            # Sumbu waktu tidak dibuat di sini: UI menghitung waktu hanya untuk
+            # titik hasil decimation (indeks / sample_rate)
+            result_data = {
+                "status": "done",
+                "seq": frame.seq,
+                "timestamp": frame.timestamp,
+                "sample_rate": frame.sample_rate,
+                "channels": frame.data,
+                "pyramids": pyramids
+            }
+            result_queue.put(result_data)
+            telemetry.count("sinewave.frames_out")
 
         except Exception as e:
             print(f"Error in Sinewave worker loop: {e}")
             time.sleep(1)
-    
+
     print("Sinewave worker thread stopped.")
 
-def ppi_data_worker(data_queue: queue.Queue, stop_event: threading.Event):
+def waterfall_data_worker(frame_queue: queue.Queue, result_queue: queue.Queue, stop_event: threading.Event):
+    """
+    Worker STFT streaming: setiap frame hanya menghasilkan kolom spektrogram baru,
+    yang dikirim ke UI sebagai baris RGBA siap tampil.
+    """
+    print("Waterfall worker started. Waiting for acquisition frames...")
+    stft = StreamingSTFT(
+        nfft=WATERFALL_NFFT, hop=WATERFALL_HOP,
+        max_columns_per_frame=WATERFALL_MAX_COLUMNS, dynamic_range_db=WATERFALL_DYNAMIC_RANGE_DB,
+    )
+
+    while not stop_event.is_set():
+        try:
+            try:
+                frame = frame_queue.get(timeout=1)
+            except queue.Empty:
+                continue
+
+            with telemetry.timer("waterfall.stft"):
+                rows = stft.push(frame.channel(WATERFALL_CHANNEL))
+                rgba = stft.colorize(rows)
+            if len(rows) == 0:
+                continue
+
+            result_queue.put({
+                "status": "done",
+                "rows": rgba,
+                "timestamp": frame.timestamp,
+                "sample_rate": frame.sample_rate,
+                "columns_total": stft.columns_total,
+                "columns_skipped": stft.columns_skipped,
+            })
+            telemetry.count("waterfall.frames_out")
+
+        except Exception as e:
+            print(f"Error in Waterfall worker loop: {e}")
+            time.sleep(1)
+
+    print("Waterfall worker thread stopped.")
+
+def detection_data_worker(frame_queue: queue.Queue, detection_queue: queue.Queue, stop_event: threading.Event):
+    """
+    Tahap deteksi: setiap frame akuisisi diubah menjadi spektrum magnitudo
+    (range profile) channel DETECTION_CHANNEL, lalu CFAR + cluster + interpolasi
+    puncak menghasilkan daftar Detection yang dikirim ke ppi_data_worker.
+    Spektrumnya dihitung sendiri (window & tanpa rata-rata) agar statistik
+    noise CFAR tidak bergantung pada pengaturan tampilan FFT.
+    """
+    print("Detection worker started. Waiting for acquisition frames...")
+    engine = SpectrumEngine(window=DETECTION_WINDOW, workers=FFT_WORKERS)
+    detector = CFARDetector(method=DETECTION_METHOD, guard=DETECTION_GUARD_CELLS, train=DETECTION_TRAINING_CELLS,
+                            pfa=DETECTION_PFA, max_detections=DETECTION_MAX_TARGETS)
+
+    while not stop_event.is_set():
+        try:
+            try:
+                frame = frame_queue.get(timeout=1)
+            except queue.Empty:
+                continue
+
+            channel = min(DETECTION_CHANNEL, frame.channels - 1)
+            with telemetry.timer("detection.fft"):
+                _, magnitudes = engine.compute_batch(frame.data[channel:channel + 1], frame.sample_rate)
+            with telemetry.timer("detection.cfar"):
+                detections = detector.detect(magnitudes, frame.sample_rate / frame.n_samples, channel_offset=channel)
+
+            detection_queue.put({
+                "status": "done",
+                "seq": frame.seq,
+                "timestamp": frame.timestamp,
+                "sample_rate": frame.sample_rate,
+                "detections": detections,
+            })
+            telemetry.count("detection.frames_out")
+            telemetry.count("detection.detections", len(detections))
+
+        except Exception as e:
+            print(f"Error in Detection worker loop: {e}")
+            time.sleep(1)
+
+    print("Detection worker thread stopped.")
+
+def ppi_data_worker(data_queue: queue.Queue, stop_event: threading.Event, detection_queue=None):
     """
     Worker yang menghasilkan data untuk sapuan jarum dan target di PPI.
+    Target berasal dari tahap deteksi (`detection_queue`): setiap deteksi
+    dicatat pada sudut jarum saat diterima, dengan jarak sebanding frekuensi
+    beat-nya (DETECTION_MAX_FREQUENCY = jarak maksimum).
+    Pada mode raster, setiap update juga membawa video return sepanjang beam
+    beserta sudut sebelumnya agar UI bisa melukis sektor yang baru disapu.
     """
     print("PPI worker thread started.")
-    # Konfigurasi PPI (bisa juga dipindah ke config.py jika perlu)
-    SWEEP_HISTORY_LENGTH = 20 
-    TARGETS = [(140, 70), (75, 50)]
+    # Konfigurasi PPI
+    SWEEP_HISTORY_LENGTH = PPI_TRAIL_LENGTH
+    MAX_RANGE = 100 # Sama dengan MAX_RADIUS di widgets/PPI.py
+    target_plot = TargetPlot(min_hits=DETECTION_MIN_HITS, persistence=DETECTION_PERSISTENCE)
 
     current_angle, direction, last_time = 0, 1, time.time()
+    previous_angle = current_angle
     sweep_history = collections.deque(maxlen=SWEEP_HISTORY_LENGTH)
+    sweep_count = 0 # Total sudut yang pernah dihasilkan; UI menulis hanya sudut baru
     
     while not stop_event.is_set():
         current_time = time.time()
@@ -168,9 +333,25 @@ def ppi_data_worker(data_queue: queue.Queue, stop_event: threading.Event):
             current_angle = 0
             direction = 1
             
-        sweep_history.append(current_angle)
-        data_to_send = {"angles": list(sweep_history), "targets": TARGETS}
+        with telemetry.timer("ppi.generate"):
+            if detection_queue is not None:
+                for result in detection_queue.drain():
+                    visible = [d for d in result["detections"] if d.frequency <= DETECTION_MAX_FREQUENCY]
+                    radii = [d.frequency / DETECTION_MAX_FREQUENCY * MAX_RANGE for d in visible]
+                    target_plot.update(current_angle, radii, [d.power_db for d in visible], current_time)
+            targets = target_plot.targets(current_time)
+
+            sweep_history.append(current_angle)
+            sweep_count += 1
+            data_to_send = {"angles": list(sweep_history), "sweep_count": sweep_count, "targets": targets,
+                            "timestamp": current_time}
+            if PPI_MODE == "raster":
+                data_to_send["angle"] = current_angle
+                data_to_send["previous_angle"] = previous_angle
+                data_to_send["returns"] = synthesize_returns(current_angle, targets, PPI_RANGE_BINS)
+        previous_angle = current_angle
         data_queue.put(data_to_send)
+        telemetry.count("ppi.updates_out")
         time.sleep(0.016) # ~60 FPS update rate
         
     print("PPI worker thread stopped.")
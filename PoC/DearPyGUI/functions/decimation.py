@@ -0,0 +1,231 @@
+# functions/decimation.py
+
+import math
+import numpy as np
+
+# --- Decimation Min/Max --- #
+
+def minmax_decimate(y, n_buckets, start=0, stop=None):
+    """
+    Mereduksi y[start:stop] menjadi maksimal 2 * n_buckets titik dengan envelope
+    min/max per bucket (puncak sinyal tidak pernah hilang). Urutan min/max dalam
+    bucket mengikuti urutan aslinya agar garis tetap benar secara waktu.
+    Mengembalikan (indices, values); indices relatif terhadap awal y.
+    """
+    stop = len(y) if stop is None else stop
+    length = stop - start
+    if length <= 2 * n_buckets:
+        indices = np.arange(start, stop)
+        return indices, y[start:stop]
+
+    bucket = math.ceil(length / n_buckets)
+    n_full = length // bucket
+    body = y[start:start + n_full * bucket].reshape(n_full, bucket)
+    arg_min = body.argmin(axis=1)
+    arg_max = body.argmax(axis=1)
+
+    offsets = start + np.arange(n_full) * bucket
+    pairs = np.empty((n_full, 2), dtype=np.intp)
+    np.minimum(arg_min, arg_max, out=pairs[:, 0])
+    np.maximum(arg_min, arg_max, out=pairs[:, 1])
+    pairs += offsets[:, np.newaxis]
+    indices = pairs.ravel()
+
+    tail_start = start + n_full * bucket
+    if tail_start < stop:
+        tail = y[tail_start:stop]
+        tail_pair = np.sort([tail_start + tail.argmin(), tail_start + tail.argmax()])
+        indices = np.concatenate((indices, tail_pair))
+
+    return indices, y[indices]
+
+# --- Piramida Min/Max (Level of Detail) --- #
+
+def _block_minmax(y, block):
+    """Min/max tiap blok `block` sampel; blok terakhir boleh tidak penuh."""
+    n_full = len(y) // block
+    body = y[:n_full * block].reshape(n_full, block)
+    mins, maxs = body.min(axis=1), body.max(axis=1)
+    if n_full * block < len(y):
+        tail = y[n_full * block:]
+        mins, maxs = np.append(mins, tail.min()), np.append(maxs, tail.max())
+    return mins, maxs
+
+def _interleave_blocks(mins, maxs, block, offset):
+    """Titik (min, max) di tengah tiap blok, berurutan untuk line series."""
+    positions = np.repeat(offset + (np.arange(len(mins)) + 0.5) * block, 2)
+    values = np.empty(2 * len(mins), dtype=mins.dtype)
+    values[0::2] = mins
+    values[1::2] = maxs
+    return positions, values
+
+class MinMaxPyramid:
+    """
+    Indeks multi-resolusi min/max (seperti mipmap di osiloskop digital).
+    Level 0 berisi min/max tiap blok `base_block` sampel, dan setiap level
+    berikutnya menggabungkan dua blok level sebelumnya. Dibangun sekali saat
+    frame diterima (O(n), vectorized); query untuk rentang apa pun hanya
+    menyentuh sekitar n_buckets blok, tidak bergantung pada panjang data.
+
+    `levels` yang sudah jadi (mis. hasil unpack_pyramids) dipakai apa adanya
+    tanpa dihitung ulang.
+    """
+
+    def __init__(self, y, base_block=16, levels=None):
+        self.y = y
+        self.n = len(y)
+        self.base_block = base_block
+        if levels is not None:
+            self.levels = levels
+            return
+        self.levels = []
+
+        mins, maxs = _block_minmax(y, base_block)
+        self.levels.append((mins, maxs))
+
+        while len(mins) > 1:
+            if len(mins) % 2:
+                mins, maxs = np.append(mins, mins[-1]), np.append(maxs, maxs[-1])
+            mins = np.minimum(mins[0::2], mins[1::2])
+            maxs = np.maximum(maxs[0::2], maxs[1::2])
+            self.levels.append((mins, maxs))
+
+    def query(self, start, stop, n_buckets):
+        """
+        Mengembalikan (positions, values) untuk y[start:stop] dengan sekitar
+        2 * n_buckets titik. positions dalam satuan indeks sampel (float) dan
+        hanya bergantung pada (start, stop, n_buckets), bukan pada isi data.
+        """
+        samples = stop - start
+        if samples <= 2 * n_buckets:
+            return np.arange(start, stop, dtype=np.float64), self.y[start:stop]
+
+        # Level paling halus yang menghasilkan paling banyak n_buckets blok terlihat
+        level = math.ceil(math.log2(samples / (n_buckets * self.base_block)))
+        if level < 0:
+            # Lebih halus dari level 0: blok min/max langsung dari potongan kecil data mentah
+            block = math.ceil(samples / n_buckets)
+            mins, maxs = _block_minmax(self.y[start:stop], block)
+            return _interleave_blocks(mins, maxs, block, start)
+        level = min(level, len(self.levels) - 1)
+
+        block = self.base_block << level
+        mins, maxs = self.levels[level]
+        first, last = start // block, min(len(mins), -(-stop // block))
+        return _interleave_blocks(mins[first:last], maxs[first:last], block, first * block)
+
+def build_pyramids(channels, base_block=16):
+    """Membangun satu MinMaxPyramid per channel (dipanggil di worker thread)."""
+    return [MinMaxPyramid(channel, base_block) for channel in channels]
+
+# --- Serialisasi Piramida (Backend Multi-proses) --- #
+
+def pyramid_level_sizes(n, base_block=16):
+    """Panjang tiap level MinMaxPyramid untuk data n sampel, tanpa membangunnya."""
+    sizes = [-(-n // base_block)]
+    while sizes[-1] > 1:
+        sizes.append(-(-sizes[-1] // 2))
+    return sizes
+
+def pyramid_pack_size(n_channels, n, base_block=16):
+    """Jumlah nilai yang ditulis pack_pyramids untuk n_channels piramida n sampel."""
+    return 2 * n_channels * sum(pyramid_level_sizes(n, base_block))
+
+def pack_pyramids(pyramids, out):
+    """
+    Menyalin (mins, maxs) semua level semua piramida berurutan ke array datar
+    `out` (mis. slot ring shared memory). Mengembalikan jumlah nilai yang ditulis.
+    """
+    offset = 0
+    for pyramid in pyramids:
+        for mins, maxs in pyramid.levels:
+            for values in (mins, maxs):
+                out[offset:offset + len(values)] = values
+                offset += len(values)
+    return offset
+
+def unpack_pyramids(channels, packed, base_block=16):
+    """
+    Kebalikan pack_pyramids: satu MinMaxPyramid per channel yang level-levelnya
+    berupa view ke `packed`. Tidak ada min/max yang dihitung ulang.
+    """
+    sizes = pyramid_level_sizes(channels.shape[1], base_block)
+    pyramids = []
+    offset = 0
+    for channel in channels:
+        levels = []
+        for size in sizes:
+            mins = packed[offset:offset + size]
+            maxs = packed[offset + size:offset + 2 * size]
+            levels.append((mins, maxs))
+            offset += 2 * size
+        pyramids.append(MinMaxPyramid(channel, base_block, levels))
+    return pyramids
+
+# --- Cache Decimation per Plot --- #
+
+class WaveformDecimator:
+    """
+    Menyimpan data terbaru (waveform atau spektrum) dan hasil decimation-nya
+    untuk satu plot. Decimation hanya dihitung ulang jika data, rentang x yang
+    terlihat, atau lebar plot (piksel) berubah; selain itu update() mengembalikan
+    None. Jika piramida LOD disediakan, zoom/pan hanya memotong level yang sesuai.
+
+    `sample_rate` adalah jumlah sampel per satuan sumbu x (untuk spektrum:
+    1 / resolusi frekuensi).
+    """
+
+    def __init__(self, points_per_pixel=2):
+        self.points_per_pixel = points_per_pixel
+        self._channels = None
+        self._pyramids = None
+        self._sample_rate = None
+        self._seq = None
+        self._key = None
+        self.x_key = None # Identitas sumbu x dari update() terakhir (None = selalu berubah)
+
+    def set_data(self, channels, sample_rate, seq, pyramids=None):
+        """Mengganti data (channels, n) yang ditampilkan, beserta piramidanya (opsional)."""
+        self._channels = channels
+        self._pyramids = pyramids
+        self._sample_rate = sample_rate
+        self._seq = seq
+
+    def visible_index_range(self, x_min, x_max):
+        """Rentang indeks sampel untuk rentang x [x_min, x_max], dibatasi ke data."""
+        n = self._channels.shape[1]
+        start = max(0, int(math.floor(x_min * self._sample_rate)))
+        stop = min(n, int(math.ceil(x_max * self._sample_rate)) + 1)
+        if stop - start < 2:
+            return 0, n # Rentang tidak menyentuh data: tampilkan seluruhnya
+        return start, stop
+
+    def update(self, x_min, x_max, width_px):
+        """
+        Mengembalikan list (x, y) per channel jika perlu digambar ulang, atau None.
+        x dalam satuan sumbu plot, hanya untuk titik hasil decimation.
+        """
+        if self._channels is None:
+            return None
+        start, stop = self.visible_index_range(x_min, x_max)
+        n_buckets = max(1, int(width_px) * self.points_per_pixel // 2)
+        key = (self._seq, start, stop, n_buckets)
+        if key == self._key:
+            return None
+        self._key = key
+
+        # Posisi hasil piramida hanya bergantung pada rentang & jumlah bucket, jadi
+        # sumbu x bisa dipakai ulang antar frame; posisi minmax_decimate bergantung data.
+        if self._pyramids is not None:
+            self.x_key = (start, stop, n_buckets, self._sample_rate)
+        else:
+            self.x_key = None
+
+        series = []
+        for index, channel in enumerate(self._channels):
+            if self._pyramids is not None:
+                positions, values = self._pyramids[index].query(start, stop, n_buckets)
+            else:
+                positions, values = minmax_decimate(channel, n_buckets, start, stop)
+            series.append((positions / self._sample_rate, values))
+        return series
@@ -0,0 +1,315 @@
+# functions/detection.py
+
+import collections
+import math
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Deteksi target dari spektrum magnitudo (range profile FMCW: frekuensi beat ~ jarak).
+#
+#   magnitudo -> daya -> CFAR (ambang adaptif per sel) -> cluster sel terdeteksi
+#             -> satu puncak per cluster, diinterpolasi parabola -> Detection
+#
+# Semua langkah vectorized sepanjang axis bin; tidak ada loop Python per sel.
+
+Detection = collections.namedtuple("Detection", ["channel", "bin", "frequency", "power_db", "snr_db"])
+
+# --- Faktor Ambang CFAR --- #
+
+def ca_threshold_factor(n_train, pfa):
+    """
+    Faktor pengali rata-rata sel training (CA-CFAR, detektor square-law pada
+    noise Gaussian) untuk probabilitas false alarm `pfa`: N * (pfa^(-1/N) - 1).
+    `n_train` boleh berupa array (jumlah sel training berbeda di tepi spektrum).
+    """
+    n_train = np.asarray(n_train, dtype=np.float64)
+    with np.errstate(divide="ignore"):
+        return np.where(n_train > 0, n_train * (pfa ** (-1 / np.maximum(n_train, 1)) - 1), np.inf)
+
+def os_threshold_factor(n_train, rank, pfa):
+    """
+    Faktor pengali sel training ke-`rank` (1 = terkecil) pada OS-CFAR untuk
+    `pfa`, dari pfa = prod_{i<rank} (N - i) / (N - i + T). Dicari dengan bisection
+    karena tidak ada bentuk tertutupnya; cukup dihitung sekali per konfigurasi.
+    """
+    target = math.log(pfa)
+    terms = n_train - np.arange(rank)
+
+    def log_pfa(factor):
+        return float(np.sum(np.log(terms / (terms + factor))))
+
+    low, high = 0.0, 1.0
+    while log_pfa(high) > target:
+        high *= 2
+    for _ in range(100):
+        middle = (low + high) / 2
+        if log_pfa(middle) > target:
+            low = middle
+        else:
+            high = middle
+    return high
+
+# --- Cluster & Interpolasi --- #
+
+def cluster_peaks(mask, power, merge_gap=1):
+    """
+    Mengelompokkan sel terdeteksi yang bersebelahan (jarak <= merge_gap + 1 bin,
+    channel sama) menjadi satu cluster dan mengembalikan (channel, bin) sel
+    terkuat setiap cluster. Hanya sel terdeteksi yang disentuh, jadi biayanya
+    sebanding jumlah deteksi, bukan panjang spektrum.
+    """
+    channels, bins = np.nonzero(mask) # Terurut per channel lalu per bin
+    if len(bins) == 0:
+        return channels, bins
+    new_cluster = np.empty(len(bins), dtype=bool)
+    new_cluster[0] = True
+    new_cluster[1:] = (channels[1:] != channels[:-1]) | (np.diff(bins) > merge_gap + 1)
+    labels = np.cumsum(new_cluster)
+
+    # Urutkan per cluster, daya menurun; elemen pertama setiap cluster adalah puncaknya
+    order = np.lexsort((-power[channels, bins], labels))
+    first = np.empty(len(order), dtype=bool)
+    first[0] = True
+    first[1:] = labels[order][1:] != labels[order][:-1]
+    peaks = order[first]
+    return channels[peaks], bins[peaks]
+
+def parabolic_peak(left, center, right):
+    """
+    Interpolasi parabola melalui puncak dan dua tetangganya (sebaiknya dalam dB).
+    Mengembalikan (offset bin -0.5..0.5, nilai puncak); tanpa lengkungan ke bawah
+    offset-nya 0.
+    """
+    curvature = left - 2 * center + right
+    offset = np.zeros(np.shape(center), dtype=np.float64)
+    peaked = curvature < 0
+    offset[peaked] = 0.5 * (left - right)[peaked] / curvature[peaked]
+    np.clip(offset, -0.5, 0.5, out=offset)
+    return offset, center - 0.25 * (left - right) * offset
+
+# --- Detektor CFAR --- #
+
+class CFARDetector:
+    """
+    Detektor CFAR pada spektrum magnitudo (bins,) atau (channels, bins).
+
+    "ca" (cell averaging): estimasi noise setiap sel adalah rata-rata `train`
+    sel di kiri dan kanannya, dengan `guard` sel di sekitar sel uji dilewati.
+    Jumlah jendela diambil dari cumsum sekali jalan, jadi biayanya O(n)
+    berapa pun lebar jendelanya. Di tepi spektrum hanya sisi yang ada yang
+    dipakai dan faktor ambangnya disesuaikan dengan jumlah selnya.
+
+    "os" (ordered statistic): estimasi noise adalah sel training ke-`rank`
+    (default 3/4 dari 2 * train). Lebih tahan terhadap target berdekatan dan
+    tepi clutter, tetapi biayanya O(n * train) karena setiap jendela diurutkan
+    sebagian (np.partition, tetap vectorized).
+
+    Bin di bawah `min_bin` (DC dan leakage-nya) tidak pernah dideteksi. Index
+    jendela, faktor ambang dan buffer dialokasikan sekali per ukuran spektrum.
+    """
+
+    def __init__(self, method="ca", guard=2, train=16, pfa=1e-6, rank=None, merge_gap=1, min_bin=2,
+                 max_detections=32):
+        if method not in ("ca", "os"):
+            raise ValueError(f"Metode CFAR tidak dikenal: {method}")
+        self.method = method
+        self.guard = guard
+        self.train = train
+        self.pfa = pfa
+        self.rank = rank or max(1, (3 * 2 * train) // 4)
+        self.merge_gap = merge_gap
+        self.min_bin = min_bin
+        self.max_detections = max_detections
+        self._shape = None
+
+    def _prepare(self, shape):
+        if shape == self._shape:
+            return
+        channels, n = shape
+        cells = np.arange(n)
+        reach = self.guard + self.train
+        # Jumlah sel training per sel uji; di tepi spektrum jendelanya terpotong
+        n_train = (np.minimum(cells + reach + 1, n) - np.maximum(cells - reach, 0)) - \
+                  (np.minimum(cells + self.guard + 1, n) - np.maximum(cells - self.guard, 0))
+        if self.method == "ca":
+            self._factor = ca_threshold_factor(n_train, self.pfa)
+            # Ambang = faktor * rata-rata = (faktor / N) * jumlah
+            with np.errstate(divide="ignore", invalid="ignore"):
+                self._scale = np.where(n_train > 0, self._factor / n_train, np.inf)
+        else:
+            self._factor = self._scale = os_threshold_factor(2 * self.train, self.rank, self.pfa)
+
+        self._power = np.empty(shape, dtype=np.float64)
+        # cumsum dengan `reach` nilai tepi di kedua sisi: semua jendela menjadi slice biasa
+        self._cumsum = np.zeros((channels, n + 1 + 2 * reach), dtype=np.float64)
+        self._noise = np.empty(shape, dtype=np.float64)
+        self._scratch = np.empty(shape, dtype=np.float64)
+        self._shape = shape
+
+    def _ca_noise(self):
+        """Jumlah sel training kiri + kanan untuk semua sel sekaligus: empat slice dari satu cumsum."""
+        n = self._shape[1]
+        reach, guard = self.guard + self.train, self.guard
+        cumsum = self._cumsum
+        np.cumsum(self._power, axis=1, out=cumsum[:, reach + 1:reach + 1 + n])
+        cumsum[:, reach + 1 + n:] = cumsum[:, reach + n:reach + n + 1] # Bagian kiri tetap 0
+
+        # Jendela luar (2 * reach + 1 sel) dikurangi jendela guard (2 * guard + 1 sel)
+        noise, scratch = self._noise, self._scratch
+        np.subtract(cumsum[:, 2 * reach + 1:], cumsum[:, :n], out=noise)
+        np.subtract(cumsum[:, reach + guard + 1:reach + guard + 1 + n], cumsum[:, reach - guard:reach - guard + n],
+                    out=scratch)
+        noise -= scratch
+        np.maximum(noise, 0, out=noise) # Sisa pembulatan cumsum
+        with np.errstate(invalid="ignore"):
+            noise *= self._scale # Sel tanpa training (spektrum sangat pendek) -> nan, tidak terdeteksi
+        return noise
+
+    def _os_noise(self):
+        """Sel training ke-rank untuk semua sel: jendela geser (view) + np.partition."""
+        reach = self.guard + self.train
+        padded = np.pad(self._power, ((0, 0), (reach, reach)), mode="reflect")
+        windows = sliding_window_view(padded, 2 * reach + 1, axis=1)
+        training = np.concatenate((windows[..., :self.train], windows[..., -self.train:]), axis=-1)
+        noise = self._noise
+        noise[...] = np.partition(training, self.rank - 1, axis=-1)[..., self.rank - 1]
+        noise *= self._scale
+        return noise
+
+    def threshold(self, magnitudes):
+        """Ambang daya (channels, bins) untuk spektrum magnitudo; dipakai juga untuk plot/debug."""
+        magnitudes = np.atleast_2d(magnitudes)
+        self._prepare(magnitudes.shape)
+        np.square(magnitudes, out=self._power, dtype=np.float64)
+        if self.method == "ca":
+            return self._ca_noise()
+        if magnitudes.shape[1] <= self.guard + self.train:
+            return np.full(magnitudes.shape, np.inf) # Terlalu pendek untuk satu jendela OS
+        return self._os_noise()
+
+    def detect(self, magnitudes, freq_resolution, channel_offset=0):
+        """
+        Deteksi pada spektrum magnitudo dengan resolusi `freq_resolution` Hz per bin.
+        Mengembalikan daftar Detection (paling banyak max_detections, terkuat lebih dulu).
+        """
+        threshold = self.threshold(magnitudes)
+        power = self._power
+        mask = power > threshold
+        mask[:, :self.min_bin] = False
+
+        channels, bins = cluster_peaks(mask, power, self.merge_gap)
+        if len(bins) == 0:
+            return []
+        if len(bins) > self.max_detections:
+            strongest = np.argsort(power[channels, bins])[::-1][:self.max_detections]
+            channels, bins = channels[strongest], bins[strongest]
+
+        # Log hanya untuk puncak dan tetangganya, bukan seluruh spektrum
+        neighbours = np.clip(bins[:, np.newaxis] + np.arange(-1, 2), 0, power.shape[1] - 1)
+        local_db = 10 * np.log10(np.maximum(power[channels[:, np.newaxis], neighbours], 1e-30))
+        offset, peak_db = parabolic_peak(local_db[:, 0], local_db[:, 1], local_db[:, 2])
+        edge = (bins == 0) | (bins == power.shape[1] - 1) # Tepi spektrum tidak punya dua tetangga
+        offset[edge] = 0
+        peak_db[edge] = local_db[edge, 1]
+        # SNR terhadap estimasi noise (ambang dibagi faktornya), bukan terhadap ambang
+        factor = self._factor[bins] if np.ndim(self._factor) else self._factor
+        noise = threshold[channels, bins] / factor
+        snr_db = local_db[:, 1] - 10 * np.log10(np.maximum(noise, 1e-30))
+
+        fractional = bins + offset
+        order = np.argsort(peak_db)[::-1]
+        return [Detection(int(channels[i]) + channel_offset, float(fractional[i]),
+                          float(fractional[i] * freq_resolution), float(peak_db[i]), float(snr_db[i]))
+                for i in order]
+
+# --- Target PPI --- #
+
+class _Track:
+    __slots__ = ("angle_first", "angle_last", "radius", "strength", "hits", "updated")
+
+    def __init__(self, angle, radius, strength, now):
+        self.angle_first = self.angle_last = angle
+        self.radius = radius
+        self.strength = strength
+        self.hits = 1
+        self.updated = now
+
+class TargetPlot:
+    """
+    Mengubah deteksi per beam menjadi daftar target (angle, radius) untuk PPI.
+
+    Setiap deteksi dicatat pada sudut beam saat diterima. Deteksi yang jaraknya
+    dalam `range_gate` dan sudutnya dalam `angle_gate` dari target yang sudah
+    ada memperbarui target itu: selama beam menyapu target, rentang sudutnya
+    melebar (paling lebar `max_extent` derajat, sekitar lebar beam) dan target
+    diplot di tengah rentang tersebut pada jarak deteksi terkuat. Return yang
+    terus terdeteksi di semua azimuth tampil sebagai deretan target. Target
+    baru diplot setelah `min_hits` deteksi (false alarm CFAR tunggal tidak
+    tampil) dan dihapus jika tidak terdeteksi lagi selama `persistence` detik
+    (sekitar satu periode sapuan).
+
+    targets() mengembalikan list yang sama selama tidak ada perubahan, sehingga
+    PPIRenderer tidak menggambar ulang scatter target.
+    """
+
+    def __init__(self, range_gate=2.0, angle_gate=3.0, max_extent=6.0, min_hits=2, persistence=2.5, revisit=0.25,
+                 max_targets=256):
+        self.range_gate = range_gate
+        self.angle_gate = angle_gate
+        self.max_extent = max_extent
+        self.min_hits = min_hits
+        self.persistence = persistence
+        self.revisit = revisit # Jeda lebih lama dari ini = sapuan baru, rentang sudut dimulai ulang
+        self.max_targets = max_targets
+        self._tracks = []
+        self._targets = []
+        self._changed = False
+
+    def update(self, angle, radii, strengths, now):
+        """Mencatat deteksi (radius, strength) yang diterima saat beam berada di `angle`."""
+        for radius, strength in zip(radii, strengths):
+            track = self._nearest(angle, radius, now)
+            if track is None:
+                if len(self._tracks) < self.max_targets:
+                    self._tracks.append(_Track(angle, radius, strength, now))
+                    self._changed = True
+                continue
+            if now - track.updated > self.revisit:
+                track.angle_first = angle
+                track.radius, track.strength = radius, strength
+            elif strength >= track.strength:
+                track.radius, track.strength = radius, strength
+            track.angle_last = angle
+            track.hits += 1
+            track.updated = now
+            self._changed = True
+
+    def _nearest(self, angle, radius, now):
+        best, best_distance = None, self.range_gate
+        for track in self._tracks:
+            distance = abs(track.radius - radius)
+            if distance > best_distance or abs(track.angle_last - angle) > self.angle_gate:
+                continue
+            if now - track.updated <= self.revisit and abs(track.angle_first - angle) > self.max_extent:
+                continue # Rentang sudut target sudah selebar beam
+            best, best_distance = track, distance
+        return best
+
+    def targets(self, now):
+        """Daftar target (angle, radius) yang sudah terkonfirmasi dan belum kedaluwarsa."""
+        alive = [track for track in self._tracks if now - track.updated <= self.persistence]
+        if len(alive) != len(self._tracks):
+            self._tracks = alive
+            self._changed = True
+        if self._changed:
+            targets = [((track.angle_first + track.angle_last) / 2, track.radius)
+                       for track in self._tracks if track.hits >= self.min_hits]
+            if targets != self._targets:
+                self._targets = targets
+            self._changed = False
+        return self._targets
+
+    def clear(self):
+        self._tracks = []
+        self._targets = []
+        self._changed = False
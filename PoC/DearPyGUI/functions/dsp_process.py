@@ -0,0 +1,353 @@
+# functions/dsp_process.py
+
+import multiprocessing
+import os
+import queue
+import threading
+import time
+import numpy as np
+
+from config import SHM_MAX_SAMPLES, DSP_SHM_SLOTS, WATERFALL_NFFT, WATERFALL_MAX_COLUMNS
+from functions.acquisition import Frame
+from functions.channels import BoundedChannel
+from functions.data_processing import (acquisition_worker, detection_data_worker, fft_data_worker, sinewave_data_worker,
+                                       waterfall_data_worker)
+from functions.decimation import pack_pyramids, pyramid_pack_size, unpack_pyramids
+from functions.shm_ring import SharedFrameRing
+
+# Backend DSP multi-proses:
+#
+#   [proses akuisisi] --ring frame float32--> [proses FFT | waveform | waterfall | deteksi]
+#        --ring hasil per tahap + descriptor kecil lewat multiprocessing.Queue--> [proses UI]
+#
+# Fungsi worker yang sama dengan mode thread dipakai apa adanya; hanya queue
+# frame dan queue hasilnya yang diganti adaptor shared memory. Array besar tidak
+# pernah di-pickle: yang melewati pipe hanya dict skalar (status, seq, shape, ...)
+# dan daftar target kecil dari tahap deteksi. Piramida LOD yang dibangun worker
+# ikut ditulis ke slot yang sama, sehingga UI hanya membuat view, tidak menghitung ulang.
+
+# Tahap -> (fungsi worker, key array hasil, kapasitas nilai float32 per slot, kapasitas dikali
+#          jumlah channel hasil). Tahap tanpa key array (deteksi: daftar target kecil)
+# mengirim hasilnya utuh lewat queue descriptor.
+STAGES = {
+    "fft": (fft_data_worker, "magnitudes", SHM_MAX_SAMPLES // 2 + 1, True),
+    "sinewave": (sinewave_data_worker, "channels", SHM_MAX_SAMPLES, True),
+    "waterfall": (waterfall_data_worker, "rows", WATERFALL_MAX_COLUMNS * (WATERFALL_NFFT // 2) * 4, False),
+    "detection": (detection_data_worker, None, 0, False),
+}
+# Tahap yang wajib memproses setiap frame akuisisi: frame dibaca berurutan dari
+# ring dan frame yang tertimpa sebelum terbaca dihitung sebagai pelanggaran SLA.
+LOSSLESS_STAGES = ("detection",)
+
+# --- Sisi Proses DSP --- #
+
+class RingFramePublisher:
+    """Pengganti FrameHub di proses akuisisi: setiap frame ditulis ke ring shared memory."""
+
+    def __init__(self, ring_name, n_slots, max_samples):
+        self.ring_name = ring_name
+        self.n_slots = n_slots
+        self.max_samples = max_samples
+        self._ring = None
+
+    def publish(self, frame):
+        if self._ring is None:
+            # Jumlah channel ring mengikuti frame pertama
+            self._ring = SharedFrameRing.create(self.ring_name, self.n_slots, self.max_samples,
+                                                frame.channels, np.float32)
+        if frame.channels != self._ring.channels or frame.n_samples > self._ring.max_samples:
+            print(f"Frame #{frame.seq} ({frame.channels}x{frame.n_samples}) tidak muat di ring, dilewati.")
+            return
+        view = self._ring.begin_write(frame.n_samples).reshape(frame.n_samples, frame.channels)
+        view.T[...] = frame.data
+        self._ring.commit(frame.n_samples, frame.sample_rate, frame.timestamp)
+
+    def close(self):
+        if self._ring is not None:
+            self._ring.close()
+
+class SharedResultSender:
+    """
+    Pengganti result_queue di proses tahap DSP. Hasil "done" ditulis ke ring
+    hasil (float32, datar) dan hanya descriptor skalarnya yang dikirim ke UI;
+    pesan status lain dikirim apa adanya. Queue descriptor terbatas: jika UI
+    tertinggal, descriptor baru dibuang (dropped), bukan menumpuk.
+
+    Ring dibuat saat hasil pertama tiba. Dengan `per_channel`, kapasitas slot
+    adalah `max_values` x jumlah channel hasil itu (dimensi pertama array),
+    sehingga ring mengikuti jumlah channel sumber, bukan angka tetap.
+
+    Jika hasil membawa "pyramids", level-levelnya ditulis tepat setelah array
+    di slot yang sama (kapasitas slot ditambah ukuran piramida untuk
+    `max_values` sampel) dan descriptor mencatat ukuran blok dasarnya.
+    """
+
+    def __init__(self, ring_name, n_slots, max_values, array_key, descriptor_queue, per_channel=False):
+        self.ring_name = ring_name
+        self.n_slots = n_slots
+        self.max_values = max_values
+        self.array_key = array_key
+        self.descriptor_queue = descriptor_queue
+        self.per_channel = per_channel
+        self.dropped = 0
+        self.oversized = 0
+        self._ring = None
+
+    def put(self, result, block=True, timeout=None):
+        if result.get("status") != "done" or self.array_key is None:
+            self._send(result)
+            return
+
+        array = np.ascontiguousarray(result[self.array_key], dtype=np.float32)
+        pyramids = result.get("pyramids")
+        base_block = pyramids[0].base_block if pyramids else None
+        if self._ring is None:
+            channels = array.shape[0] if self.per_channel and array.ndim > 1 else 1
+            capacity = self.max_values * channels
+            if base_block is not None:
+                capacity += pyramid_pack_size(len(pyramids), self.max_values, base_block)
+            self._ring = SharedFrameRing.create(self.ring_name, self.n_slots, capacity, 1, np.float32)
+
+        total = array.size
+        if base_block is not None:
+            total += pyramid_pack_size(len(pyramids), array.shape[-1], base_block)
+        if total > self._ring.max_samples:
+            # Mis. jumlah channel sumber bertambah setelah ring dibuat; dilaporkan sekali saja
+            if self.oversized == 0:
+                print(f"Hasil '{self.array_key}' ({total} nilai) melebihi kapasitas ring "
+                      f"({self._ring.max_samples}), dilewati.")
+            self.oversized += 1
+            return
+
+        slot = self._ring.begin_write(total)
+        slot[:array.size] = array.reshape(-1)
+        if base_block is not None:
+            pack_pyramids(pyramids, slot[array.size:])
+        slot_seq = self._ring.commit(total, result.get("sample_rate", 0))
+
+        # Hanya nilai skalar yang ikut descriptor; array lain dibangun ulang di UI
+        descriptor = {key: value for key, value in result.items() if isinstance(value, (bool, int, float, str))}
+        descriptor["slot_seq"] = slot_seq
+        descriptor["shape"] = array.shape
+        descriptor["pyramid_block"] = base_block
+        self._send(descriptor)
+
+    def _send(self, message):
+        try:
+            self.descriptor_queue.put_nowait(message)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        if self._ring is not None:
+            self._ring.close()
+
+def _read_frames(ring_name, frame_channel, stop_event, missed=None):
+    """
+    Thread di proses tahap DSP: membaca frame terbaru dari ring akuisisi.
+
+    Dengan `missed` (multiprocessing.Value) setiap frame dibaca berurutan dan
+    diteruskan ke `frame_channel` dengan menunggu (kanal "block"), untuk tahap
+    yang wajib memproses semua frame (deteksi). Frame yang slotnya sudah
+    ditimpa sebelum terbaca dihitung di `missed`.
+    """
+    ring = None
+    last_seq = 0
+    try:
+        while not stop_event.is_set():
+            if ring is None:
+                try:
+                    ring = SharedFrameRing.attach(ring_name, untracked=False)
+                except FileNotFoundError:
+                    time.sleep(0.1) # Proses akuisisi belum menerima frame pertama
+                    continue
+
+            if missed is None:
+                latest = ring.read_latest(last_seq)
+            else:
+                latest = _read_next(ring, last_seq, missed)
+            if latest is None:
+                time.sleep(0.001)
+                continue
+            seq, sample_rate, timestamp, view = latest
+            data = np.array(view, dtype=np.float32) # Satu salinan keluar dari shared memory
+            del view
+            last_seq = seq
+            if not ring.is_valid(seq):
+                if missed is not None:
+                    with missed.get_lock():
+                        missed.value += 1
+                continue
+            frame = Frame(seq, timestamp, sample_rate, data)
+            if missed is None:
+                frame_channel.put(frame)
+                continue
+            while not stop_event.is_set():
+                try:
+                    frame_channel.put(frame, timeout=0.5)
+                    break
+                except queue.Full:
+                    pass
+    finally:
+        if ring is not None:
+            ring.close()
+
+def _read_next(ring, last_seq, missed):
+    """Frame setelah `last_seq` (atau frame terbaru saat mulai); slot yang tertimpa dilewati dan dihitung."""
+    write_index = ring.write_index
+    if write_index <= last_seq:
+        return None
+    seq = last_seq + 1 if last_seq else write_index
+    oldest = write_index - ring.n_slots + 1
+    if seq < oldest:
+        with missed.get_lock():
+            missed.value += oldest - seq
+        seq = oldest
+    frame = ring.read(seq)
+    if frame is None:
+        # Tertimpa di antara write_index dan read: dihitung pada panggilan berikutnya
+        return None
+    return (seq, *frame)
+
+def _acquisition_process(ring_name, stop_event):
+    publisher = RingFramePublisher(ring_name, DSP_SHM_SLOTS, SHM_MAX_SAMPLES)
+    try:
+        acquisition_worker(publisher, stop_event)
+    finally:
+        publisher.close()
+
+def _stage_process(stage, frames_ring_name, result_ring_name, descriptor_queue, stop_event, missed):
+    worker, array_key, max_values, per_channel = STAGES[stage]
+    if stage in LOSSLESS_STAGES:
+        frame_channel = BoundedChannel(8, overflow="block")
+    else:
+        frame_channel, missed = BoundedChannel(2, overflow="drop_oldest"), None
+    reader = threading.Thread(target=_read_frames, args=(frames_ring_name, frame_channel, stop_event, missed),
+                              daemon=True)
+    reader.start()
+    sender = SharedResultSender(result_ring_name, DSP_SHM_SLOTS, max_values, array_key, descriptor_queue, per_channel)
+    try:
+        worker(frame_channel, sender, stop_event)
+    finally:
+        reader.join(timeout=1)
+        sender.close()
+
+# --- Sisi Proses UI --- #
+
+def _receive_results(stage, result_ring_name, descriptor_queue, result_channel, stop_event, counters):
+    """
+    Thread di proses UI: menerima descriptor, menyalin array hasil dari ring
+    (jika slotnya belum ditimpa), lalu menyusun dict hasil seperti mode thread.
+    Piramida LOD diambil dari slot sebagai view ke salinan yang sama.
+    """
+    _, array_key, _, _ = STAGES[stage]
+    ring = None
+    try:
+        while not stop_event.is_set():
+            try:
+                message = descriptor_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+            if "slot_seq" not in message:
+                result_channel.put(message)
+                continue
+            if ring is None:
+                ring = SharedFrameRing.attach(result_ring_name, untracked=False)
+
+            slot_seq = message.pop("slot_seq")
+            shape = message.pop("shape")
+            pyramid_block = message.pop("pyramid_block")
+            frame = ring.read(slot_seq)
+            if frame is None:
+                counters[stage] += 1
+                continue
+            values = np.array(frame[2][0])
+            del frame
+            if not ring.is_valid(slot_seq):
+                counters[stage] += 1 # Slot ditimpa saat disalin
+                continue
+
+            size = int(np.prod(shape))
+            array = values[:size].reshape(shape)
+            message[array_key] = array
+            if pyramid_block is not None:
+                message["pyramids"] = unpack_pyramids(array, values[size:], pyramid_block)
+            result_channel.put(message)
+    except Exception as e:
+        print(f"Error in {stage} result receiver: {e}")
+    finally:
+        if ring is not None:
+            ring.close()
+
+class _SharedCounter:
+    """Penghitung lintas proses dengan stats() seperti kanal, untuk telemetri."""
+
+    def __init__(self, context):
+        self.value = context.Value("q", 0)
+
+    def stats(self):
+        return {"put": 0, "get": 0, "dropped": self.value.value, "depth": 0}
+
+class DSPProcessBackend:
+    """
+    Menjalankan akuisisi dan tahap-tahap DSP di proses terpisah (lepas dari GIL
+    proses UI). `result_channels` memetakan nama tahap ("fft", "sinewave",
+    "waterfall", "detection") ke kanal hasil di UI, sama seperti yang dipakai mode thread.
+
+    Memakai konteks "spawn", sehingga skrip utama harus dilindungi
+    `if __name__ == "__main__":`.
+
+    `detection_frames` menghitung frame akuisisi yang tidak sempat diproses
+    tahap deteksi (slot ring tertimpa karena detektor tertinggal).
+    """
+
+    def __init__(self, result_channels: dict, descriptor_queue_size=8):
+        self.result_channels = result_channels
+        self.descriptor_queue_size = descriptor_queue_size
+        self._context = multiprocessing.get_context("spawn")
+        self._stop_event = self._context.Event()
+        self._processes = []
+        self._threads = []
+        self._prefix = f"uiradar_{os.getpid()}"
+        self.dropped = {stage: 0 for stage in result_channels}
+        self.detection_frames = _SharedCounter(self._context)
+
+    def start(self):
+        frames_ring_name = f"{self._prefix}_frames"
+        self._processes.append(self._context.Process(
+            target=_acquisition_process, args=(frames_ring_name, self._stop_event),
+            name="dsp-acquisition", daemon=True))
+
+        for stage, result_channel in self.result_channels.items():
+            result_ring_name = f"{self._prefix}_{stage}"
+            descriptor_queue = self._context.Queue(maxsize=self.descriptor_queue_size)
+            self._processes.append(self._context.Process(
+                target=_stage_process,
+                args=(stage, frames_ring_name, result_ring_name, descriptor_queue, self._stop_event,
+                      self.detection_frames.value),
+                name=f"dsp-{stage}", daemon=True))
+            self._threads.append(threading.Thread(
+                target=_receive_results,
+                args=(stage, result_ring_name, descriptor_queue, result_channel, self._stop_event, self.dropped),
+                daemon=True))
+
+        for process in self._processes:
+            process.start()
+        for thread in self._threads:
+            thread.start()
+        print(f"DSP backend started: {len(self._processes)} processes.")
+
+    def stats(self):
+        """Jumlah hasil yang hilang di jalur shared memory (slot tertimpa) untuk telemetri."""
+        return {"dropped": sum(self.dropped.values()), "depth": 0}
+
+    def stop(self, timeout=2.0):
+        self._stop_event.set()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        for process in self._processes:
+            process.join(timeout=timeout)
+            if process.is_alive():
+                process.terminate()
+        print("DSP backend stopped.")
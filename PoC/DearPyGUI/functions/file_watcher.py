@@ -0,0 +1,150 @@
+# functions/file_watcher.py
+
+import os
+import sys
+import time
+import select
+import struct
+import ctypes
+import ctypes.util
+
+# --- Konstanta inotify (lihat <sys/inotify.h>) --- #
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+# --- Watcher Berbasis Event (Linux) --- #
+
+class InotifyWatcher:
+    """
+    Memantau file lewat inotify pada direktori induknya.
+    Hanya IN_CLOSE_WRITE dan IN_MOVED_TO yang dilaporkan, sehingga pembaca
+    baru dibangunkan setelah penulis menutup file (atau rename atomik selesai)
+    dan tidak pernah melihat file yang setengah ditulis.
+    """
+
+    def __init__(self, filepath):
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify hanya tersedia di Linux")
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 gagal")
+
+        directory = os.path.dirname(os.path.abspath(filepath))
+        wd = libc.inotify_add_watch(self._fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(errno, f"inotify_add_watch gagal untuk '{directory}'")
+
+        self._name = os.fsencode(os.path.basename(filepath))
+        # File yang sudah ada saat start dianggap sebagai perubahan pertama
+        self._pending = os.path.exists(filepath)
+
+    def wait_for_change(self, timeout, stop_event=None):
+        """Menunggu hingga file selesai ditulis. Mengembalikan False jika timeout atau `stop_event` di-set."""
+        if self._pending:
+            self._pending = False
+            return True
+
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or (stop_event is not None and stop_event.is_set()):
+                return False
+            readable, _, _ = select.select([self._fd], [], [], remaining)
+            if readable and self._drain_events():
+                return True
+
+    def _drain_events(self):
+        """Membaca semua event yang tertunda; True jika ada yang menyangkut file ini."""
+        changed = False
+        while True:
+            try:
+                buf = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(buf):
+                _, mask, _, length = _EVENT_HEADER.unpack_from(buf, offset)
+                offset += _EVENT_HEADER.size
+                name = buf[offset:offset + length].rstrip(b"\0")
+                offset += length
+                if mask & IN_Q_OVERFLOW or name == self._name:
+                    changed = True
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+# --- Watcher Polling (Fallback) --- #
+
+class PollingWatcher:
+    """
+    Fallback portabel berbasis os.stat. Tanda tangan file memakai mtime dalam
+    nanodetik, ukuran dan inode agar update cepat tidak terlewat karena
+    granularitas mtime. Perubahan baru dilaporkan setelah tanda tangan stabil
+    selama `settle_interval`, untuk menghindari file yang masih ditulis.
+    """
+
+    def __init__(self, filepath, interval, settle_interval=0.02):
+        self._filepath = filepath
+        self._interval = interval
+        self._settle_interval = settle_interval
+        self._last_signature = None
+
+    def _signature(self):
+        try:
+            st = os.stat(self._filepath)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def wait_for_change(self, timeout, stop_event=None):
+        """
+        Menunggu hingga file berubah dan stabil. Mengembalikan False jika timeout
+        atau `stop_event` di-set, termasuk saat file terus ditulis ulang dan
+        tanda tangannya tidak pernah stabil.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or (stop_event is not None and stop_event.is_set()):
+                return False
+
+            signature = self._signature()
+            if signature is not None and signature != self._last_signature:
+                time.sleep(min(self._settle_interval, remaining))
+                if self._signature() == signature:
+                    self._last_signature = signature
+                    return True
+                continue
+
+            time.sleep(min(self._interval, remaining))
+
+    def close(self):
+        pass
+
+# --- Factory --- #
+
+def create_file_watcher(filepath, mode="auto", polling_interval=0.2):
+    """
+    Membuat watcher sesuai mode: "inotify", "polling", atau "auto"
+    (inotify jika tersedia, selain itu polling).
+    """
+    if mode in ("auto", "inotify"):
+        try:
+            return InotifyWatcher(filepath)
+        except OSError as e:
+            if mode == "inotify":
+                raise
+            print(f"inotify tidak tersedia ({e}), kembali ke mode polling.")
+    return PollingWatcher(filepath, polling_interval)
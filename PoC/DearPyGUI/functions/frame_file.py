@@ -0,0 +1,123 @@
+# functions/frame_file.py
+
+import os
+import time
+import struct
+import collections
+import numpy as np
+
+# --- Format Frame File --- #
+#
+# Satu file berisi tepat satu frame:
+#   [header 64 byte][payload: sampel interleaved, n_samples * channels]
+#
+# Header (little-endian):
+#   magic(4s) version(H) header_size(H) channels(H) dtype_code(H)
+#   seq(Q) sample_rate(d) n_samples(Q) timestamp(d) payload_bytes(Q) + padding
+#
+# Penulis selalu menulis ke file sementara lalu melakukan os.replace (rename
+# atomik), sehingga pembaca hanya pernah melihat frame lama yang utuh atau
+# frame baru yang utuh. payload_bytes dipakai untuk memvalidasi ukuran.
+
+FRAME_MAGIC = b"URFF"
+FRAME_VERSION = 1
+HEADER_SIZE = 64
+
+_HEADER_STRUCT = struct.Struct("<4sHHHHQdQdQ")
+
+DTYPE_CODES = {
+    0: np.dtype("<u2"),
+    1: np.dtype("<i2"),
+    2: np.dtype("<f4"),
+}
+_DTYPE_TO_CODE = {dtype: code for code, dtype in DTYPE_CODES.items()}
+
+FrameHeader = collections.namedtuple(
+    "FrameHeader", ["seq", "sample_rate", "channels", "dtype", "n_samples", "timestamp"]
+)
+
+# --- Penulisan --- #
+
+def pack_frame_header(seq, sample_rate, channels, dtype, n_samples, timestamp):
+    """Menyusun header frame 64 byte."""
+    dtype = np.dtype(dtype)
+    if dtype not in _DTYPE_TO_CODE:
+        raise ValueError(f"dtype tidak didukung oleh frame file: {dtype}")
+    header = _HEADER_STRUCT.pack(
+        FRAME_MAGIC, FRAME_VERSION, HEADER_SIZE, channels, _DTYPE_TO_CODE[dtype],
+        seq, float(sample_rate), n_samples, timestamp, n_samples * channels * dtype.itemsize,
+    )
+    return header.ljust(HEADER_SIZE, b"\0")
+
+def write_frame_file(filepath, interleaved, channels, seq, sample_rate, timestamp=None, retries=20):
+    """
+    Menulis satu frame (array interleaved) secara atomik ke `filepath`.
+    Data ditulis ke file sementara di direktori yang sama lalu di-rename.
+    """
+    interleaved = np.ascontiguousarray(interleaved)
+    n_samples = len(interleaved) // channels
+    if timestamp is None:
+        timestamp = time.time()
+
+    tmp_path = f"{filepath}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(pack_frame_header(seq, sample_rate, channels, interleaved.dtype, n_samples, timestamp))
+        f.write(memoryview(interleaved[:n_samples * channels]).cast("B"))
+
+    # Di Windows os.replace gagal jika target sedang dibuka pembaca; coba ulang sebentar
+    for attempt in range(retries):
+        try:
+            os.replace(tmp_path, filepath)
+            return
+        except PermissionError:
+            if attempt == retries - 1:
+                raise
+            time.sleep(0.005)
+
+# --- Pembacaan --- #
+
+def read_frame_header(filepath):
+    """
+    Membaca header frame saja (64 byte).
+    Mengembalikan FrameHeader, None jika file bukan frame file (format lama),
+    atau memunculkan ValueError jika header rusak.
+    """
+    with open(filepath, "rb") as f:
+        raw = f.read(HEADER_SIZE)
+    return _parse_header(raw, os.path.getsize(filepath))
+
+def _parse_header(raw, file_size):
+    if len(raw) < HEADER_SIZE or raw[:4] != FRAME_MAGIC:
+        return None
+    (_, version, header_size, channels, dtype_code, seq, sample_rate,
+     n_samples, timestamp, payload_bytes) = _HEADER_STRUCT.unpack_from(raw)
+    if version != FRAME_VERSION or header_size != HEADER_SIZE or dtype_code not in DTYPE_CODES:
+        raise ValueError(f"Header frame tidak dikenal (versi {version}, dtype {dtype_code})")
+    dtype = DTYPE_CODES[dtype_code]
+    if payload_bytes != n_samples * channels * dtype.itemsize or file_size < HEADER_SIZE + payload_bytes:
+        raise ValueError("Ukuran payload frame tidak sesuai header")
+    return FrameHeader(seq, sample_rate, channels, dtype, n_samples, timestamp)
+
+def load_frame_file(filepath, last_seq=None):
+    """
+    Memuat frame file sebagai (FrameHeader, view (channels, n) ke data mentah).
+    Mengembalikan None jika sequence sama dengan `last_seq` (frame sudah diproses).
+    Karena penulis memakai rename atomik, file aman di-memory-map: inode lama
+    tetap hidup selama view masih dipakai walaupun frame baru sudah masuk.
+    """
+    with open(filepath, "rb") as f:
+        header = _parse_header(f.read(HEADER_SIZE), os.fstat(f.fileno()).st_size)
+        if header is None:
+            raise ValueError(f"'{filepath}' bukan frame file")
+        if header.seq == last_seq:
+            return None
+        if header.n_samples == 0:
+            return header, np.empty((header.channels, 0), dtype=header.dtype)
+        raw = np.memmap(f, dtype=header.dtype, mode="r", offset=HEADER_SIZE,
+                        shape=(header.n_samples * header.channels,))
+    return header, raw.reshape(header.n_samples, header.channels).T
+
+def is_frame_file(filepath):
+    """True jika file diawali magic frame file."""
+    with open(filepath, "rb") as f:
+        return f.read(4) == FRAME_MAGIC
@@ -0,0 +1,169 @@
+# functions/instrumentation.py
+
+import bisect
+import contextlib
+import json
+import threading
+import time
+
+from config import INSTRUMENTATION_ENABLED
+
+# --- Histogram Latensi --- #
+
+# Batas bin log: 4 bin per oktaf dari 1 us sampai ~134 detik
+_BIN_EDGES = [1e-6 * 2 ** (i / 4) for i in range(4 * 27 + 1)]
+
+class LatencyHistogram:
+    """
+    Histogram durasi (detik) dengan bin logaritmik tetap, sehingga memori dan
+    biaya record() konstan berapa pun jumlah sampelnya. Persentil diperkirakan
+    dari batas atas bin (resolusi ~19%).
+    """
+
+    def __init__(self):
+        self.counts = [0] * (len(_BIN_EDGES) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        self.counts[bisect.bisect_left(_BIN_EDGES, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q):
+        if self.count == 0:
+            return 0.0
+        target = q / 100 * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= target:
+                return min(_BIN_EDGES[index], self.max) if index < len(_BIN_EDGES) else self.max
+        return self.max
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "mean_ms": 1e3 * self.total / self.count if self.count else 0.0,
+            "p50_ms": 1e3 * self.percentile(50),
+            "p90_ms": 1e3 * self.percentile(90),
+            "p99_ms": 1e3 * self.percentile(99),
+            "max_ms": 1e3 * self.max,
+        }
+
+# --- Telemetri --- #
+
+class _StageTimer:
+    __slots__ = ("telemetry", "name", "start")
+
+    def __init__(self, telemetry, name):
+        self.telemetry = telemetry
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.telemetry.record(self.name, time.perf_counter() - self.start)
+        return False
+
+_NULL_TIMER = contextlib.nullcontext()
+
+class Telemetry:
+    """
+    Pengumpul metrik per tahap pipeline:
+      - timer(name)            -> histogram durasi tahap (perf_counter)
+      - count(name, n)         -> penghitung frame masuk/keluar/dibuang
+      - record_latency(name, t)-> latensi end-to-end dari timestamp akuisisi (time.time)
+      - watch_channel(name, c) -> kedalaman & drop kanal (dibaca saat snapshot);
+                                  dengan sla=True setiap drop dilaporkan sebagai
+                                  pelanggaran SLA (kanal yang wajib lossless)
+
+    Jika `enabled` False semua metode langsung kembali (timer() mengembalikan
+    context manager kosong yang sama), sehingga biaya instrumentasi di jalur
+    panas hampir nol.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._counters = {}
+        self._channels = {}
+        self._sla_channels = set()
+        self._started = time.time()
+
+    def timer(self, name):
+        if not self.enabled:
+            return _NULL_TIMER
+        return _StageTimer(self, name)
+
+    def record(self, name, seconds):
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = LatencyHistogram()
+            histogram.record(seconds)
+
+    def record_latency(self, name, timestamp):
+        """Latensi dari `timestamp` (time.time saat frame diakuisisi) sampai sekarang."""
+        if not self.enabled or not timestamp:
+            return
+        self.record(name, max(0.0, time.time() - timestamp))
+
+    def count(self, name, n=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def watch_channel(self, name, channel, sla=False):
+        """
+        Mendaftarkan kanal (punya stats()) untuk dilaporkan kedalaman & drop-nya.
+        sla=True: kanal ini tidak boleh kehilangan pesan, jadi drop-nya juga
+        muncul di "sla_violations".
+        """
+        self._channels[name] = channel
+        if sla:
+            self._sla_channels.add(name)
+
+    def snapshot(self):
+        """Semua metrik sebagai dict yang bisa di-serialisasi JSON."""
+        with self._lock:
+            stages = {name: histogram.snapshot() for name, histogram in sorted(self._histograms.items())}
+            counters = dict(sorted(self._counters.items()))
+        channels = {}
+        for name, channel in sorted(self._channels.items()):
+            try:
+                channels[name] = channel.stats()
+            except Exception:
+                pass
+        sla_violations = {name: channels[name].get("dropped", 0) for name in sorted(self._sla_channels)
+                          if channels.get(name, {}).get("dropped", 0) > 0}
+        return {
+            "enabled": self.enabled,
+            "uptime_s": time.time() - self._started,
+            "stages": stages,
+            "counters": counters,
+            "channels": channels,
+            "sla_violations": sla_violations,
+        }
+
+    def dump_json(self, filepath):
+        with open(filepath, "w") as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._started = time.time()
+
+# Instance global yang dipakai semua worker dan UI
+telemetry = Telemetry(enabled=INSTRUMENTATION_ENABLED)
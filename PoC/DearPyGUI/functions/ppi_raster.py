@@ -0,0 +1,68 @@
+# functions/ppi_raster.py
+
+import numpy as np
+
+from functions.scan_conversion import get_scan_lut, sector_slice
+
+# --- Video Return Sintetis --- #
+
+def synthesize_returns(angle, targets, n_bins, max_range=100, beam_width_deg=3.0, noise_level=0.05, rng=None):
+    """
+    Menghasilkan video return (n_bins,) 0..1 sepanjang beam pada sudut `angle`:
+    noise floor Rayleigh ditambah echo Gaussian untuk setiap target (angle, radius)
+    yang berada di dalam lebar beam. Dipakai selama belum ada video radar asli.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    returns = (noise_level * rng.rayleigh(size=n_bins)).astype(np.float32)
+    if len(targets) == 0:
+        return returns
+
+    polar = np.asarray(targets, dtype=np.float64)
+    offset = np.abs(polar[:, 0] - angle)
+    visible = polar[offset <= beam_width_deg]
+    if len(visible):
+        # Gain beam (Gaussian terhadap sudut) x echo Gaussian di sekitar bin jarak target
+        gain = np.exp(-0.5 * (np.abs(visible[:, 0] - angle) / (beam_width_deg / 2)) ** 2)
+        centers = visible[:, 1] / max_range * n_bins
+        bins = np.arange(n_bins)
+        echoes = gain[:, np.newaxis] * np.exp(-0.5 * ((bins - centers[:, np.newaxis]) / 1.5) ** 2)
+        returns += echoes.max(axis=0).astype(np.float32)
+    np.clip(returns, 0, 1, out=returns)
+    return returns
+
+# --- Buffer Persistence (Phosphor) --- #
+
+class PhosphorBuffer:
+    """
+    Citra intensitas Cartesian (height, width) float32 untuk PPI setengah lingkaran
+    (0..180 derajat), meniru layar fosfor: setiap frame seluruh citra dikalikan
+    `decay` (satu operasi vectorized), lalu return jarak baru dilukis pada sektor
+    yang baru disapu beam. Biaya per frame konstan (sebanding jumlah piksel),
+    tidak bergantung pada jumlah target maupun panjang riwayat. Pemetaan piksel
+    ke (azimuth, bin jarak) diambil dari LUT scan conversion yang di-cache.
+
+    Baris 0 adalah bagian atas PPI (jarak maksimum), pusat radar di tengah bawah.
+    """
+
+    def __init__(self, width=512, n_bins=256, max_range=100, decay=0.97, azimuth_resolution=0.25):
+        self.decay = decay
+        self.max_range = max_range
+        self.lut = get_scan_lut(width, n_bins, azimuth_resolution, max_range)
+        self.intensity = np.zeros((self.lut.height, self.lut.width), dtype=np.float32)
+        self._flat = self.intensity.reshape(-1)
+
+    def step(self):
+        """Peluruhan fosfor untuk satu frame."""
+        self.intensity *= self.decay
+
+    def paint(self, start_angle, end_angle, returns):
+        """
+        Melukis return (n_bins,) ke semua piksel di sektor [start_angle, end_angle].
+        Hanya piksel sektor tersebut yang disentuh (lewat LUT scan conversion).
+        """
+        sector = sector_slice(self.lut, start_angle, end_angle)
+        pixels = self.lut.pixel_index[sector]
+        self._flat[pixels] = np.maximum(self._flat[pixels], returns[self.lut.bin_index[sector]])
+
+    def clear(self):
+        self.intensity.fill(0)
@@ -0,0 +1,329 @@
+# functions/recorder.py
+
+import json
+import os
+import queue
+import threading
+import time
+import numpy as np
+
+from config import RECORD_DIRECTORY, RECORD_CHUNK_BYTES, RECORD_BLOCK_BYTES, RECORD_BUFFER_BLOCKS
+
+# --- Format Rekaman --- #
+#
+# Satu rekaman adalah satu direktori:
+#   recording.json   metadata (format, versi, channels, dtype, chunk_bytes)
+#   chunk_00000.bin  payload frame mentah (sampel interleaved) berurutan, tanpa header
+#   chunk_00001.bin  ... chunk baru dibuka jika chunk aktif melewati chunk_bytes
+#   index.bin        satu record 48 byte per frame (INDEX_DTYPE), urutan sama dengan frame
+#
+# Frame tidak pernah terbelah antar chunk, sehingga frame ke-k cukup dibaca dari
+# index[k] -> (chunk, offset, n_samples) tanpa memindai file: seek O(1).
+# Data ditulis sebelum record index-nya, jadi rekaman yang terputus (crash)
+# hanya kehilangan frame terakhir yang belum ter-index.
+
+RECORDING_FORMAT = "uiradar-recording"
+RECORDING_VERSION = 1
+METADATA_FILE = "recording.json"
+INDEX_FILE = "index.bin"
+
+INDEX_DTYPE = np.dtype([
+    ("chunk", "<u4"), ("reserved", "<u4"), ("offset", "<u8"), ("n_samples", "<u8"),
+    ("seq", "<u8"), ("timestamp", "<f8"), ("sample_rate", "<f8"),
+])
+
+def chunk_filename(chunk):
+    return f"chunk_{chunk:05d}.bin"
+
+# --- Buffer Tulis --- #
+
+class _Block:
+    """Buffer besar yang diisi beberapa frame sebelum ditulis dengan satu write()."""
+
+    def __init__(self, size):
+        self.data = np.empty(size, dtype=np.uint8)
+        self.used = 0
+        self.entries = [] # (offset di blok, n_samples, seq, timestamp, sample_rate)
+        self.created = 0.0
+
+    def reset(self):
+        self.used = 0
+        self.entries.clear()
+        self.created = time.monotonic()
+
+# --- Perekam --- #
+
+class Recorder:
+    """
+    Tahap perekam: acquisition_worker menyerahkan setiap frame mentah lewat
+    submit(), yang hanya menyalin sampel ke blok buffer yang sudah dialokasikan.
+    Thread penulis menulis blok penuh ke chunk aktif secara sekuensial lalu
+    menambahkan record index-nya.
+
+    Buffer dibatasi `n_blocks` blok x `block_bytes`. Jika disk tidak mengikuti
+    dan semua blok sedang menunggu ditulis, frame baru dibuang (`dropped`),
+    bukan menahan akuisisi dan tampilan.
+
+    Untuk sumber yang baru bisa memvalidasi frame setelah disalin (seqlock
+    shared memory), frame disalin dengan reserve() lalu diterbitkan dengan
+    commit() atau dibuang dengan abort(). Sebelum commit() frame belum
+    ter-index dan belum dihitung dalam `used` blok, jadi tidak pernah ditulis.
+    """
+
+    def __init__(self, directory=RECORD_DIRECTORY, chunk_bytes=RECORD_CHUNK_BYTES,
+                 block_bytes=RECORD_BLOCK_BYTES, n_blocks=RECORD_BUFFER_BLOCKS, flush_interval=0.5):
+        self.directory = directory
+        self.chunk_bytes = chunk_bytes
+        self.block_bytes = block_bytes
+        self.n_blocks = n_blocks
+        self.flush_interval = flush_interval
+        self.path = None
+        self._lock = threading.Lock()
+        self._free = queue.Queue()
+        self._full = queue.Queue()
+        self._blocks_allocated = False
+        self._block = None
+        self._pending = None # (blok, entry index, n_bytes) dari reserve() terakhir
+        self._thread = None
+        self._layout = None
+        self._reset_counters()
+
+    def _reset_counters(self):
+        self.frames = 0
+        self.bytes_written = 0
+        self.dropped = 0
+        self.submitted = 0
+        self.aborted = 0
+        self.write_errors = 0
+
+    @property
+    def recording(self):
+        return self._thread is not None
+
+    def start(self, name=None):
+        """Membuka rekaman baru di `directory` dan memulai thread penulis. Mengembalikan path-nya."""
+        if self.recording:
+            return self.path
+        name = name or time.strftime("recording_%Y%m%d_%H%M%S")
+        self.path = os.path.join(self.directory, name)
+        os.makedirs(self.path, exist_ok=False)
+        if not self._blocks_allocated:
+            for _ in range(self.n_blocks):
+                self._free.put(_Block(self.block_bytes))
+            self._blocks_allocated = True
+        self._reset_counters()
+        self._layout = None
+        self._thread = threading.Thread(target=self._writer_loop, args=(self.path,), name="recorder", daemon=True)
+        self._thread.start()
+        print(f"Recording to '{self.path}'.")
+        return self.path
+
+    def stop(self):
+        """Menulis sisa buffer, menutup file dan menghentikan thread penulis."""
+        with self._lock:
+            if self._thread is None:
+                return
+            if self._block is not None:
+                self._full.put(self._block)
+                self._block = None
+            self._pending = None
+            self._full.put(None)
+            thread, self._thread = self._thread, None
+        thread.join()
+        print(f"Recording stopped: {self.frames} frames, {self.bytes_written / 1e6:.1f} MB, {self.dropped} dropped.")
+
+    def submit(self, seq, timestamp, sample_rate, raw_channels):
+        """
+        Menyalin satu frame mentah (channels, n) ke buffer rekaman. Tidak pernah
+        menunggu disk; mengembalikan False jika frame dibuang.
+        """
+        return self.reserve(seq, timestamp, sample_rate, raw_channels) and self.commit()
+
+    def reserve(self, seq, timestamp, sample_rate, raw_channels):
+        """
+        Seperti submit(), tetapi frame hanya disalin ke blok aktif dan belum
+        diterbitkan: lanjutkan dengan commit() atau abort(). Mengembalikan
+        False jika frame dibuang.
+        """
+        with self._lock:
+            self._pending = None
+            if self._thread is None:
+                return False
+            self.submitted += 1
+            channels, n_samples = raw_channels.shape
+            layout = (channels, raw_channels.dtype.str)
+            if self._layout is None:
+                self._layout = layout
+                self._full.put(layout) # Metadata ditulis oleh thread penulis
+            elif layout != self._layout:
+                self.dropped += 1 # Format frame berubah di tengah rekaman
+                return False
+
+            n_bytes = channels * n_samples * raw_channels.dtype.itemsize
+            block = self._block
+            if block is not None and (block.used + n_bytes > len(block.data) or
+                                      time.monotonic() - block.created > self.flush_interval):
+                self._full.put(block)
+                block = self._block = None
+            if block is None:
+                try:
+                    block = self._free.get_nowait()
+                except queue.Empty:
+                    self.dropped += 1 # Semua blok menunggu disk
+                    return False
+                if len(block.data) < n_bytes:
+                    self._free.put(block)
+                    block = _Block(n_bytes) # Frame lebih besar dari blok: buffer khusus
+                block.reset()
+                self._block = block
+
+            # De-interleave terbalik: (channels, n) -> (n, channels) langsung ke buffer
+            target = block.data[block.used:block.used + n_bytes].view(raw_channels.dtype)
+            np.copyto(target.reshape(n_samples, channels), raw_channels.T)
+            self._pending = (block, (block.used, n_samples, seq, timestamp, sample_rate), n_bytes)
+            return True
+
+    def commit(self):
+        """
+        Menerbitkan frame dari reserve() terakhir. Mengembalikan False jika tidak
+        ada frame tertunda atau bloknya sudah diserahkan ke penulis (stop()).
+        """
+        with self._lock:
+            pending, self._pending = self._pending, None
+            if pending is None:
+                return False
+            block, entry, n_bytes = pending
+            if block is not self._block:
+                self.dropped += 1
+                return False
+            block.entries.append(entry)
+            block.used += n_bytes
+            return True
+
+    def abort(self):
+        """Membuang frame dari reserve() terakhir (mis. frame sumber ternyata sobek)."""
+        with self._lock:
+            if self._pending is not None:
+                self._pending = None
+                self.aborted += 1
+
+    def _writer_loop(self, path):
+        chunk, chunk_used = 0, 0
+        data_file = None
+        index_file = open(os.path.join(path, INDEX_FILE), "wb")
+        try:
+            while True:
+                block = self._full.get()
+                if block is None:
+                    break
+                if isinstance(block, tuple):
+                    _write_metadata(path, *block, self.chunk_bytes)
+                    continue
+                try:
+                    if block.used == 0:
+                        continue
+                    if data_file is None or (chunk_used > 0 and chunk_used + block.used > self.chunk_bytes):
+                        if data_file is not None:
+                            data_file.close()
+                            chunk += 1
+                        data_file = open(os.path.join(path, chunk_filename(chunk)), "wb")
+                        chunk_used = 0
+
+                    data_file.write(memoryview(block.data[:block.used]))
+                    data_file.flush()
+                    records = np.array([(chunk, 0, chunk_used + offset, n_samples, seq, timestamp, sample_rate)
+                                        for offset, n_samples, seq, timestamp, sample_rate in block.entries],
+                                       dtype=INDEX_DTYPE)
+                    index_file.write(records.tobytes())
+                    index_file.flush()
+
+                    chunk_used += block.used
+                    self.frames += len(block.entries)
+                    self.bytes_written += block.used
+                except Exception as e:
+                    self.write_errors += 1
+                    print(f"Error in recorder writer: {e}")
+                finally:
+                    if len(block.data) == self.block_bytes:
+                        self._free.put(block) # Blok khusus (frame besar) tidak dikembalikan ke pool
+        finally:
+            index_file.close()
+            if data_file is not None:
+                data_file.close()
+
+    def stats(self):
+        return {"put": self.submitted, "get": self.frames, "dropped": self.dropped, "depth": self._full.qsize(),
+                "bytes": self.bytes_written, "aborted": self.aborted, "write_errors": self.write_errors}
+
+def _write_metadata(path, channels, dtype, chunk_bytes):
+    metadata = {"format": RECORDING_FORMAT, "version": RECORDING_VERSION, "channels": channels,
+                "dtype": dtype, "chunk_bytes": chunk_bytes}
+    with open(os.path.join(path, METADATA_FILE), "w") as f:
+        json.dump(metadata, f, indent=2)
+
+# --- Pembaca --- #
+
+class Recording:
+    """
+    Rekaman yang sudah ditulis, untuk dibaca/diputar ulang. Index dan chunk
+    di-memory-map, sehingga frame(k) adalah view (channels, n) tanpa salinan
+    dan biayanya sama untuk frame pertama maupun terakhir.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, METADATA_FILE)) as f:
+            metadata = json.load(f)
+        if metadata.get("format") != RECORDING_FORMAT or metadata.get("version") != RECORDING_VERSION:
+            raise ValueError(f"'{path}' bukan rekaman yang dikenal")
+        self.channels = metadata["channels"]
+        self.dtype = np.dtype(metadata["dtype"])
+
+        index_path = os.path.join(path, INDEX_FILE)
+        n_records = os.path.getsize(index_path) // INDEX_DTYPE.itemsize # Abaikan record terpotong
+        self.index = np.memmap(index_path, dtype=INDEX_DTYPE, mode="r", shape=(n_records,)) if n_records else \
+            np.zeros(0, dtype=INDEX_DTYPE)
+        self._chunks = {}
+
+    def __len__(self):
+        return len(self.index)
+
+    @property
+    def duration(self):
+        """Durasi rekaman (detik) menurut jumlah sampel dan sample rate."""
+        if len(self.index) == 0:
+            return 0.0
+        return float(np.sum(self.index["n_samples"] / self.index["sample_rate"]))
+
+    def _chunk(self, chunk):
+        data = self._chunks.get(chunk)
+        if data is None:
+            data = self._chunks[chunk] = np.memmap(os.path.join(self.path, chunk_filename(chunk)),
+                                                   dtype=np.uint8, mode="r")
+        return data
+
+    def frame(self, k):
+        """Frame ke-k sebagai (seq, timestamp, sample_rate, view (channels, n))."""
+        record = self.index[k]
+        n_samples = int(record["n_samples"])
+        offset = int(record["offset"])
+        n_bytes = n_samples * self.channels * self.dtype.itemsize
+        raw = self._chunk(int(record["chunk"]))[offset:offset + n_bytes].view(self.dtype)
+        return (int(record["seq"]), float(record["timestamp"]), float(record["sample_rate"]),
+                raw.reshape(n_samples, self.channels).T)
+
+    def find_seq(self, seq):
+        """Indeks frame dengan sequence `seq` (atau frame berikutnya); sequence harus naik monoton."""
+        return int(np.searchsorted(self.index["seq"], seq))
+
+    def close(self):
+        self._chunks.clear()
+        self.index = np.zeros(0, dtype=INDEX_DTYPE)
+
+def latest_recording(directory=RECORD_DIRECTORY):
+    """Path rekaman terbaru (menurut waktu modifikasi) di `directory`, atau None."""
+    if not os.path.isdir(directory):
+        return None
+    candidates = [os.path.join(directory, name) for name in os.listdir(directory)
+                  if os.path.isfile(os.path.join(directory, name, METADATA_FILE))]
+    return max(candidates, key=os.path.getmtime, default=None)
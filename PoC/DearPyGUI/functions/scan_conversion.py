@@ -0,0 +1,74 @@
+# functions/scan_conversion.py
+
+import collections
+import functools
+import numpy as np
+
+# --- Konversi Polar -> Cartesian (Vectorized) --- #
+
+def polar_to_cartesian_array(angles_deg, radii, center=(0, 0)):
+    """
+    Versi array dari polar_to_cartesian: semua sudut (derajat) dan jarak
+    dikonversi dalam satu operasi. Mengembalikan (x, y) sebagai array float64.
+    """
+    angles_rad = np.radians(np.asarray(angles_deg, dtype=np.float64))
+    radii = np.asarray(radii, dtype=np.float64)
+    return center[0] + radii * np.cos(angles_rad), center[1] + radii * np.sin(angles_rad)
+
+def arc_points(center, radius, start_deg, end_deg, segments=100):
+    """Titik-titik busur (segments + 1, 2) dari start_deg sampai end_deg."""
+    angles = np.linspace(start_deg, end_deg, segments + 1)
+    x, y = polar_to_cartesian_array(angles, radius, center)
+    return np.column_stack((x, y))
+
+# --- LUT Scan Conversion (Raster) --- #
+
+# pixel_index: indeks piksel datar, diurutkan per bin azimuth
+# bin_index: bin jarak untuk setiap piksel di pixel_index
+# azimuth_offsets: piksel bin azimuth k ada di slice [offsets[k], offsets[k + 1])
+ScanLUT = collections.namedtuple("ScanLUT", [
+    "width", "height", "n_azimuths", "n_bins", "azimuth_resolution", "start_deg",
+    "pixel_index", "bin_index", "azimuth_offsets",
+])
+
+@functools.lru_cache(maxsize=8)
+def get_scan_lut(width, n_bins, azimuth_resolution=0.25, max_range=100, start_deg=0.0, end_deg=180.0):
+    """
+    LUT scan conversion untuk citra PPI setengah lingkaran (height = width // 2,
+    baris 0 = jarak maksimum, pusat radar di tengah bawah). Sudut dan bin jarak
+    tiap piksel dihitung sekali per (ukuran tampilan, bin jarak, resolusi azimuth),
+    lalu piksel dikelompokkan per bin azimuth sehingga melukis satu sektor cukup
+    memotong slice, tanpa menyentuh piksel lain. Array hasil bersifat read-only.
+    """
+    height = width // 2
+    n_azimuths = int(round((end_deg - start_deg) / azimuth_resolution))
+
+    scale = max_range / (width / 2)
+    x = (np.arange(width) + 0.5 - width / 2) * scale
+    y = (height - np.arange(height) - 0.5) * scale
+    xx, yy = np.meshgrid(x, y)
+    angles = np.degrees(np.arctan2(yy, xx)).ravel()
+    bins = (np.hypot(xx, yy) / max_range * n_bins).astype(np.intp).ravel()
+
+    inside = (bins < n_bins) & (angles >= start_deg) & (angles <= end_deg)
+    pixels = np.flatnonzero(inside)
+    azimuths = np.minimum(((angles[pixels] - start_deg) / azimuth_resolution).astype(np.intp), n_azimuths - 1)
+
+    order = np.argsort(azimuths, kind="stable")
+    pixel_index = pixels[order]
+    bin_index = bins[pixel_index]
+    azimuth_offsets = np.searchsorted(azimuths[order], np.arange(n_azimuths + 1))
+    for array in (pixel_index, bin_index, azimuth_offsets):
+        array.flags.writeable = False
+
+    return ScanLUT(width, height, n_azimuths, n_bins, azimuth_resolution, start_deg,
+                   pixel_index, bin_index, azimuth_offsets)
+
+def sector_slice(lut, start_angle, end_angle):
+    """Slice ke pixel_index/bin_index untuk semua piksel di sektor [start_angle, end_angle]."""
+    low, high = min(start_angle, end_angle), max(start_angle, end_angle)
+    first = int((low - lut.start_deg) / lut.azimuth_resolution)
+    last = int((high - lut.start_deg) / lut.azimuth_resolution)
+    first = min(max(first, 0), lut.n_azimuths)
+    last = min(max(last + 1, 0), lut.n_azimuths)
+    return slice(lut.azimuth_offsets[first], lut.azimuth_offsets[last])
@@ -0,0 +1,270 @@
+# functions/serial_receiver.py
+
+import collections
+import threading
+import time
+import numpy as np
+
+from functions.channels import BoundedChannel
+
+# Penerima stream sampel dari port serial (COM / tty / pty).
+#
+# Berbeda dengan SerialReceiverThread di skrip arsip (ser.read(n) lalu membuang
+# pembacaan yang tidak lengkap), byte diakumulasi secara kontinu: readinto()
+# mengisi bagian kosong buffer yang sudah dialokasikan, lalu decoder memotong
+# frame utuh dari depan buffer. Pembacaan pendek tidak pernah dibuang, dan jika
+# satu byte hilang, sync word dipakai untuk menemukan batas frame berikutnya
+# sehingga urutan channel tidak bergeser permanen.
+#
+# Format frame dengan sync word:  [sync word][payload: n_samples * channels sampel interleaved]
+# Format mentah (sync_word=None): [payload] berurutan tanpa penanda (tidak bisa resync)
+
+SerialFrame = collections.namedtuple("SerialFrame", ["seq", "timestamp", "data"])
+
+# --- Port Serial --- #
+
+def open_serial_port(port_name, baud_rate, timeout=0.05):
+    """
+    Membuka port serial dengan pyserial (diimpor saat dibutuhkan saja, karena
+    transport lain tidak memerlukannya). Timeout pendek membuat readinto()
+    kembali dengan data yang sudah ada, sehingga thread bisa berhenti dengan cepat.
+    """
+    try:
+        import serial
+    except ImportError as e:
+        raise ImportError("Transport serial membutuhkan pyserial (pip install pyserial).") from e
+    port = serial.Serial(port_name, baud_rate, timeout=timeout)
+    port.reset_input_buffer()
+    return port
+
+# --- Akumulator Byte --- #
+
+class StreamAccumulator:
+    """
+    Buffer byte kontigu dengan indeks baca/tulis. Data yang belum dikonsumsi
+    selalu berada di buffer[start:end]; ruang kosong di belakangnya diisi
+    langsung oleh readinto() lewat writable(). Buffer hanya dipindah ke depan
+    (compact) atau diperbesar saat ruang kosong tidak cukup, jadi pembacaan
+    biasa tidak mengalokasikan apa pun.
+
+    Jika ukuran maksimum tercapai, byte tertua dibuang dan `overruns` bertambah.
+    """
+
+    def __init__(self, capacity=1 << 16, max_capacity=1 << 26):
+        self.max_capacity = max(capacity, max_capacity)
+        self._set_buffer(bytearray(capacity))
+        self.start = 0
+        self.end = 0
+        self.overruns = 0
+        self.overrun_bytes = 0
+
+    def __len__(self):
+        return self.end - self.start
+
+    @property
+    def capacity(self):
+        return len(self._buffer)
+
+    def writable(self, min_free):
+        """View ke ruang kosong (minimal `min_free` byte) di belakang data yang belum dibaca."""
+        if self.capacity - self.end < min_free:
+            self._make_room(min_free)
+        return self._view[self.end:]
+
+    def commit(self, n_bytes):
+        """Menandai `n_bytes` pertama dari writable() sebagai data baru."""
+        self.end += n_bytes
+
+    def readable(self):
+        """View ke semua data yang belum dikonsumsi."""
+        return self._view[self.start:self.end]
+
+    def consume(self, n_bytes):
+        self.start += min(n_bytes, len(self))
+        if self.start == self.end:
+            self.start = self.end = 0 # Kosong: kembali ke awal tanpa menyalin
+
+    def startswith(self, pattern):
+        return self._view[self.start:self.start + len(pattern)] == pattern
+
+    def find(self, pattern, offset=0):
+        """Posisi `pattern` relatif terhadap data yang belum dibaca, atau -1."""
+        position = self._buffer.find(pattern, self.start + offset, self.end)
+        return position - self.start if position >= 0 else -1
+
+    def _set_buffer(self, buffer):
+        self._buffer = buffer
+        self._view = memoryview(buffer)
+        self._array = np.frombuffer(buffer, dtype=np.uint8) # Untuk memindah data yang tumpang tindih
+
+    def _make_room(self, min_free):
+        used = len(self)
+        if self.capacity - used >= min_free:
+            # Cukup ruang setelah data dipindah ke depan
+            self._array[:used] = self._array[self.start:self.end]
+        else:
+            needed = used + min_free
+            if needed > self.max_capacity:
+                # Konsumen tidak mengikuti: buang data tertua agar stream tetap berjalan
+                dropped = min(used, needed - self.max_capacity)
+                self.overruns += 1
+                self.overrun_bytes += dropped
+                self.start += dropped
+                used -= dropped
+                needed = used + min_free
+            capacity = self.capacity
+            while capacity < needed:
+                capacity *= 2
+            buffer = bytearray(min(capacity, max(self.max_capacity, needed)))
+            buffer[:used] = self._view[self.start:self.end]
+            self._set_buffer(buffer)
+        self.start = 0
+        self.end = used
+
+# --- Decoder Frame --- #
+
+class FrameDecoder:
+    """
+    Memotong frame berukuran tetap dari StreamAccumulator.
+
+    Dengan sync word, decoder dalam keadaan "locked" selama setiap batas frame
+    diawali sync word. Jika tidak, lock dilepas (`resyncs` += 1) dan byte
+    sebelum kemunculan sync word berikutnya dibuang (`discarded_bytes`).
+    Frame baru dikirim setelah sync word frame berikutnya juga terlihat, jadi
+    frame yang kehilangan byte (batas berikutnya bergeser) ikut dibuang
+    (`corrupt_frames`), bukan diteruskan dengan channel yang tertukar.
+    Tanpa sync word, payload dipotong berurutan apa adanya.
+    """
+
+    def __init__(self, samples_per_frame, channels=2, dtype="<u2", sync_word=None):
+        self.samples_per_frame = samples_per_frame
+        self.channels = channels
+        self.dtype = np.dtype(dtype)
+        self.sync_word = bytes(sync_word) if sync_word else b""
+        self.payload_bytes = samples_per_frame * channels * self.dtype.itemsize
+        self.frame_bytes = len(self.sync_word) + self.payload_bytes
+        self.locked = not self.sync_word
+        self.frames = 0
+        self.resyncs = 0
+        self.discarded_bytes = 0
+        self.corrupt_frames = 0
+
+    def decode(self, accumulator, emit):
+        """Memanggil emit(payload_view) untuk setiap frame utuh di akumulator."""
+        sync = self.sync_word
+        while len(accumulator) >= self.frame_bytes + len(sync):
+            if sync and not accumulator.startswith(sync):
+                if self.locked:
+                    self.locked = False
+                    self.resyncs += 1
+                position = accumulator.find(sync, 1)
+                if position < 0:
+                    # Simpan ekor yang mungkin merupakan awal sync word yang terpotong
+                    position = len(accumulator) - len(sync) + 1
+                self.discarded_bytes += position
+                accumulator.consume(position)
+                continue
+
+            if sync and accumulator.readable()[self.frame_bytes:self.frame_bytes + len(sync)] != sync:
+                # Batas frame berikutnya tidak diawali sync word: panjang frame ini salah
+                self.corrupt_frames += 1
+                self.discarded_bytes += len(sync)
+                accumulator.consume(len(sync))
+                continue
+
+            self.locked = True
+            emit(accumulator.readable()[len(sync):self.frame_bytes])
+            accumulator.consume(self.frame_bytes)
+            self.frames += 1
+
+    def to_samples(self, payload):
+        """Salinan payload sebagai array sampel interleaved (n_samples * channels,)."""
+        return np.frombuffer(payload, dtype=self.dtype).copy()
+
+# --- Thread Penerima --- #
+
+class SerialReceiver:
+    """
+    Thread yang membaca `port` (pyserial Serial atau objek apa pun dengan
+    readinto(), mis. file pty) secara kontinu dan mengirim SerialFrame ke
+    `output` (BoundedChannel). Kanal default membuang frame tertua saat penuh:
+    pembacaan port tidak boleh menunggu konsumen, karena buffer driver serial
+    akan overflow dan byte hilang di luar kendali kita.
+
+    stats() mengikuti format kanal (put/get/dropped/depth) ditambah penghitung
+    stream, sehingga bisa didaftarkan ke telemetry.watch_channel().
+    """
+
+    def __init__(self, port, samples_per_frame, channels=2, dtype="<u2", sync_word=None,
+                 output=None, read_size=1 << 16, max_buffer=1 << 26):
+        self.port = port
+        self.decoder = FrameDecoder(samples_per_frame, channels, dtype, sync_word)
+        self.output = output if output is not None else BoundedChannel(8, overflow="drop_oldest")
+        self.read_size = read_size
+        self.accumulator = StreamAccumulator(max(2 * self.decoder.frame_bytes, read_size), max_buffer)
+        self.bytes_received = 0
+        self.read_errors = 0
+        self.seq = 0
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def open(cls, port_name, baud_rate, samples_per_frame, **kwargs):
+        """Membuka port serial berdasarkan nama (COM2, /dev/ttyUSB0, /dev/pts/N)."""
+        return cls(open_serial_port(port_name, baud_rate), samples_per_frame, **kwargs)
+
+    def poll(self):
+        """Satu kali readinto + decode. Mengembalikan jumlah byte yang dibaca."""
+        n_read = self.port.readinto(self.accumulator.writable(self.read_size)) or 0
+        if n_read:
+            self.accumulator.commit(n_read)
+            self.bytes_received += n_read
+            self.decoder.decode(self.accumulator, self._emit)
+        return n_read
+
+    def _emit(self, payload):
+        self.seq += 1
+        self.output.put(SerialFrame(self.seq, time.time(), self.decoder.to_samples(payload)))
+
+    def run(self):
+        while not self._stop_event.is_set():
+            try:
+                self.poll()
+            except OSError as e:
+                # Port tertutup / perangkat dicabut: berhenti, tidak berputar terus
+                if not self._stop_event.is_set():
+                    print(f"Serial receiver stopped: {e}")
+                break
+            except Exception as e:
+                self.read_errors += 1
+                print(f"Error in serial receiver: {e}")
+                time.sleep(0.1)
+
+    def start(self):
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self.run, name="serial-receiver", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=1.0):
+        """Menghentikan thread (paling lama satu timeout baca port) lalu menutup port."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+        close = getattr(self.port, "close", None)
+        if close is not None:
+            close()
+
+    def stats(self):
+        stats = self.output.stats()
+        stats.update({
+            "bytes": self.bytes_received,
+            "frames": self.decoder.frames,
+            "resyncs": self.decoder.resyncs,
+            "discarded_bytes": self.decoder.discarded_bytes,
+            "corrupt_frames": self.decoder.corrupt_frames,
+            "overruns": self.accumulator.overruns,
+            "read_errors": self.read_errors,
+            "locked": self.decoder.locked,
+        })
+        return stats
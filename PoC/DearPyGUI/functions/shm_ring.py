@@ -0,0 +1,216 @@
+# functions/shm_ring.py
+
+import time
+import numpy as np
+from multiprocessing import shared_memory
+
+from functions.frame_file import DTYPE_CODES
+
+# --- Layout Shared Memory --- #
+#
+#   [header global 64 byte][tabel slot: n_slots * 32 byte][data: n_slots * slot_bytes]
+#
+# Header global (int64): magic, version, n_slots, slot_bytes, channels,
+#                        dtype_code, write_index, reserved
+# Tabel slot (per slot): seq (int64), n_samples (int64),
+#                        timestamp (float64), sample_rate (float64)
+#
+# Sinkronisasi tanpa lock memakai seqlock per slot: penulis menulis nilai ganjil
+# (2*seq - 1) sebelum menyalin data dan nilai genap (2*seq) setelah selesai,
+# lalu menaikkan write_index. Pembaca memvalidasi seq slot sebelum dan sesudah
+# memakai data; jika berubah, frame dianggap tertimpa dan dibuang. Hanya ada
+# satu penulis.
+#
+# Batasan: Python/NumPy tidak memberi memory barrier apa pun. Urutan store
+# penulis (seq ganjil -> data -> seq genap) hanya terlihat sama oleh proses lain
+# di x86-64, yang memorinya TSO (store tidak disusun ulang terhadap store lain).
+# Di arsitektur dengan memory model lemah (ARM64, POWER) seqlock ini best-effort:
+# pembaca bisa melihat seq genap sebelum datanya, dan is_valid() tidak bisa
+# mendeteksi hal itu. Jangan andalkan ring ini untuk data yang harus utuh di
+# platform tersebut.
+
+RING_MAGIC = 0x55524652494E4731  # "URFRING1"
+RING_VERSION = 1
+GLOBAL_HEADER_BYTES = 64
+SLOT_META_BYTES = 32
+SLOT_ALIGN = 64
+
+_H_MAGIC, _H_VERSION, _H_SLOTS, _H_SLOT_BYTES, _H_CHANNELS, _H_DTYPE, _H_WRITE_INDEX = range(7)
+_S_SEQ, _S_N_SAMPLES, _S_TIMESTAMP, _S_SAMPLE_RATE = range(4)
+
+_DTYPE_TO_CODE = {dtype: code for code, dtype in DTYPE_CODES.items()}
+
+def _align(value, alignment):
+    return (value + alignment - 1) // alignment * alignment
+
+def _attach_untracked(name):
+    """
+    Membuka segmen yang sudah ada tanpa didaftarkan ke resource_tracker,
+    agar proses pembaca tidak menghapus (unlink) segmen milik penulis saat keluar.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        try:
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(shm._name, "shared_memory")
+        except Exception:
+            pass
+        return shm
+
+class SharedFrameRing:
+    """
+    Ring buffer frame akuisisi di atas multiprocessing.shared_memory.
+    Gunakan SharedFrameRing.create() di sisi penulis (generator/hardware)
+    dan SharedFrameRing.attach() di sisi pembaca (UI).
+    """
+
+    def __init__(self, shm, owner):
+        self._shm = shm
+        self._owner = owner
+        buf = shm.buf
+
+        self._header = np.ndarray((8,), dtype=np.int64, buffer=buf)
+        if self._header[_H_MAGIC] != RING_MAGIC or self._header[_H_VERSION] != RING_VERSION:
+            raise ValueError(f"Segmen shared memory '{shm.name}' bukan ring frame yang valid")
+
+        self.n_slots = int(self._header[_H_SLOTS])
+        self.slot_bytes = int(self._header[_H_SLOT_BYTES])
+        self.channels = int(self._header[_H_CHANNELS])
+        self.dtype = DTYPE_CODES[int(self._header[_H_DTYPE])]
+        self.max_samples = self.slot_bytes // (self.channels * self.dtype.itemsize)
+
+        table_bytes = self.n_slots * SLOT_META_BYTES
+        self._slot_int = np.ndarray((self.n_slots, 4), dtype=np.int64, buffer=buf, offset=GLOBAL_HEADER_BYTES)
+        self._slot_float = np.ndarray((self.n_slots, 4), dtype=np.float64, buffer=buf, offset=GLOBAL_HEADER_BYTES)
+        self._data_offset = _align(GLOBAL_HEADER_BYTES + table_bytes, SLOT_ALIGN)
+        self._data = np.ndarray(
+            (self.n_slots, self.max_samples * self.channels), dtype=self.dtype,
+            buffer=buf, offset=self._data_offset, strides=(self.slot_bytes, self.dtype.itemsize),
+        )
+
+    # --- Pembuatan / koneksi --- #
+
+    @classmethod
+    def create(cls, name, n_slots, max_samples, channels=2, dtype="<u2"):
+        """Membuat segmen ring baru (sisi penulis). Segmen lama dengan nama sama diganti."""
+        dtype = np.dtype(dtype)
+        slot_bytes = _align(max_samples * channels * dtype.itemsize, SLOT_ALIGN)
+        data_offset = _align(GLOBAL_HEADER_BYTES + n_slots * SLOT_META_BYTES, SLOT_ALIGN)
+        size = data_offset + n_slots * slot_bytes
+
+        try:
+            stale = _attach_untracked(name)
+            stale.close()
+            stale.unlink()
+        except FileNotFoundError:
+            pass
+
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        header = np.ndarray((8,), dtype=np.int64, buffer=shm.buf)
+        header[:] = 0
+        np.ndarray((n_slots, 4), dtype=np.int64, buffer=shm.buf, offset=GLOBAL_HEADER_BYTES)[:] = 0
+        header[_H_VERSION] = RING_VERSION
+        header[_H_SLOTS] = n_slots
+        header[_H_SLOT_BYTES] = slot_bytes
+        header[_H_CHANNELS] = channels
+        header[_H_DTYPE] = _DTYPE_TO_CODE[dtype]
+        header[_H_MAGIC] = RING_MAGIC # Ditulis terakhir: header lengkap sebelum terlihat valid
+        del header
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name, untracked=True):
+        """
+        Membuka ring yang sudah dibuat penulis. FileNotFoundError jika belum ada.
+        untracked=False untuk ring milik proses anak multiprocessing: resource_tracker
+        dipakai bersama, sehingga registrasi penulis tidak boleh dihapus pembaca.
+        """
+        if untracked:
+            return cls(_attach_untracked(name), owner=False)
+        return cls(shared_memory.SharedMemory(name=name), owner=False)
+
+    def close(self):
+        """Melepas mapping; penulis juga menghapus segmen."""
+        self._header = self._slot_int = self._slot_float = self._data = None
+        self._shm.close()
+        if self._owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+
+    # --- Sisi penulis --- #
+
+    @property
+    def write_index(self):
+        """Jumlah frame yang sudah di-commit (juga sequence frame terakhir)."""
+        return int(self._header[_H_WRITE_INDEX])
+
+    def begin_write(self, n_samples):
+        """
+        Mengembalikan view tulis (interleaved) ke slot berikutnya, agar generator
+        bisa mengisi data langsung di shared memory tanpa salinan tambahan.
+        Wajib diikuti commit().
+        """
+        if n_samples > self.max_samples:
+            raise ValueError(f"Frame {n_samples} sampel melebihi kapasitas slot ({self.max_samples})")
+        seq = self.write_index + 1
+        slot = (seq - 1) % self.n_slots
+        self._slot_int[slot, _S_SEQ] = 2 * seq - 1 # Ganjil: slot sedang ditulis
+        return self._data[slot, :n_samples * self.channels]
+
+    def commit(self, n_samples, sample_rate, timestamp=None):
+        """Menandai slot yang sedang ditulis sebagai frame lengkap."""
+        seq = self.write_index + 1
+        slot = (seq - 1) % self.n_slots
+        self._slot_int[slot, _S_N_SAMPLES] = n_samples
+        self._slot_float[slot, _S_TIMESTAMP] = time.time() if timestamp is None else timestamp
+        self._slot_float[slot, _S_SAMPLE_RATE] = sample_rate
+        self._slot_int[slot, _S_SEQ] = 2 * seq # Genap: slot lengkap
+        self._header[_H_WRITE_INDEX] = seq
+        return seq
+
+    def write(self, interleaved, sample_rate, timestamp=None):
+        """Menyalin satu frame interleaved ke ring dan mengembalikan sequence-nya."""
+        n_samples = len(interleaved) // self.channels
+        self.begin_write(n_samples)[:] = interleaved[:n_samples * self.channels]
+        return self.commit(n_samples, sample_rate, timestamp)
+
+    # --- Sisi pembaca --- #
+
+    def read_latest(self, last_seq=0):
+        """
+        Mengembalikan frame terbaru yang lebih baru dari `last_seq` sebagai
+        (seq, sample_rate, timestamp, view (channels, n)) atau None.
+        View menunjuk langsung ke shared memory (zero-copy); panggil is_valid(seq)
+        setelah selesai memakainya untuk memastikan slot tidak tertimpa.
+        """
+        seq = self.write_index
+        if seq <= last_seq:
+            return None
+        # None jika sudah tertimpa frame yang lebih baru; ambil lagi di panggilan berikutnya
+        frame = self.read(seq)
+        return None if frame is None else (seq, *frame)
+
+    def read(self, seq):
+        """
+        Frame dengan sequence `seq` sebagai (sample_rate, timestamp, view (channels, n)),
+        atau None jika slotnya sudah ditimpa. Seperti read_latest, view bersifat
+        zero-copy dan harus divalidasi dengan is_valid(seq) setelah dipakai.
+        """
+        slot = (seq - 1) % self.n_slots
+        if self._slot_int[slot, _S_SEQ] != 2 * seq:
+            return None
+
+        n_samples = int(self._slot_int[slot, _S_N_SAMPLES])
+        sample_rate = float(self._slot_float[slot, _S_SAMPLE_RATE])
+        timestamp = float(self._slot_float[slot, _S_TIMESTAMP])
+        view = self._data[slot, :n_samples * self.channels].reshape(n_samples, self.channels).T
+        view.flags.writeable = False
+        return sample_rate, timestamp, view
+
+    def is_valid(self, seq):
+        """True jika slot untuk `seq` belum ditimpa penulis sejak dibaca."""
+        return self._slot_int[(seq - 1) % self.n_slots, _S_SEQ] == 2 * seq
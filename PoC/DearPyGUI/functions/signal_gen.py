@@ -0,0 +1,249 @@
+# functions/signal_gen.py
+
+import numpy as np
+
+# --- Model Sinyal --- #
+#
+# Setiap model menambahkan kontribusinya ke buffer float32 (n,) satu channel
+# untuk satu blok sampel yang dimulai di indeks absolut `position`. Fase
+# disimpan dalam satuan siklus (float64, dibungkus mod 1) sehingga blok-blok
+# berurutan tersambung tanpa lompatan fase dan presisi tidak menurun meski
+# generator berjalan lama. Model acak mendapat Generator sendiri dari
+# SignalGenerator.add(), sehingga hasilnya tidak bergantung pada ukuran blok
+# (selain pembulatan float32, maksimal 1 LSB).
+
+def _block_length(n_samples, preferred=4096):
+    """Panjang sub-blok terbesar (pangkat dua <= preferred) yang membagi n_samples."""
+    length = preferred
+    while length > 1 and n_samples % length:
+        length //= 2
+    return length
+
+class Tone:
+    """
+    Nada sinus kontinu fase. sin() hanya dihitung untuk satu sub-blok pendek
+    dan untuk offset tiap sub-blok; sisanya memakai identitas penjumlahan sudut
+    sin(a + b) = sin(a)cos(b) + cos(a)sin(b), dua perkalian per sampel.
+    """
+
+    def __init__(self, frequency, amplitude, phase=0.0):
+        self.frequency = frequency
+        self.amplitude = amplitude
+        self.phase = phase / (2 * np.pi)
+        self._key = None
+
+    def _prepare(self, n_samples, sample_rate):
+        key = (n_samples, sample_rate)
+        if key == self._key:
+            return
+        self._step = self.frequency / sample_rate
+        self._length = _block_length(n_samples)
+        angles = 2 * np.pi * ((self._step * np.arange(self._length)) % 1.0)
+        self._sin_base = (self.amplitude * np.sin(angles)).astype(np.float32)
+        self._cos_base = (self.amplitude * np.cos(angles)).astype(np.float32)
+        self._offsets = np.arange(n_samples // self._length, dtype=np.float64)
+        self._scratch = np.empty((n_samples // self._length, self._length), dtype=np.float32)
+        self._key = key
+
+    def render(self, out, position, sample_rate):
+        n_samples = len(out)
+        self._prepare(n_samples, sample_rate)
+        if self._length < 64:
+            # Ukuran blok ganjil/prima: hitung langsung
+            cycles = (self.phase + self._step * np.arange(n_samples)) % 1.0
+            out += self.amplitude * np.sin(2 * np.pi * cycles).astype(np.float32)
+        else:
+            offsets = 2 * np.pi * ((self.phase + self._step * self._length * self._offsets) % 1.0)
+            sin_offsets = np.sin(offsets).astype(np.float32)[:, np.newaxis]
+            cos_offsets = np.cos(offsets).astype(np.float32)[:, np.newaxis]
+            blocks = out.reshape(-1, self._length)
+            np.multiply(sin_offsets, self._cos_base, out=self._scratch)
+            blocks += self._scratch
+            np.multiply(cos_offsets, self._sin_base, out=self._scratch)
+            blocks += self._scratch
+        self.phase = (self.phase + self._step * n_samples) % 1.0
+
+class Noise:
+    """
+    Noise Gaussian putih dengan simpangan baku `std` (satuan LSB). Membangkitkan
+    jutaan sampel Gaussian per blok terlalu lambat untuk 20 MS/s, jadi aliran
+    sampel dibagi menjadi segmen tetap yang masing-masing disalin dari pool acak
+    mulai dari offset acak. Offset ditentukan oleh indeks segmen absolut, sehingga
+    hasilnya sama berapa pun ukuran bloknya (berulang setelah segment * 65536 sampel).
+    """
+
+    def __init__(self, std, pool_size=1 << 20, segment=1 << 12):
+        self.std = std
+        self.pool_size = pool_size
+        self.segment = segment
+        self.rng = np.random.default_rng()
+        self._pool = None
+
+    def render(self, out, position, sample_rate):
+        if self._pool is None:
+            self._pool = self.rng.standard_normal(self.pool_size, dtype=np.float32)
+            self._pool *= self.std
+            self._offsets = self.rng.integers(0, self.pool_size - self.segment, 1 << 16)
+        filled = 0
+        while filled < len(out):
+            index, offset = divmod(position + filled, self.segment)
+            chunk = min(len(out) - filled, self.segment - offset)
+            start = self._offsets[index % len(self._offsets)] + offset
+            out[filled:filled + chunk] += self._pool[start:start + chunk]
+            filled += chunk
+
+def _add_periodic(out, table, position):
+    """Menambahkan sinyal periodik (satu periode di `table`) mulai dari indeks absolut `position`."""
+    period = len(table)
+    offset = position % period
+    filled = 0
+    while filled < len(out):
+        chunk = min(len(out) - filled, period - offset)
+        out[filled:filled + chunk] += table[offset:offset + chunk]
+        filled += chunk
+        offset = 0
+
+class Chirp:
+    """
+    Sapuan frekuensi linear f0 -> f1 yang berulang setiap `period` detik
+    (mis. FMCW). Satu periode dihitung sekali lalu disalin per blok.
+    """
+
+    def __init__(self, f0, f1, period, amplitude):
+        self.f0 = f0
+        self.f1 = f1
+        self.period = period
+        self.amplitude = amplitude
+        self._key = None
+
+    def render(self, out, position, sample_rate):
+        if self._key != sample_rate:
+            period_samples = max(1, int(round(self.period * sample_rate)))
+            t = np.arange(period_samples) / sample_rate
+            rate = (self.f1 - self.f0) / self.period
+            cycles = (self.f0 * t + 0.5 * rate * t * t) % 1.0
+            self._table = (self.amplitude * np.sin(2 * np.pi * cycles)).astype(np.float32)
+            self._key = sample_rate
+        _add_periodic(out, self._table, position)
+
+class PulsedTarget:
+    """
+    Echo target berpulsa: setiap PRI (pulse repetition interval) muncul pulsa
+    selebar `width` detik dengan pembawa `carrier` Hz, tertunda `delay` detik
+    dari awal PRI (delay = 2 * jarak / c). Pembawa kontinu fase terhadap waktu
+    absolut; hanya sampel di dalam pulsa yang dihitung.
+    """
+
+    def __init__(self, pri, width, delay, carrier, amplitude):
+        self.pri = pri
+        self.width = width
+        self.delay = delay
+        self.carrier = carrier
+        self.amplitude = amplitude
+
+    def render(self, out, position, sample_rate):
+        pri_samples = max(1, int(round(self.pri * sample_rate)))
+        delay = int(round(self.delay * sample_rate)) % pri_samples
+        width = min(pri_samples, max(1, int(round(self.width * sample_rate))))
+
+        # Indeks (relatif blok) semua sampel pulsa yang menyentuh blok ini
+        first = (position - delay) // pri_samples * pri_samples + delay - position
+        starts = np.arange(first, len(out), pri_samples)
+        indices = (starts[:, np.newaxis] + np.arange(width)).ravel()
+        indices = indices[(indices >= 0) & (indices < len(out))]
+
+        cycles = ((position + indices) * (self.carrier / sample_rate)) % 1.0
+        out[indices] += (self.amplitude * np.sin(2 * np.pi * cycles)).astype(np.float32)
+
+# --- Generator --- #
+
+class SignalGenerator:
+    """
+    Generator akuisisi sintetis deterministik: untuk seed dan daftar model yang
+    sama, urutan sampel selalu identik. Semua komputasi vectorized per blok;
+    buffer kerja dialokasikan sekali per ukuran blok.
+
+    Sampel float (satuan LSB, di sekitar nol) dikuantisasi ke ADC unsigned
+    16-bit dengan offset mid-scale dan clipping ke 0..65535 (bukan wrap-around).
+    """
+
+    ADC_OFFSET = 32768
+    ADC_MAX = 65535
+
+    def __init__(self, sample_rate, channels=2, seed=0):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self._seeds = np.random.SeedSequence(seed)
+        self.models = [[] for _ in range(channels)]
+        self.position = 0 # Indeks sampel absolut blok berikutnya
+        self.clipped = 0  # Jumlah sampel yang terpotong saat kuantisasi
+        self._n = None
+
+    def add(self, channel, model):
+        """Menambahkan model sinyal ke channel tertentu. Mengembalikan self (chaining)."""
+        if hasattr(model, "rng"):
+            # Stream acak sendiri per model, diturunkan dari seed generator
+            model.rng = np.random.default_rng(self._seeds.spawn(1)[0])
+        self.models[channel].append(model)
+        return self
+
+    def _prepare(self, n_samples):
+        if n_samples == self._n:
+            return
+        self._float = np.empty((self.channels, n_samples), dtype=np.float32)
+        self._n = n_samples
+
+    def generate(self, n_samples):
+        """
+        Blok berikutnya sebagai float32 (channels, n) dalam satuan LSB.
+        Array dipakai ulang pada pemanggilan berikutnya.
+        """
+        self._prepare(n_samples)
+        self._float.fill(0)
+        for channel, models in enumerate(self.models):
+            for model in models:
+                model.render(self._float[channel], self.position, self.sample_rate)
+        self.position += n_samples
+        return self._float
+
+    def generate_interleaved(self, n_samples, out=None):
+        """
+        Blok berikutnya sebagai uint16 interleaved (n * channels,), siap ditulis
+        ke file (tofile/memoryview) atau langsung ke slot shared memory (`out`).
+        """
+        samples = self.generate(n_samples)
+        if out is None:
+            out = np.empty(n_samples * self.channels, dtype=np.uint16)
+        self.quantize(samples, out.reshape(n_samples, self.channels).T)
+        return out
+
+    def quantize(self, samples, out):
+        """Float (LSB) -> uint16 dengan offset mid-scale, pembulatan dan clipping."""
+        samples += self.ADC_OFFSET + 0.5 # +0.5: konversi ke integer memotong, jadi ini membulatkan
+        if samples.min() < 0 or samples.max() >= self.ADC_MAX + 1:
+            self.clipped += int(np.count_nonzero((samples < 0) | (samples >= self.ADC_MAX + 1)))
+            np.clip(samples, 0, self.ADC_MAX, out=samples)
+        np.copyto(out, samples, casting="unsafe")
+
+# --- Skenario Siap Pakai --- #
+
+def create_scenario(name, sample_rate, channels=2, seed=0):
+    """
+    Generator dengan model standar:
+      "tones" -> dua nada per channel + noise (pengganti sinyal dumy_gen lama)
+      "radar" -> chirp FMCW, dua target berpulsa dan noise
+    """
+    generator = SignalGenerator(sample_rate, channels, seed)
+    for channel in range(channels):
+        if name == "tones":
+            generator.add(channel, Tone(90_000 + 60_000 * channel, 1000 - 200 * channel))
+            generator.add(channel, Tone(1_500_000 + 500_000 * channel, 300))
+            generator.add(channel, Noise(20))
+        elif name == "radar":
+            generator.add(channel, Chirp(100_000, 2_000_000, 1e-3, 400))
+            generator.add(channel, PulsedTarget(pri=100e-6, width=2e-6, delay=20e-6, carrier=1_000_000, amplitude=6000))
+            generator.add(channel, PulsedTarget(pri=100e-6, width=2e-6, delay=55e-6, carrier=1_000_000, amplitude=2500))
+            generator.add(channel, Noise(50))
+        else:
+            raise ValueError(f"Skenario tidak dikenal: {name}")
+    return generator
@@ -0,0 +1,454 @@
+# functions/sources.py
+
+import collections
+import os
+import queue
+import threading
+import time
+import numpy as np
+
+from config import (FILENAME, SAMPLE_RATE, POLLING_INTERVAL, FILE_WATCH_MODE, ACQUISITION_TRANSPORT,
+                    ACQUISITION_CHANNELS, SHM_NAME, SERIAL_PORT, SERIAL_BAUD_RATE, SERIAL_SAMPLES_PER_FRAME,
+                    SERIAL_SYNC_WORD, RAW_FILE_PATH, RAW_FILE_SAMPLES_PER_FRAME, RAW_FILE_REALTIME,
+                    REPLAY_PATH, REPLAY_SPEED, REPLAY_LOOP)
+from functions.file_watcher import create_file_watcher
+from functions.frame_file import is_frame_file, load_frame_file
+from functions.instrumentation import telemetry
+from functions.recorder import Recording, latest_recording
+from functions.shm_ring import SharedFrameRing
+
+# Format sampel mentah dari ADC: unsigned 16-bit little-endian
+RAW_DTYPE = np.dtype("<u2")
+
+# Satu frame mentah dari sumber mana pun. `data` adalah array (channels, n)
+# dalam dtype asli sumber; untuk transport yang mendukungnya (memmap, shared
+# memory) berupa view tanpa salinan yang hanya sah sampai release() dipanggil.
+RawFrame = collections.namedtuple("RawFrame", ["seq", "timestamp", "sample_rate", "channels", "dtype", "data"])
+
+# --- Loader File --- #
+
+def load_raw_data(filepath, channels=ACQUISITION_CHANNELS, use_mmap=False):
+    """
+    Memuat data mentah (uint16 little-endian, interleaved) tanpa konversi ke float.
+    Mengembalikan array (channels, n) berupa strided view ke buffer mentah,
+    atau None jika file tidak ada. ValueError jika ukuran file bukan kelipatan
+    satu sampel semua channel (jumlah channel tidak cocok dengan file).
+
+    use_mmap=True memetakan file langsung (np.memmap) tanpa menyalin; hanya aman
+    untuk file yang tidak ditulis ulang di tempat selama view masih dipakai.
+    """
+    if not os.path.exists(filepath):
+        return None
+    size = os.path.getsize(filepath)
+    if size % (channels * RAW_DTYPE.itemsize):
+        raise ValueError(f"Ukuran '{os.path.basename(filepath)}' ({size} byte) bukan kelipatan "
+                         f"{channels} channel x {RAW_DTYPE.itemsize} byte")
+
+    if use_mmap:
+        n_values = size // RAW_DTYPE.itemsize
+        if n_values < channels:
+            return np.empty((channels, 0), dtype=RAW_DTYPE)
+        raw = np.memmap(filepath, dtype=RAW_DTYPE, mode="r", shape=(n_values,))
+    else:
+        # Satu kali baca langsung ke buffer NumPy (tanpa tuple Python dari struct.unpack)
+        with open(filepath, "rb") as f:
+            raw = np.empty(os.fstat(f.fileno()).st_size // RAW_DTYPE.itemsize, dtype=RAW_DTYPE)
+            n_read = f.readinto(raw)
+        raw = raw[:n_read // RAW_DTYPE.itemsize]  # File bisa menyusut saat dibaca
+
+    n_samples = len(raw) // channels
+    # De-interleave: baris ke-i adalah view dengan stride `channels` ke data mentah
+    return raw[:n_samples * channels].reshape(n_samples, channels).T
+
+def load_acquisition_file(filepath, last_seq, default_sample_rate=SAMPLE_RATE):
+    """
+    Memuat file akuisisi sebagai (seq, sample_rate, timestamp, raw_channels).
+    Frame file (lihat functions/frame_file.py) dibaca lewat header-nya dan
+    dilewati (None) jika sequence-nya sudah diproses. File format lama (data
+    mentah tanpa header) tetap didukung dengan sequence lokal.
+    """
+    if is_frame_file(filepath):
+        loaded = load_frame_file(filepath, last_seq)
+        if loaded is None:
+            return None
+        header, raw_channels = loaded
+        return header.seq, header.sample_rate, header.timestamp, raw_channels
+
+    raw_channels = load_raw_data(filepath)
+    if raw_channels is None:
+        return None
+    return (last_seq or 0) + 1, default_sample_rate, time.time(), raw_channels
+
+# --- Antarmuka Sumber --- #
+
+class AcquisitionSource:
+    """
+    Antarmuka bersama semua sumber data akuisisi. Tahap akuisisi hanya memanggil:
+
+      read(timeout) -> RawFrame berikutnya, atau None jika belum ada (timeout)
+      release(frame)-> True jika data frame masih sah setelah dipakai (view
+                       zero-copy bisa tertimpa penulis); sumber yang menyalin
+                       selalu mengembalikan True
+      close()       -> melepas file/port/segmen
+      stats()       -> penghitung dalam format kanal (put/get/dropped/depth)
+
+    Setiap backend bebas memilih strategi tercepat untuk transport-nya.
+    """
+
+    name = "source"
+
+    def read(self, timeout):
+        raise NotImplementedError
+
+    def release(self, frame):
+        return True
+
+    def close(self):
+        pass
+
+    def stats(self):
+        return {"put": 0, "get": 0, "dropped": 0, "depth": 0}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+def _raw_frame(seq, timestamp, sample_rate, raw_channels):
+    return RawFrame(seq, timestamp, sample_rate, raw_channels.shape[0], raw_channels.dtype, raw_channels)
+
+# --- File (frame file / file mentah yang ditulis ulang) --- #
+
+class FileSource(AcquisitionSource):
+    """
+    Memantau satu file yang ditulis ulang oleh generator (dumy_gen.py) dan
+    membaca setiap versi barunya. Frame file di-memory-map (zero-copy; aman
+    karena penulis memakai rename atomik), file mentah lama dibaca sekali.
+    """
+
+    name = "file"
+
+    def __init__(self, filepath=FILENAME, watch_mode=FILE_WATCH_MODE, polling_interval=POLLING_INTERVAL,
+                 sample_rate=SAMPLE_RATE):
+        self.filepath = filepath
+        self.sample_rate = sample_rate
+        self._watcher = create_file_watcher(filepath, watch_mode, polling_interval)
+        self._last_seq = None
+        self.frames = 0
+        print(f"File source: monitoring '{filepath}' for changes...")
+
+    def read(self, timeout):
+        if not self._watcher.wait_for_change(timeout=timeout):
+            return None
+        with telemetry.timer("acquisition.load"):
+            loaded = load_acquisition_file(self.filepath, self._last_seq, self.sample_rate)
+        if loaded is None:
+            return None # Frame dengan sequence ini sudah diproses
+        seq, sample_rate, timestamp, raw_channels = loaded
+        self._last_seq = seq
+        self.frames += 1
+        return _raw_frame(seq, timestamp, sample_rate, raw_channels)
+
+    def close(self):
+        self._watcher.close()
+
+    def stats(self):
+        return {"put": self.frames, "get": self.frames, "dropped": 0, "depth": 0}
+
+# --- Shared Memory --- #
+
+class SharedMemorySource(AcquisitionSource):
+    """
+    Membaca frame terbaru dari ring shared memory (functions/shm_ring.py) tanpa
+    menyalin. Frame yang slotnya tertimpa saat dipakai ditolak oleh release().
+    Jika penulis diam lebih dari `stale_after` detik, segmen dibuka ulang
+    (penulis mungkin dimulai ulang dengan segmen baru). `untracked` diteruskan
+    ke SharedFrameRing.attach (False jika penulis berada di proses yang sama).
+    """
+
+    name = "shm"
+
+    def __init__(self, name=SHM_NAME, stale_after=2.0, untracked=True):
+        self.ring_name = name
+        self.stale_after = stale_after
+        self.untracked = untracked
+        self._ring = None
+        self._last_seq = 0
+        self._last_frame_time = 0
+        self.frames = 0
+        self.torn = 0
+        print(f"Shared memory source: reading ring '{name}'...")
+
+    def read(self, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            if self._ring is None:
+                try:
+                    self._ring = SharedFrameRing.attach(self.ring_name, self.untracked)
+                    self._last_seq, self._last_frame_time = 0, time.monotonic()
+                except FileNotFoundError:
+                    pass # Penulis belum membuat ring
+
+            latest = self._ring.read_latest(self._last_seq) if self._ring is not None else None
+            if latest is not None:
+                seq, sample_rate, timestamp, raw_channels = latest
+                self._last_seq = seq
+                self._last_frame_time = time.monotonic()
+                return _raw_frame(seq, timestamp, sample_rate, raw_channels)
+
+            if self._ring is not None and time.monotonic() - self._last_frame_time > self.stale_after:
+                self._ring.close()
+                self._ring = None
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(0.001 if self._ring is not None else min(0.1, timeout))
+
+    def release(self, frame):
+        if self._ring is not None and self._ring.is_valid(frame.seq):
+            self.frames += 1
+            return True
+        self.torn += 1
+        return False
+
+    def close(self):
+        if self._ring is not None:
+            self._ring.close()
+            self._ring = None
+
+    def stats(self):
+        return {"put": self.frames + self.torn, "get": self.frames, "dropped": self.torn, "depth": 0}
+
+# --- Serial --- #
+
+class SerialSource(AcquisitionSource):
+    """
+    Frame dari port serial lewat SerialReceiver (functions/serial_receiver.py).
+    Penerima berjalan di thread sendiri; read() hanya mengambil frame dari
+    kanalnya. Port serial tidak membawa metadata, jadi sample rate diambil
+    dari konfigurasi dan timestamp adalah waktu frame selesai diterima.
+    """
+
+    name = "serial"
+
+    def __init__(self, port=SERIAL_PORT, baud_rate=SERIAL_BAUD_RATE, samples_per_frame=SERIAL_SAMPLES_PER_FRAME,
+                 channels=ACQUISITION_CHANNELS, sync_word=SERIAL_SYNC_WORD, sample_rate=SAMPLE_RATE, dtype=RAW_DTYPE):
+        # Impor di sini: modul serial hanya dibutuhkan oleh transport ini
+        from functions.serial_receiver import SerialReceiver
+
+        kwargs = {"channels": channels, "dtype": dtype, "sync_word": sync_word}
+        if isinstance(port, str):
+            self.receiver = SerialReceiver.open(port, baud_rate, samples_per_frame, **kwargs)
+            print(f"Serial source: reading '{port}' at {baud_rate} baud...")
+        else:
+            self.receiver = SerialReceiver(port, samples_per_frame, **kwargs) # Objek dengan readinto (mis. pty)
+        self.channels = channels
+        self.sample_rate = sample_rate
+        self.receiver.start()
+
+    def read(self, timeout):
+        try:
+            frame = self.receiver.output.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        raw_channels = frame.data.reshape(-1, self.channels).T
+        return _raw_frame(frame.seq, frame.timestamp, self.sample_rate, raw_channels)
+
+    def close(self):
+        self.receiver.stop()
+
+    def stats(self):
+        return self.receiver.stats()
+
+# --- File Capture Mentah --- #
+
+class RawFileSource(AcquisitionSource):
+    """
+    Memutar file capture mentah (uint16 interleaved tanpa header, seperti
+    capture di PoC/archive) sebagai frame berukuran tetap. File di-memory-map
+    sekali; setiap frame adalah view ke halaman file (zero-copy). Dengan
+    `realtime`, frame dikirim sesuai sample rate; tanpa itu secepat mungkin.
+    """
+
+    name = "raw"
+
+    def __init__(self, filepath=RAW_FILE_PATH, samples_per_frame=RAW_FILE_SAMPLES_PER_FRAME,
+                 channels=ACQUISITION_CHANNELS, sample_rate=SAMPLE_RATE, realtime=RAW_FILE_REALTIME, loop=True):
+        self.filepath = filepath
+        self.samples_per_frame = samples_per_frame
+        self.sample_rate = sample_rate
+        self.realtime = realtime
+        self.loop = loop
+        self.data = load_raw_data(filepath, channels, use_mmap=True)
+        if self.data is None:
+            raise FileNotFoundError(filepath)
+        self.position = 0
+        self.seq = 0
+        self._next_time = time.monotonic()
+        print(f"Raw file source: replaying '{filepath}' ({self.data.shape[1]} samples/channel)...")
+
+    def read(self, timeout):
+        n_total = self.data.shape[1]
+        if self.position + self.samples_per_frame > n_total:
+            if not self.loop or n_total < self.samples_per_frame:
+                time.sleep(timeout) # Akhir file
+                return None
+            self.position = 0
+
+        if self.realtime:
+            delay = self._next_time - time.monotonic()
+            if delay > timeout:
+                time.sleep(timeout)
+                return None
+            if delay > 0:
+                time.sleep(delay)
+            self._next_time = max(self._next_time, time.monotonic() - 1.0) + self.samples_per_frame / self.sample_rate
+
+        start = self.position
+        self.position += self.samples_per_frame
+        self.seq += 1
+        return _raw_frame(self.seq, time.time(), self.sample_rate, self.data[:, start:self.position])
+
+    def stats(self):
+        return {"put": self.seq, "get": self.seq, "dropped": 0, "depth": 0}
+
+# --- Replay Rekaman --- #
+
+class ReplaySource(AcquisitionSource):
+    """
+    Memutar rekaman dari functions/recorder.py. Index dan chunk di-memory-map,
+    jadi setiap frame adalah view ke halaman file (zero-copy) dan rekaman
+    sebesar apa pun tidak dimuat ke memori.
+
+    Jadwal mengikuti timestamp rekaman dibagi `speed` (1.0 = kecepatan asli,
+    >1 lebih cepat, 0 = secepat mungkin). Kontrol (aman dipanggil dari thread
+    UI): pause/resume, step(n) saat pause, seek(frame), seek_time(detik),
+    set_speed(speed). Frame yang dikirim membawa seq asli rekaman, tetapi
+    timestamp-nya waktu pemutaran agar latensi telemetri tetap bermakna.
+    """
+
+    name = "replay"
+
+    def __init__(self, path=REPLAY_PATH, speed=REPLAY_SPEED, loop=REPLAY_LOOP, paused=False):
+        path = path or latest_recording()
+        if path is None:
+            raise FileNotFoundError("Tidak ada rekaman untuk diputar (REPLAY_PATH / RECORD_DIRECTORY)")
+        self.recording = Recording(path)
+        if len(self.recording) == 0:
+            raise ValueError(f"Rekaman '{path}' kosong")
+        self.timestamps = np.asarray(self.recording.index["timestamp"], dtype=np.float64)
+        self.speed = speed
+        self.loop = loop
+        self.paused = paused
+        self.position = 0 # Indeks frame berikutnya
+        self.replayed = 0
+        self.loops = 0
+        self._steps = 0
+        self._lock = threading.Lock()
+        self._reanchor()
+        print(f"Replay source: '{path}' ({len(self.recording)} frames, {self.recording.duration:.1f} s of samples)...")
+
+    def __len__(self):
+        return len(self.recording)
+
+    def _reanchor(self):
+        # Frame `position` dijadwalkan sekarang; frame berikutnya relatif terhadapnya
+        self._anchor_index = min(self.position, len(self.recording) - 1)
+        self._anchor_time = time.monotonic()
+
+    # --- Kontrol pemutaran --- #
+
+    def pause(self):
+        with self._lock:
+            self.paused = True
+
+    def resume(self):
+        with self._lock:
+            self.paused = False
+            self._steps = 0
+            self._reanchor()
+
+    def step(self, n_frames=1):
+        """Saat pause, melepas `n_frames` frame berikutnya (langsung, tanpa jadwal)."""
+        with self._lock:
+            self.paused = True
+            self._steps += n_frames
+
+    def seek(self, frame_index):
+        with self._lock:
+            self.position = int(np.clip(frame_index, 0, len(self.recording) - 1))
+            self._reanchor()
+
+    def seek_time(self, seconds):
+        """Pindah ke frame pertama pada/sesudah `seconds` detik sejak awal rekaman."""
+        self.seek(int(np.searchsorted(self.timestamps, self.timestamps[0] + seconds)))
+
+    def set_speed(self, speed):
+        with self._lock:
+            self.speed = speed
+            self._reanchor()
+
+    # --- Antarmuka sumber --- #
+
+    def _next_index(self):
+        """(indeks frame, detik sampai jadwalnya) atau (None, tunggu) di bawah lock."""
+        if self.position >= len(self.recording):
+            if not self.loop:
+                return None, 0.1 # Akhir rekaman
+            self.position = 0
+            self.loops += 1
+            self._reanchor()
+        if self.paused:
+            return (self.position, 0.0) if self._steps > 0 else (None, 0.01)
+        if not self.speed:
+            return self.position, 0.0
+
+        elapsed = self.timestamps[self.position] - self.timestamps[self._anchor_index]
+        delay = self._anchor_time + max(0.0, elapsed) / self.speed - time.monotonic()
+        if delay < -1.0:
+            self._reanchor() # Tertinggal jauh (konsumen lambat): jangan mengejar dengan burst
+            delay = 0.0
+        return self.position, delay
+
+    def read(self, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                index, delay = self._next_index()
+                if index is not None and delay <= 0:
+                    self.position += 1
+                    if self.paused:
+                        self._steps -= 1
+                    break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            time.sleep(min(delay, remaining))
+
+        seq, _, sample_rate, raw_channels = self.recording.frame(index)
+        self.replayed += 1
+        return _raw_frame(seq, time.time(), sample_rate, raw_channels)
+
+    def close(self):
+        self.recording.close()
+
+    def stats(self):
+        return {"put": self.replayed, "get": self.replayed, "dropped": 0, "depth": 0,
+                "position": self.position, "loops": self.loops}
+
+# --- Factory --- #
+
+SOURCES = {
+    "file": FileSource,
+    "shm": SharedMemorySource,
+    "serial": SerialSource,
+    "raw": RawFileSource,
+    "replay": ReplaySource,
+}
+
+def create_source(transport=ACQUISITION_TRANSPORT, **kwargs):
+    """Membuat sumber akuisisi sesuai nama transport (default ACQUISITION_TRANSPORT)."""
+    if transport not in SOURCES:
+        raise ValueError(f"Transport akuisisi tidak dikenal: {transport}")
+    return SOURCES[transport](**kwargs)
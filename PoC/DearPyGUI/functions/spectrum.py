@@ -0,0 +1,307 @@
+# functions/spectrum.py
+
+import functools
+import os
+import weakref
+import numpy as np
+import scipy
+import scipy.fft
+import scipy.signal
+
+# Rentang versi scipy yang sudah diuji untuk pemanggilan pocketfft privat di bawah
+_POCKETFFT_TESTED_VERSIONS = ((1, 4), (1, 17))
+
+def _load_pocketfft():
+    """
+    Backend pocketfft di balik scipy.fft. r2c menerima `out`, sehingga output
+    kompleks bisa dipakai ulang, dan overhead dispatch scipy.fft (berarti untuk
+    n kecil) hilang. Karena modul dan urutan argumennya privat, modul hanya
+    dipakai pada versi scipy yang sudah diuji dan setelah hasilnya dicocokkan
+    dengan scipy.fft.rfft; selain itu None (kembali ke API publik).
+    """
+    try:
+        version = tuple(int(part) for part in scipy.__version__.split(".")[:2])
+        low, high = _POCKETFFT_TESTED_VERSIONS
+        if not low <= version <= high:
+            return None
+        from scipy.fft._pocketfft import pypocketfft
+        x = np.arange(8, dtype=np.float32).reshape(2, 4)
+        out = np.empty((2, 3), dtype=np.complex64)
+        result = pypocketfft.r2c(x, (1,), True, 0, out, 1)
+        if result is not out or not np.allclose(out, scipy.fft.rfft(x, axis=-1)):
+            return None
+        return pypocketfft
+    except Exception:
+        return None
+
+_pocketfft = _load_pocketfft()
+
+# --- Cache Sumbu Frekuensi & Window --- #
+
+@functools.lru_cache(maxsize=32)
+def get_frequency_axis(n, sample_rate):
+    """Sumbu frekuensi rfft (n//2 + 1 bin) untuk (n, sample_rate), read-only dan di-cache."""
+    freqs = np.fft.rfftfreq(n, d=1 / sample_rate)
+    freqs.flags.writeable = False
+    return freqs
+
+@functools.lru_cache(maxsize=32)
+def get_window(name, n):
+    """Koefisien window (float64) untuk panjang n, read-only dan di-cache."""
+    window = scipy.signal.get_window(name, n, fftbins=True).astype(np.float64)
+    window.flags.writeable = False
+    return window
+
+def _rfft(x, out, workers):
+    """rfft sepanjang axis terakhir, ditulis ke `out` (kompleks) jika backend mendukung."""
+    if _pocketfft is None:
+        return scipy.fft.rfft(x, axis=-1, workers=workers)
+    threads = workers if workers > 0 else max(1, (os.cpu_count() or 1) + 1 + workers)
+    return _pocketfft.r2c(x, (x.ndim - 1,), True, 0, out, threads)
+
+# --- Pool Buffer Output --- #
+
+class OutputPool:
+    """
+    Buffer output (shape, dtype tetap) yang hanya dipakai ulang setelah tidak ada
+    lagi yang memegang hasilnya. Hasil spektrum disimpan konsumen (UI, piramida
+    LOD yang berisi view ke buffer) selama waktu yang tidak diketahui worker,
+    dan mailbox bisa membuang hasil yang belum dibaca, jadi buffer tidak boleh
+    ditimpa berdasarkan urutan pemanggilan saja.
+
+    Setiap buffer adalah ndarray di atas bytearray milik pool. NumPy mengarahkan
+    `.base` semua view turunannya (slice, baris channel, piramida) ke ndarray
+    itu, sehingga weakref ke ndarray tersebut mati tepat ketika tidak ada lagi
+    view yang hidup. Buffer baru dipakai ulang setelah weakref-nya mati; tidak
+    bergantung pada jumlah referensi persis interpreter. Pada interpreter dengan
+    GC tertunda, pool hanya mengalokasikan lebih banyak, tidak pernah menimpa.
+
+    Dalam keadaan stabil pool berisi buffer sebanyak hasil yang masih dipegang
+    konsumen ditambah satu, dan tidak ada alokasi memori data baru. Jika lebih
+    dari `max_buffers` sedang dipakai, buffer baru dialokasikan tanpa masuk pool.
+    """
+
+    def __init__(self, shape, dtype, max_buffers=8):
+        self.shape = shape
+        self.dtype = np.dtype(dtype)
+        self.max_buffers = max_buffers
+        self.allocations = 0
+        self._nbytes = int(np.prod(shape)) * self.dtype.itemsize
+        self._buffers = [] # [bytearray, weakref ke ndarray yang terakhir diserahkan]
+
+    def acquire(self):
+        for entry in self._buffers:
+            if entry[1]() is None:
+                return self._lease(entry)
+        entry = [bytearray(self._nbytes), None]
+        self.allocations += 1
+        if len(self._buffers) < self.max_buffers:
+            self._buffers.append(entry)
+        return self._lease(entry)
+
+    def _lease(self, entry):
+        array = np.ndarray(self.shape, dtype=self.dtype, buffer=entry[0])
+        entry[1] = weakref.ref(array)
+        return array
+
+# --- Spectrum Engine --- #
+
+class SpectrumEngine:
+    """
+    Menghitung spektrum magnitudo sinyal real dengan rfft (presisi float32).
+
+    Sumbu frekuensi, window, buffer input ber-window, buffer kompleks hasil rfft
+    dan buffer magnitudo dialokasikan sekali per (channels, n, sample_rate) lalu
+    dipakai ulang, sehingga dalam keadaan stabil tidak ada alokasi array per
+    frame. Tanpa window dan tanpa remove_dc, input float32 kontigu langsung
+    ditransformasi tanpa disalin ke buffer kerja.
+
+    Engine tidak thread-safe: buat satu instance per worker thread. `workers`
+    diteruskan ke pocketfft untuk transformasi multi-thread; pada mode batch
+    channel dibagi ke thread-thread tersebut.
+
+    Magnitudo ditulis ke buffer dari OutputPool: buffer hasil sebelumnya tidak
+    pernah ditimpa selama hasil itu atau view-nya masih dipegang (mis. oleh UI).
+
+    Keterbatasan: jika modul pocketfft privat scipy tidak tersedia atau versi
+    scipy di luar rentang yang diuji, rfft memakai scipy.fft.rfft yang selalu
+    mengalokasikan output kompleksnya. Pada n kecil
+    (4096) waktu per frame didominasi overhead pemanggilan Python, sehingga
+    percepatan terhadap compute_fft lama sekitar 2x, bukan sebesar pada n besar
+    (lihat benchmarks/bench_spectrum.py).
+    """
+
+    def __init__(self, window="boxcar", workers=1, max_buffers=8):
+        self.window = window
+        self.workers = workers
+        self.max_buffers = max_buffers
+        self._key = None
+
+    def _prepare(self, channels, n, sample_rate):
+        key = (channels, n, sample_rate)
+        if key == self._key:
+            return
+        n_bins = n // 2 + 1
+        self._freqs = get_frequency_axis(n, sample_rate)
+        self._window = get_window(self.window, n).astype(np.float32)
+        self._windowed = np.empty((channels, n), dtype=np.float32)
+        self._spectrum = np.empty((channels, n_bins), dtype=np.complex64)
+        self._outputs = OutputPool((channels, n_bins), np.float32, self.max_buffers)
+        self._key = key
+
+    def compute(self, channel, sample_rate, drop_nyquist=True):
+        """
+        Mengembalikan (frequencies, magnitudes) untuk satu channel.
+        drop_nyquist=True mengembalikan n//2 bin pertama (sama seperti compute_fft lama).
+        """
+        if len(channel) == 0:
+            return np.array([]), np.array([])
+        freqs, mags = self.compute_batch(channel[np.newaxis, :], sample_rate, drop_nyquist=drop_nyquist)
+        return freqs, mags[0]
+
+    def compute_batch(self, data, sample_rate, remove_dc=False, drop_nyquist=True):
+        """
+        Spektrum untuk semua channel sekaligus. `data` berbentuk (channels, n)
+        (boleh berupa strided view). Semua channel ditransformasi dalam satu
+        pemanggilan rfft sepanjang axis terakhir, tanpa loop Python per channel.
+        Mengembalikan (frequencies, magnitudes (channels, bins)).
+        """
+        channels, n = data.shape
+        if n == 0:
+            return np.array([]), np.empty((channels, 0), dtype=np.float32)
+        self._prepare(channels, n, sample_rate)
+
+        if remove_dc or self.window != "boxcar" or data.dtype != np.float32 or not data.flags.c_contiguous:
+            # Salin ke buffer kerja (data dari Frame bersifat read-only), lalu window di tempat
+            np.copyto(self._windowed, data, casting="unsafe")
+            if remove_dc:
+                self._windowed -= self._windowed.mean(axis=1, keepdims=True)
+            if self.window != "boxcar":
+                np.multiply(self._windowed, self._window, out=self._windowed)
+            data = self._windowed
+
+        mags = self._outputs.acquire()
+        np.abs(_rfft(data, self._spectrum, self.workers), out=mags)
+
+        stop = n // 2 if drop_nyquist else n // 2 + 1
+        return self._freqs[:stop], mags[:, :stop]
+
+    def compute_interleaved(self, raw, channels, sample_rate, drop_nyquist=True):
+        """
+        Spektrum langsung dari buffer mentah interleaved (misalnya uint16 dari ADC):
+        de-interleave sebagai strided view, hapus DC per channel, lalu compute_batch.
+        """
+        n = len(raw) // channels
+        view = raw[:n * channels].reshape(n, channels).T
+        return self.compute_batch(view, sample_rate, remove_dc=True, drop_nyquist=drop_nyquist)
+
+# --- Spektrum Rata-rata (Welch + Averaging Antar Frame) --- #
+
+class AveragedSpectrum:
+    """
+    Spektrum Welch yang dirata-ratakan secara bertahap antar frame.
+
+    Setiap frame dipotong menjadi segmen `segment_size` dengan overlap tertentu
+    (strided view, tanpa salinan), tiap segmen dihapus DC-nya, diberi window,
+    lalu semua segmen semua channel ditransformasi dalam satu rfft. Power rata-rata
+    segmen digabung ke state berjalan:
+
+      mode "welch"       -> hanya Welch per frame, tanpa rata-rata antar frame
+      mode "exponential" -> avg = (1 - alpha) * avg + alpha * P
+      mode "linear"      -> rata-rata N frame terakhir (ring N x power + jumlah berjalan)
+
+    Semua state rata-rata berada di array berukuran tetap yang dialokasikan sekali
+    per (channels, segment_size, sample_rate), sehingga memori konstan selama run
+    panjang. Hasil berupa amplitudo (akar dari power rata-rata, skala "spectrum").
+    """
+
+    MODES = ("welch", "exponential", "linear")
+
+    def __init__(self, mode="exponential", segment_size=4096, overlap=0.5, window="hann",
+                 alpha=0.2, n_average=8, workers=1, max_buffers=8):
+        if mode not in self.MODES:
+            raise ValueError(f"Mode averaging tidak dikenal: {mode}")
+        self.mode = mode
+        self.segment_size = segment_size
+        self.overlap = overlap
+        self.window = window
+        self.alpha = alpha
+        self.n_average = n_average
+        self.workers = workers
+        self.max_buffers = max_buffers
+        self._key = None
+
+    def _prepare(self, channels, segment_size, sample_rate):
+        key = (channels, segment_size, sample_rate)
+        if key == self._key:
+            return
+        n_bins = segment_size // 2 + 1
+        window = get_window(self.window, segment_size)
+        self._window = window.astype(np.float32)
+
+        # Skala "spectrum": power sinus terbaca sebagai amplitudo^2 (RMS), one-sided
+        self._scale = np.full(n_bins, 2.0 / np.sum(window) ** 2)
+        self._scale[0] /= 2
+        if segment_size % 2 == 0:
+            self._scale[-1] /= 2
+
+        self._freqs = get_frequency_axis(segment_size, sample_rate)
+        self._power = np.empty((channels, n_bins), dtype=np.float64)
+        self._average = np.zeros((channels, n_bins), dtype=np.float64)
+        self._history = np.zeros((self.n_average, channels, n_bins), dtype=np.float64)
+        self._history_sum = np.zeros((channels, n_bins), dtype=np.float64)
+        self._history_index = 0
+        self._count = 0
+        self._outputs = OutputPool((channels, n_bins), np.float32, self.max_buffers)
+        self._key = key
+
+    def reset(self):
+        """Mengosongkan riwayat rata-rata (misalnya saat parameter sinyal berubah)."""
+        self._key = None
+
+    @property
+    def frames_averaged(self):
+        return self._count
+
+    def update(self, data, sample_rate, drop_nyquist=True):
+        """
+        Memasukkan satu frame (channels, n) dan mengembalikan
+        (frequencies, amplitudes (channels, bins)) dari state rata-rata terbaru.
+        """
+        channels, n = data.shape
+        segment_size = min(self.segment_size, n)
+        if segment_size < 2:
+            return np.array([]), np.empty((channels, 0), dtype=np.float32)
+        self._prepare(channels, segment_size, sample_rate)
+
+        # Segmen Welch sebagai view (channels, n_segments, segment_size)
+        hop = max(1, int(segment_size * (1 - self.overlap)))
+        segments = np.lib.stride_tricks.sliding_window_view(data, segment_size, axis=-1)[:, ::hop]
+        segments = segments - segments.mean(axis=-1, keepdims=True, dtype=np.float32)
+        segments *= self._window
+
+        spectra = scipy.fft.rfft(segments, axis=-1, overwrite_x=True, workers=self.workers)
+        segment_power = np.abs(spectra)
+        np.square(segment_power, out=segment_power)
+        np.multiply(segment_power.mean(axis=1), self._scale, out=self._power)
+
+        if self.mode == "exponential" and self._count > 0:
+            self._average *= 1 - self.alpha
+            self._average += self.alpha * self._power
+        elif self.mode == "linear":
+            # Jumlah berjalan: tambah power baru, kurangi power yang keluar dari jendela N frame
+            slot = self._history[self._history_index]
+            self._history_sum -= slot
+            slot[...] = self._power
+            self._history_sum += slot
+            self._history_index = (self._history_index + 1) % self.n_average
+            np.divide(self._history_sum, min(self._count + 1, self.n_average), out=self._average)
+        else:
+            self._average[...] = self._power
+        self._count += 1
+
+        amplitudes = self._outputs.acquire() # Tidak menimpa hasil yang masih dipegang konsumen
+        np.sqrt(self._average, out=amplitudes, casting="same_kind")
+
+        stop = segment_size // 2 if drop_nyquist else segment_size // 2 + 1
+        return self._freqs[:stop], amplitudes[:, :stop]
@@ -0,0 +1,103 @@
+# functions/stft.py
+
+import numpy as np
+import scipy.fft
+
+from functions.spectrum import get_window
+
+# --- Colormap --- #
+
+# Titik jangkar colormap (mirip "viridis"): posisi 0..1 -> RGB
+_COLORMAP_ANCHORS = np.array([
+    [0.00, 0.267, 0.005, 0.329],
+    [0.25, 0.229, 0.322, 0.546],
+    [0.50, 0.128, 0.567, 0.551],
+    [0.75, 0.369, 0.789, 0.383],
+    [1.00, 0.993, 0.906, 0.144],
+])
+
+def build_colormap_lut(size=256):
+    """LUT RGBA float32 (size, 4) untuk memetakan intensitas 0..1 ke warna."""
+    positions = np.linspace(0, 1, size)
+    lut = np.ones((size, 4), dtype=np.float32)
+    for channel in range(3):
+        lut[:, channel] = np.interp(positions, _COLORMAP_ANCHORS[:, 0], _COLORMAP_ANCHORS[:, channel + 1])
+    return lut
+
+# --- STFT Streaming --- #
+
+class StreamingSTFT:
+    """
+    STFT streaming untuk tampilan waterfall.
+
+    Sampel yang masuk disambung dengan sisa frame sebelumnya, lalu hanya kolom
+    baru (setiap `hop` sampel) yang dihitung, dalam satu pemanggilan rfft.
+    Jika satu frame menghasilkan lebih dari `max_columns_per_frame` kolom
+    (misalnya 20 MS/s dengan hop kecil), kolom dipilih merata (decimation)
+    agar tahap ini tidak pernah tertinggal dari input.
+
+    Satu-satunya state sinyal adalah sisa sampel (overlap) untuk kolom
+    berikutnya; riwayat yang ditampilkan disimpan oleh WaterfallView di UI.
+    """
+
+    def __init__(self, nfft=1024, hop=512, window="hann",
+                 max_columns_per_frame=32, dynamic_range_db=80.0):
+        self.nfft = nfft
+        self.hop = hop
+        self.max_columns_per_frame = max_columns_per_frame
+        self.dynamic_range_db = dynamic_range_db
+        self.n_bins = nfft // 2  # Bin Nyquist dibuang, sama seperti plot FFT
+
+        self._window = get_window(window, nfft).astype(np.float32)
+        self._lut = build_colormap_lut()
+        self._tail = np.empty(0, dtype=np.float32)
+        self._reference_db = None
+        self.columns_total = 0
+        self.columns_skipped = 0
+
+    def push(self, samples):
+        """
+        Memproses sampel baru dan mengembalikan baris dB kolom baru (k, bins).
+        Hanya kolom yang belum pernah dihitung yang diproses.
+        """
+        stream = np.concatenate((self._tail, samples)) if len(self._tail) else samples
+        if len(stream) < self.nfft:
+            self._tail = np.array(stream, dtype=np.float32)
+            return np.empty((0, self.n_bins), dtype=np.float32)
+
+        n_columns = (len(stream) - self.nfft) // self.hop + 1
+        starts = np.arange(n_columns) * self.hop
+        if n_columns > self.max_columns_per_frame:
+            # Decimation kolom: pilih kolom merata, sisanya dilewati
+            starts = starts[np.linspace(0, n_columns - 1, self.max_columns_per_frame).astype(np.intp)]
+            self.columns_skipped += n_columns - len(starts)
+
+        windows = np.lib.stride_tricks.sliding_window_view(stream, self.nfft)[starts]
+        windows = windows * self._window
+        spectra = scipy.fft.rfft(windows, axis=-1, overwrite_x=True)[:, :self.n_bins]
+        rows = np.abs(spectra).astype(np.float32)
+        np.maximum(rows, 1e-12, out=rows)
+        np.log10(rows, out=rows)
+        rows *= 20
+
+        self._tail = np.array(stream[n_columns * self.hop:], dtype=np.float32)
+        self.columns_total += len(rows)
+        return rows
+
+    def colorize(self, rows):
+        """
+        Memetakan baris dB ke RGBA float32 (k, bins, 4). Skala mengikuti puncak
+        sinyal secara halus (auto-range) dengan rentang `dynamic_range_db`.
+        """
+        if len(rows) == 0:
+            return np.empty((0, self.n_bins, 4), dtype=np.float32)
+        peak = float(rows.max())
+        if self._reference_db is None:
+            self._reference_db = peak
+        else:
+            self._reference_db = 0.9 * self._reference_db + 0.1 * peak
+        low = self._reference_db - self.dynamic_range_db
+
+        scaled = (rows - low) * ((len(self._lut) - 1) / self.dynamic_range_db)
+        indices = np.clip(scaled, 0, len(self._lut) - 1).astype(np.intp)
+        return self._lut[indices]
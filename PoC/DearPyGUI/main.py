@@ -8,62 +8,116 @@ import time
 # --- Impor dari file lokal --- #
 
 # Impor konfigurasi terpusat
-from config import APP_SPACING, APP_PADDING, THEME_COLORS
+from config import (APP_SPACING, APP_PADDING, THEME_COLORS, SAMPLE_RATE, WATERFALL_NFFT, WATERFALL_DEPTH,
+                    PPI_MODE, PPI_TRAIL_LENGTH, PPI_RASTER_SIZE, PPI_RANGE_BINS, PPI_PHOSPHOR_DECAY,
+                    PPI_AZIMUTH_RESOLUTION, DSP_BACKEND, INSTRUMENTATION_ENABLED, TELEMETRY_DUMP_PATH,
+                    ACQUISITION_TRANSPORT, ACQUISITION_CHANNELS)
 
 # Impor fungsi pembuat widget UI (hanya UI)
-from widgets.PPI import create_ppi_widget
+from widgets.PPI import (create_ppi_widget, PPIRenderer, PPIRasterView, create_ppi_raster_texture,
+                         create_ppi_raster_layer)
 from widgets.FFT import create_fft_widget
 from widgets.Sinewave import create_sinewave_widget
+from widgets.Waterfall import WaterfallView, create_waterfall_texture, create_waterfall_widget
+from widgets.series import ChannelSeriesSet
 from widgets.file import create_file_explorer_widget
-from widgets.controller import create_controller_widget
+from widgets.controller import (create_controller_widget, update_recorder_status, create_replay_controls,
+                                update_replay_status)
+from widgets.telemetry import create_telemetry_overlay, toggle_telemetry_overlay, update_telemetry_overlay
 
 # Impor fungsi worker thread (hanya logika)
-from functions.data_processing import ppi_data_worker, fft_data_worker, sinewave_data_worker, polar_to_cartesian
+from functions.data_processing import (ppi_data_worker, acquisition_worker, fft_data_worker, sinewave_data_worker,
+                                       waterfall_data_worker, detection_data_worker)
+from functions.acquisition import FrameHub
+from functions.channels import LatestValueMailbox, BoundedChannel
+from functions.decimation import WaveformDecimator
+from functions.ppi_raster import PhosphorBuffer
+from functions.dsp_process import DSPProcessBackend
+from functions.recorder import Recorder
+from functions.sources import create_source
+from functions.instrumentation import telemetry
 
 # --- Pengaturan Aplikasi --- #
 
-# Setup antrian (queue) untuk komunikasi antar thread
-ppi_queue = queue.Queue()
-fft_result_queue = queue.Queue()
-sinewave_result_queue = queue.Queue()
+# Setup kanal komunikasi antar thread (semuanya terbatas). Hasil yang hanya
+# nilai terbarunya berarti memakai mailbox; pesan yang semuanya harus digambar
+# (sektor PPI raster, baris waterfall) memakai queue terbatas drop-oldest.
+if PPI_MODE == "raster":
+    ppi_queue = BoundedChannel(64, overflow="drop_oldest")
+else:
+    ppi_queue = LatestValueMailbox()
+fft_result_queue = LatestValueMailbox()
+sinewave_result_queue = LatestValueMailbox()
+waterfall_result_queue = BoundedChannel(64, overflow="drop_oldest")
+# Deteksi dari setiap frame diplot semuanya oleh worker PPI
+detection_queue = BoundedChannel(64, overflow="drop_oldest")
+
+# Tahap akuisisi tunggal: file dibaca sekali, frame dibagikan ke semua subscriber
+frame_hub = FrameHub()
+fft_frame_queue = frame_hub.subscribe()
+sinewave_frame_queue = frame_hub.subscribe()
+waterfall_frame_queue = frame_hub.subscribe()
+# Detektor wajib memproses setiap frame akuisisi: kanal "block" memberi backpressure
+# (akuisisi menunggu detektor hingga FrameHub.block_timeout), dengan ruang 8 frame
+# untuk meredam jitter CFAR. Frame yang tetap hilang adalah pelanggaran SLA dan
+# ditampilkan sebagai SLA VIOLATION di overlay telemetri.
+detection_frame_queue = frame_hub.subscribe(maxsize=8, overflow="block")
+
+# Decimation waveform (min/max per piksel), dihitung ulang hanya jika data/zoom berubah
+# dan dikirim ke series sebagai array NumPy (tanpa .tolist())
+sinewave_decimator = WaveformDecimator()
+sinewave_series = ChannelSeriesSet("sinewave", "sinewave_yaxis", ACQUISITION_CHANNELS)
+fft_decimator = WaveformDecimator()
+fft_series = ChannelSeriesSet("fft", "fft_yaxis", ACQUISITION_CHANNELS)
+
+# Renderer PPI: pool item tetap (mode vector) atau citra fosfor (mode raster)
+ppi_renderer = PPIRenderer(THEME_COLORS, trail_length=PPI_TRAIL_LENGTH)
+ppi_raster_view = None
+if PPI_MODE == "raster":
+    ppi_raster_view = PPIRasterView(PhosphorBuffer(PPI_RASTER_SIZE, PPI_RANGE_BINS, decay=PPI_PHOSPHOR_DECAY,
+                                                   azimuth_resolution=PPI_AZIMUTH_RESOLUTION), THEME_COLORS)
+
+# Riwayat tampilan waterfall (ring + raw texture, dialokasikan sekali)
+waterfall_view = WaterfallView(WATERFALL_NFFT // 2, WATERFALL_DEPTH)
 
 # Event untuk memberi sinyal berhenti ke semua thread
 stop_event = threading.Event()
 threads = []
+dsp_backend = None # Diisi jika DSP_BACKEND = "process"
 
-# --- Fungsi Inti --- #
+# Perekam sampel mentah dari tahap akuisisi (hanya backend "thread": di backend
+# "process" akuisisi berjalan di proses lain)
+recorder = Recorder() if DSP_BACKEND != "process" else None
 
-def update_ui_from_queues():
-    """Memeriksa semua queue pada setiap frame dan mengupdate UI jika ada data baru."""
-    # Update PPI (sapuan jarum & target)
-    try:
-        ppi_data = ppi_queue.get_nowait()
-        dpg.delete_item("ppi_dynamic_layer", children_only=True)
+# Sumber replay dibuat di sini (bukan di acquisition_worker) agar panel
+# Controller bisa mengendalikannya: pause/step, kecepatan, seek
+replay_source = None
 
-        accent_color = THEME_COLORS["accent"]
-        
-        # Gambar jejak pudar (persistence)
-        angles_history = ppi_data["angles"]
-        history_len = len(angles_history)
-        for i, angle in enumerate(angles_history):
-            alpha = int(255 * ((i + 1) / history_len))
-            faded_color = (*accent_color[:3], alpha)
-            p0 = (0, 0)
-            p1 = polar_to_cartesian(0, 0, angle - 0.5, 100)
-            p2 = polar_to_cartesian(0, 0, angle + 0.5, 100)
-            dpg.draw_polygon(points=[p0, p1, p2], color=faded_color, fill=faded_color, parent="ppi_dynamic_layer")
-        
-        # Gambar target
-        for angle, radius in ppi_data["targets"]:
-            target_pos = polar_to_cartesian(0, 0, angle, radius)
-            dpg.draw_circle(center=target_pos, radius=2, color=THEME_COLORS["target"], fill=THEME_COLORS["target"], parent="ppi_dynamic_layer")
+# Timestamp akuisisi dari data yang sudah diserahkan ke Dear PyGui tetapi belum digambar
+pending_latency = {}
 
-    except queue.Empty:
-        pass # Tidak ada data baru, lanjutkan
+# --- Fungsi Inti --- #
+
+def update_ppi():
+    """Update PPI (sapuan jarum & target): hanya mengubah item yang sudah ada."""
+    if ppi_raster_view is not None:
+        # Mode raster: semua sektor baru dilukis agar sapuan tidak berlubang
+        for ppi_data in ppi_queue.drain():
+            ppi_raster_view.update(ppi_data)
+            pending_latency["latency.ppi"] = ppi_data.get("timestamp")
+        ppi_raster_view.render("ppi_raster_texture")
+    else:
+        try:
+            ppi_data = ppi_queue.get_latest()
+            ppi_renderer.update(ppi_data["angles"], ppi_data["targets"], ppi_data["sweep_count"])
+            pending_latency["latency.ppi"] = ppi_data.get("timestamp")
+        except queue.Empty:
+            pass # Tidak ada data baru, lanjutkan
 
-    # Update plot FFT
+def update_fft():
+    """Update plot FFT."""
     try:
-        result = fft_result_queue.get_nowait()
+        result = fft_result_queue.get_latest()
         status = result.get("status")
         
         if status == "processing":
@@ -73,31 +127,71 @@ def update_ui_from_queues():
         elif status == "done":
             update_time = time.strftime('%H:%M:%S')
             dpg.set_value("fft_status_text", f"Plot updated at: {update_time}")
-            dpg.set_value("fft_ch1_series", [result["freqs_ch1"].tolist(), result["mag_ch1"].tolist()])
-            dpg.set_value("fft_ch2_series", [result["freqs_ch2"].tolist(), result["mag_ch2"].tolist()])
-            
             sr = result["sample_rate"]
             n_samples = result["n_samples"]
-            freq_res = sr / n_samples if n_samples > 0 else 0
+            freq_res = result.get("freq_resolution", sr / n_samples if n_samples > 0 else 0)
+            # Sumbu x spektrum: bin ke-i berada di i * freq_res
+            fft_decimator.set_data(result["magnitudes"], 1 / freq_res, result["seq"], result["pyramids"])
             plot_label = f'Live FFT Spectrum\nSR: {sr/1e6:.2f}MHz, N: {n_samples}, Res: {freq_res:.1f}Hz'
             dpg.configure_item("fft_plot", label=plot_label)
             dpg.set_axis_limits_auto("fft_yaxis")
+            pending_latency["latency.fft"] = result.get("timestamp")
 
     except queue.Empty:
         pass
 
-    # Update plot Sinewave
+    # Gambar ulang spektrum hanya jika data, rentang zoom atau lebar plot berubah
+    x_min, x_max = dpg.get_axis_limits("fft_xaxis")
+    decimated = fft_decimator.update(x_min, x_max, dpg.get_item_rect_size("fft_plot")[0])
+    if decimated is not None:
+        fft_series.update(decimated, x_key=fft_decimator.x_key)
+
+def update_sinewave():
+    """Update plot Sinewave."""
     try:
-        result = sinewave_result_queue.get_nowait()
+        result = sinewave_result_queue.get_latest()
         if result.get("status") == "done":
             dpg.set_value("sinewave_status_text", f"Waveform updated at: {time.strftime('%H:%M:%S')}")
-            dpg.set_value("sinewave_ch1_series", [result["time_axis"].tolist(), result["ch1_data"].tolist()])
-            dpg.set_value("sinewave_ch2_series", [result["time_axis"].tolist(), result["ch2_data"].tolist()])
+            sinewave_decimator.set_data(result["channels"], result["sample_rate"], result["seq"], result["pyramids"])
             dpg.set_axis_limits_auto("sinewave_xaxis")
             dpg.set_axis_limits_auto("sinewave_yaxis")
+            pending_latency["latency.sinewave"] = result.get("timestamp")
     except queue.Empty:
         pass
 
+    # Gambar ulang waveform hanya jika data, rentang x atau lebar plot berubah
+    x_min, x_max = dpg.get_axis_limits("sinewave_xaxis")
+    plot_width = dpg.get_item_rect_size("sinewave_plot")[0]
+    decimated = sinewave_decimator.update(x_min, x_max, plot_width)
+    if decimated is not None:
+        sinewave_series.update(decimated, x_key=sinewave_decimator.x_key)
+
+def update_waterfall():
+    """Update waterfall: semua baris baru diambil agar riwayat tidak berlubang."""
+    for result in waterfall_result_queue.drain():
+        waterfall_view.push_rows(result["rows"])
+        pending_latency["latency.waterfall"] = result.get("timestamp")
+        dpg.set_value("waterfall_status_text",
+                      f"Columns: {result['columns_total']} (decimated: {result['columns_skipped']})")
+    waterfall_view.render("waterfall_texture")
+
+def update_ui_from_queues():
+    """Memeriksa semua queue pada setiap frame dan mengupdate UI jika ada data baru."""
+    with telemetry.timer("ui.ppi"):
+        update_ppi()
+    with telemetry.timer("ui.fft"):
+        update_fft()
+    with telemetry.timer("ui.sinewave"):
+        update_sinewave()
+    with telemetry.timer("ui.waterfall"):
+        update_waterfall()
+
+def record_frame_latency():
+    """Dipanggil setelah frame digambar: latensi akuisisi -> piksel untuk data yang baru tampil."""
+    for name, timestamp in pending_latency.items():
+        telemetry.record_latency(name, timestamp)
+    pending_latency.clear()
+
 def cleanup_and_exit():
     """Memberhentikan thread worker dengan aman dan menutup Dear PyGui."""
     print("Stopping worker threads...")
@@ -105,46 +199,33 @@ def cleanup_and_exit():
     time.sleep(0.5) # Beri waktu agar thread bisa berhenti
     for t in threads:
         t.join()
+    if dsp_backend is not None:
+        dsp_backend.stop()
+    if recorder is not None:
+        recorder.stop()
+    if INSTRUMENTATION_ENABLED and TELEMETRY_DUMP_PATH:
+        telemetry.dump_json(TELEMETRY_DUMP_PATH)
+        print(f"Telemetry written to '{TELEMETRY_DUMP_PATH}'.")
     print("All threads stopped. Destroying context.")
     dpg.destroy_context()
 
 # --- Pengaturan UI (Layout dan Tema) --- #
 
-dpg.create_context()
-
 # Atur callback untuk keluar dengan tombol Esc
 def exit_on_esc():
     dpg.stop_dearpygui()
 
-with dpg.handler_registry():
-    dpg.add_key_press_handler(key=dpg.mvKey_Escape, callback=exit_on_esc)
-
-# Definisikan tema global untuk konsistensi
-with dpg.theme() as global_theme:
-    with dpg.theme_component(dpg.mvAll):
-        dpg.add_theme_style(dpg.mvStyleVar_WindowPadding, APP_PADDING, APP_PADDING)
-        dpg.add_theme_style(dpg.mvStyleVar_FramePadding, 4, 4)
-        dpg.add_theme_style(dpg.mvStyleVar_ItemSpacing, APP_SPACING, APP_SPACING)
-        dpg.add_theme_color(dpg.mvPlotCol_PlotBg, THEME_COLORS["background"])
-dpg.bind_theme(global_theme)
-
-# Buat layout utama window
-with dpg.window(tag="Primary Window"):
-    with dpg.group(horizontal=True):
-        # Kolom kiri (70% lebar)
-        with dpg.group(tag="left_column"):
-            with dpg.child_window(label="PPI Desktop", tag="ppi_window", no_scrollbar=True):
-                create_ppi_widget(colors=THEME_COLORS)
-            with dpg.child_window(label="FFT Desktop", tag="fft_window"):
-                create_fft_widget()
-        # Kolom kanan (sisa lebar)
-        with dpg.group(tag="right_column"):
-            with dpg.child_window(label="File Explorer", tag="file_explorer_window"):
-                create_file_explorer_widget()
-            with dpg.child_window(label="Sinewave", tag="sinewave_window"):
-                create_sinewave_widget()
-            with dpg.child_window(label="Controller", tag="controller_window"):
-                create_controller_widget()
+# Callback tombol Record di Controller
+def toggle_recording():
+    try:
+        if recorder.recording:
+            recorder.stop()
+            dpg.set_value("record_status", f"Saved to {recorder.path}")
+        else:
+            recorder.start()
+    except Exception as e:
+        print(f"Error toggling recording: {e}")
+        dpg.set_value("record_status", f"Recording error: {e}")
 
 # Callback untuk menyesuaikan ukuran layout saat window di-resize
 def resize_callback():
@@ -170,30 +251,146 @@ def resize_callback():
     dpg.set_item_height("sinewave_window", int(right_col_height * 0.35))
     dpg.set_item_height("controller_window", int(right_col_height * 0.30))
 
+def setup_ui():
+    """Membuat context, tema, texture dan layout utama window."""
+    dpg.create_context()
+
+    with dpg.handler_registry():
+        dpg.add_key_press_handler(key=dpg.mvKey_Escape, callback=exit_on_esc)
+        if INSTRUMENTATION_ENABLED:
+            dpg.add_key_press_handler(key=dpg.mvKey_F3, callback=toggle_telemetry_overlay)
+
+    # Definisikan tema global untuk konsistensi
+    with dpg.theme() as global_theme:
+        with dpg.theme_component(dpg.mvAll):
+            dpg.add_theme_style(dpg.mvStyleVar_WindowPadding, APP_PADDING, APP_PADDING)
+            dpg.add_theme_style(dpg.mvStyleVar_FramePadding, 4, 4)
+            dpg.add_theme_style(dpg.mvStyleVar_ItemSpacing, APP_SPACING, APP_SPACING)
+            dpg.add_theme_color(dpg.mvPlotCol_PlotBg, THEME_COLORS["background"])
+    dpg.bind_theme(global_theme)
+
+    # Daftarkan texture dinamis sebelum widget yang memakainya
+    create_waterfall_texture(waterfall_view)
+    if ppi_raster_view is not None:
+        create_ppi_raster_texture(ppi_raster_view)
+
+    # Buat layout utama window
+    with dpg.window(tag="Primary Window"):
+        with dpg.group(horizontal=True):
+            # Kolom kiri (70% lebar)
+            with dpg.group(tag="left_column"):
+                with dpg.child_window(label="PPI Desktop", tag="ppi_window", no_scrollbar=True):
+                    create_ppi_widget(colors=THEME_COLORS)
+                    if ppi_raster_view is not None:
+                        create_ppi_raster_layer(ppi_raster_view)
+                    else:
+                        ppi_renderer.create()
+                with dpg.child_window(label="FFT Desktop", tag="fft_window"):
+                    with dpg.tab_bar():
+                        with dpg.tab(label="Spectrum"):
+                            create_fft_widget()
+                        with dpg.tab(label="Waterfall"):
+                            create_waterfall_widget(waterfall_view, SAMPLE_RATE / 2)
+            # Kolom kanan (sisa lebar)
+            with dpg.group(tag="right_column"):
+                with dpg.child_window(label="File Explorer", tag="file_explorer_window"):
+                    create_file_explorer_widget()
+                with dpg.child_window(label="Sinewave", tag="sinewave_window"):
+                    create_sinewave_widget()
+                with dpg.child_window(label="Controller", tag="controller_window"):
+                    create_controller_widget(on_record=toggle_recording if recorder is not None else None)
+                    if replay_source is not None:
+                        create_replay_controls(replay_source)
+
+    if INSTRUMENTATION_ENABLED:
+        create_telemetry_overlay()
+
+def start_workers():
+    """Memulai worker: thread di proses ini, atau backend multi-proses (DSP_BACKEND)."""
+    global dsp_backend
+    threads.append(threading.Thread(target=ppi_data_worker, args=(ppi_queue, stop_event, detection_queue), daemon=True))
+    if DSP_BACKEND == "process":
+        # Akuisisi & DSP di proses terpisah; hasil masuk ke kanal yang sama dengan mode thread
+        dsp_backend = DSPProcessBackend({
+            "fft": fft_result_queue,
+            "sinewave": sinewave_result_queue,
+            "waterfall": waterfall_result_queue,
+            "detection": detection_queue,
+        })
+        dsp_backend.start()
+    else:
+        threads.append(threading.Thread(target=acquisition_worker, args=(frame_hub, stop_event, replay_source, recorder),
+                                        daemon=True))
+        threads.append(threading.Thread(target=fft_data_worker, args=(fft_frame_queue, fft_result_queue, stop_event), daemon=True))
+        threads.append(threading.Thread(target=sinewave_data_worker, args=(sinewave_frame_queue, sinewave_result_queue, stop_event), daemon=True))
+        threads.append(threading.Thread(target=waterfall_data_worker, args=(waterfall_frame_queue, waterfall_result_queue, stop_event), daemon=True))
+        threads.append(threading.Thread(target=detection_data_worker, args=(detection_frame_queue, detection_queue, stop_event), daemon=True))
+
+    for t in threads:
+        t.start()
+
+    # Kedalaman & drop semua kanal dilaporkan di overlay/dump telemetri
+    for name, channel in [("ppi", ppi_queue), ("fft_results", fft_result_queue),
+                          ("sinewave_results", sinewave_result_queue), ("waterfall_results", waterfall_result_queue),
+                          ("detections", detection_queue), ("fft_frames", fft_frame_queue),
+                          ("sinewave_frames", sinewave_frame_queue), ("waterfall_frames", waterfall_frame_queue)]:
+        telemetry.watch_channel(name, channel)
+    if dsp_backend is not None:
+        telemetry.watch_channel("detection_frames", dsp_backend.detection_frames, sla=True)
+    else:
+        telemetry.watch_channel("detection_frames", detection_frame_queue, sla=True)
+    if dsp_backend is not None:
+        telemetry.watch_channel("dsp_backend", dsp_backend)
+    if recorder is not None:
+        telemetry.watch_channel("recorder", recorder)
+
 # --- Inisialisasi dan Loop Utama --- #
 
-dpg.create_viewport(title='Real-time Radar UI & Spectrum Analyzer', width=1280, height=720)
-dpg.setup_dearpygui()
-dpg.show_viewport()
-dpg.set_primary_window("Primary Window", True)
-dpg.set_viewport_resize_callback(resize_callback)
+def main():
+    global replay_source
+    if ACQUISITION_TRANSPORT == "replay" and DSP_BACKEND != "process":
+        try:
+            replay_source = create_source("replay")
+        except Exception as e:
+            print(f"Error opening replay source: {e}") # acquisition_worker akan mencoba lagi dan melaporkannya
+    setup_ui()
+
+    dpg.create_viewport(title='Real-time Radar UI & Spectrum Analyzer', width=1280, height=720)
+    dpg.setup_dearpygui()
+    dpg.show_viewport()
+    dpg.set_primary_window("Primary Window", True)
+    dpg.set_viewport_resize_callback(resize_callback)
+
+    # Mulai dalam mode fullscreen dan panggil resize sekali untuk mengatur layout awal
+    dpg.toggle_viewport_fullscreen()
+    resize_callback()
 
-# Mulai dalam mode fullscreen dan panggil resize sekali untuk mengatur layout awal
-dpg.toggle_viewport_fullscreen()
-resize_callback()
+    # Buat dan mulai semua worker
+    start_workers()
 
-# Buat dan mulai semua worker thread
-threads.append(threading.Thread(target=ppi_data_worker, args=(ppi_queue, stop_event), daemon=True))
-threads.append(threading.Thread(target=fft_data_worker, args=(fft_result_queue, stop_event), daemon=True))
-threads.append(threading.Thread(target=sinewave_data_worker, args=(sinewave_result_queue, stop_event), daemon=True))
+    # Loop render utama Dear PyGui
+    last_overlay_update = 0
+    last_status_update = 0
+    while dpg.is_dearpygui_running():
+        with telemetry.timer("ui.update"):
+            update_ui_from_queues() # Ambil data dari worker
+        with telemetry.timer("ui.render"):
+            dpg.render_dearpygui_frame() # Gambar frame baru
+        record_frame_latency()
 
-for t in threads:
-    t.start()
+        if INSTRUMENTATION_ENABLED and time.monotonic() - last_overlay_update > 0.5:
+            update_telemetry_overlay(telemetry)
+            last_overlay_update = time.monotonic()
+        if time.monotonic() - last_status_update > 0.5:
+            if recorder is not None:
+                update_recorder_status(recorder)
+            if replay_source is not None:
+                update_replay_status(replay_source)
+            last_status_update = time.monotonic()
 
-# Loop render utama Dear PyGui
-while dpg.is_dearpygui_running():
-    update_ui_from_queues() # Ambil data dari worker
-    dpg.render_dearpygui_frame() # Gambar frame baru
+    # Cleanup setelah loop selesai
+    cleanup_and_exit()
 
-# Cleanup setelah loop selesai
-cleanup_and_exit()
\ No newline at end of file
+# Dilindungi agar proses backend DSP ("spawn") tidak ikut membuat UI saat mengimpor modul ini
+if __name__ == "__main__":
+    main()
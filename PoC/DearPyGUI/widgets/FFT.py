@@ -4,7 +4,8 @@ import dearpygui.dearpygui as dpg
 import os
 
 # Impor konfigurasi terpusat
-from config import FILENAME
+from config import FILENAME, ACQUISITION_CHANNELS
+from widgets.series import add_channel_series
 
 # --- Fungsi Pembuat Widget UI --- #
 
@@ -19,5 +20,4 @@ def create_fft_widget():
             dpg.add_plot_axis(dpg.mvXAxis, label="Frequency (Hz)", tag="fft_xaxis", log_scale=True)
             dpg.set_axis_limits("fft_xaxis", 1e3, 1e7) # Atur batas default
             dpg.add_plot_axis(dpg.mvYAxis, label="Magnitude", tag="fft_yaxis")
-            dpg.add_line_series([], [], label="CH1 (odd)", parent="fft_yaxis", tag="fft_ch1_series")
-            dpg.add_line_series([], [], label="CH2 (even)", parent="fft_yaxis", tag="fft_ch2_series")
\ No newline at end of file
+            add_channel_series("fft", "fft_yaxis", ACQUISITION_CHANNELS)
\ No newline at end of file
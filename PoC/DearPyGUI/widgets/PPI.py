@@ -2,21 +2,16 @@
 
 import dearpygui.dearpygui as dpg
 import numpy as np
-import math
 
 # Impor helper dari lokasi baru
 from functions.data_processing import polar_to_cartesian
+from functions.scan_conversion import arc_points, polar_to_cartesian_array
 
 # --- Helper Khusus UI --- #
 
 def generate_arc_points(center, radius, start_deg, end_deg, segments=100):
     """Menghasilkan titik-titik untuk menggambar busur."""
-    points = []
-    start_rad, end_rad = math.radians(start_deg), math.radians(end_deg)
-    for i in range(segments + 1):
-        angle = start_rad + (end_rad - start_rad) * i / segments
-        points.append((center[0] + radius * math.cos(angle), center[1] + radius * math.sin(angle)))
-    return points
+    return arc_points(center, radius, start_deg, end_deg, segments).tolist()
 
 # --- Fungsi Pembuat Widget UI --- #
 
@@ -55,4 +50,144 @@ def create_ppi_widget(colors: dict):
             dpg.draw_text(pos, f"{angle}", color=colors["text"], size=10)
 
         # Siapkan layer untuk gambar dinamis (sapuan jarum dan target)
-        dpg.add_draw_layer(tag="ppi_dynamic_layer")
\ No newline at end of file
+        dpg.add_draw_layer(tag="ppi_dynamic_layer")
+
+# --- Renderer Dinamis (Retained Mode) --- #
+
+class PPIRenderer:
+    """
+    Menggambar sapuan jarum dan target tanpa membuat/menghapus item setiap frame.
+    Pool polygon jejak sapuan dialokasikan sekali di "ppi_dynamic_layer" dan
+    hanya diubah titik/warnanya lewat configure_item. Semua target digambar
+    sebagai satu scatter series, sehingga jumlah target tidak menambah item.
+
+    Pool dipakai sebagai ring: setiap sudut baru menempati satu slot tetap
+    (slot terlama ditimpa) dan geometri wedge lain tidak pernah disentuh lagi.
+    Alpha dikuantisasi ke `alpha_levels` tingkat, jadi per update hanya wedge
+    yang melewati batas tingkat yang diubah warnanya. Biaya per frame sekitar
+    1 + alpha_levels configure_item, tidak bergantung pada panjang jejak (360).
+    """
+
+    def __init__(self, colors: dict, max_radius=100, trail_length=20, beam_width_deg=1.0, alpha_levels=16):
+        self.colors = colors
+        self.max_radius = max_radius
+        self.trail_length = trail_length
+        self.half_beam = beam_width_deg / 2
+        self.alpha_levels = alpha_levels
+        self._wedge_tags = []
+        self._slot_index = np.full(trail_length, -1, dtype=np.int64) # Nomor sudut di tiap slot (-1 = kosong)
+        self._slot_level = np.zeros(trail_length, dtype=np.int64)    # Tingkat alpha yang sedang tampil
+        self._sweep_count = 0
+        self._targets_ref = None
+
+    def create(self):
+        """Membuat pool item. Dipanggil sekali setelah create_ppi_widget."""
+        for _ in range(self.trail_length):
+            tag = dpg.draw_polygon(points=[(0, 0)] * 3, color=(0, 0, 0, 0), fill=(0, 0, 0, 0),
+                                   parent="ppi_dynamic_layer", show=False)
+            self._wedge_tags.append(tag)
+
+        dpg.add_scatter_series([], [], parent="ppi_yaxis", tag="ppi_target_series")
+        with dpg.theme() as target_theme:
+            with dpg.theme_component(dpg.mvScatterSeries):
+                dpg.add_theme_color(dpg.mvPlotCol_MarkerFill, self.colors["target"], category=dpg.mvThemeCat_Plots)
+                dpg.add_theme_color(dpg.mvPlotCol_MarkerOutline, self.colors["target"], category=dpg.mvThemeCat_Plots)
+                dpg.add_theme_style(dpg.mvPlotStyleVar_Marker, dpg.mvPlotMarker_Circle, category=dpg.mvThemeCat_Plots)
+                dpg.add_theme_style(dpg.mvPlotStyleVar_MarkerSize, 3, category=dpg.mvThemeCat_Plots)
+        dpg.bind_item_theme("ppi_target_series", target_theme)
+
+    def update(self, angles, targets, sweep_count):
+        """
+        Memperbarui jejak sapuan dan daftar target (angle, radius). `angles` adalah
+        riwayat sudut (terlama -> terbaru) dan `sweep_count` jumlah total sudut yang
+        pernah dihasilkan worker, sehingga update yang terlewat tetap tergambar.
+        """
+        self._update_trail(angles, sweep_count)
+        if targets is not self._targets_ref:
+            self._update_targets(targets)
+            self._targets_ref = targets
+
+    def _update_trail(self, angles, sweep_count):
+        if sweep_count < self._sweep_count:
+            self._slot_index[:] = -1 # Worker mulai ulang: semua slot dianggap kosong
+            self._sweep_count = 0
+        new = min(sweep_count - self._sweep_count, len(angles), self.trail_length)
+        self._sweep_count = sweep_count
+
+        if new > 0:
+            # Geometri hanya untuk sudut baru, masing-masing ke slot ring-nya sendiri
+            fresh = np.asarray(angles[-new:], dtype=np.float64)
+            left_x, left_y = polar_to_cartesian_array(fresh - self.half_beam, self.max_radius)
+            right_x, right_y = polar_to_cartesian_array(fresh + self.half_beam, self.max_radius)
+            for i in range(new):
+                index = sweep_count - new + i
+                slot = index % self.trail_length
+                dpg.configure_item(self._wedge_tags[slot], show=True,
+                                   points=[(0, 0), (left_x[i], left_y[i]), (right_x[i], right_y[i])])
+                self._slot_index[slot] = index
+                self._slot_level[slot] = 0 # Paksa warna ditulis di bawah
+
+        # Wedge terbaru paling terang; alpha turun linear menurut umur, dikuantisasi
+        count = min(sweep_count, self.trail_length)
+        if count == 0:
+            return
+        filled = self._slot_index >= 0
+        ages = sweep_count - 1 - self._slot_index
+        levels = np.where(filled, -(-self.alpha_levels * (count - ages) // count), 0)
+        accent = self.colors["accent"][:3]
+        for slot in np.flatnonzero(levels != self._slot_level):
+            level = int(levels[slot])
+            if level <= 0:
+                dpg.configure_item(self._wedge_tags[slot], show=False)
+            else:
+                color = (*accent, 255 * level // self.alpha_levels)
+                dpg.configure_item(self._wedge_tags[slot], color=color, fill=color)
+            self._slot_level[slot] = level
+
+    def _update_targets(self, targets):
+        if len(targets) == 0:
+            dpg.set_value("ppi_target_series", [[], []])
+            return
+        polar = np.asarray(targets, dtype=np.float64)
+        dpg.set_value("ppi_target_series", list(polar_to_cartesian_array(polar[:, 0], polar[:, 1])))
+
+
+# --- Mode Raster (Persistence Fosfor) --- #
+
+class PPIRasterView:
+    """
+    Menampilkan PhosphorBuffer lewat satu raw texture yang dialokasikan sekali.
+    Warna RGB texture tetap (warna aksen); setiap render hanya channel alpha
+    yang ditulis dari intensitas, sehingga latar PPI statis tetap terlihat.
+    """
+
+    def __init__(self, phosphor, colors: dict):
+        self.phosphor = phosphor
+        height, width = phosphor.intensity.shape
+        self.texture_data = np.zeros(height * width * 4, dtype=np.float32)
+        self._texture_pixels = self.texture_data.reshape(height, width, 4)
+        self._texture_pixels[..., :3] = np.asarray(colors["accent"][:3], dtype=np.float32) / 255
+        self._alpha_scale = colors["accent"][3] / 255
+
+    def update(self, ppi_data):
+        """Peluruhan satu frame lalu melukis sektor yang baru disapu."""
+        self.phosphor.step()
+        self.phosphor.paint(ppi_data["previous_angle"], ppi_data["angle"], ppi_data["returns"])
+
+    def render(self, texture_tag):
+        np.multiply(self.phosphor.intensity, self._alpha_scale, out=self._texture_pixels[..., 3])
+        dpg.set_value(texture_tag, self.texture_data)
+
+def create_ppi_raster_texture(view: PPIRasterView):
+    """Mendaftarkan raw texture PPI raster. Dipanggil sebelum widget dibuat."""
+    height, width = view.phosphor.intensity.shape
+    with dpg.texture_registry():
+        dpg.add_raw_texture(width=width, height=height, default_value=view.texture_data,
+                            format=dpg.mvFormat_Float_rgba, tag="ppi_raster_texture")
+
+def create_ppi_raster_layer(view: PPIRasterView):
+    """Menambahkan citra raster di atas latar PPI (dipanggil setelah create_ppi_widget)."""
+    max_range = view.phosphor.max_range
+    # Baris 0 texture = jarak maksimum, jadi tampil di atas (uv default)
+    dpg.add_image_series("ppi_raster_texture", bounds_min=(-max_range, 0), bounds_max=(max_range, max_range),
+                         parent="ppi_yaxis", tag="ppi_raster_series")
@@ -2,6 +2,9 @@
 
 import dearpygui.dearpygui as dpg
 
+from config import ACQUISITION_CHANNELS
+from widgets.series import add_channel_series
+
 # --- Fungsi Pembuat Widget UI --- #
 
 def create_sinewave_widget():
@@ -13,5 +16,4 @@ def create_sinewave_widget():
             dpg.add_plot_legend()
             dpg.add_plot_axis(dpg.mvXAxis, label="Time (s)", tag="sinewave_xaxis")
             dpg.add_plot_axis(dpg.mvYAxis, label="Amplitude", tag="sinewave_yaxis")
-            dpg.add_line_series([], [], label="CH1 (odd)", parent="sinewave_yaxis", tag="sinewave_ch1_series")
-            dpg.add_line_series([], [], label="CH2 (even)", parent="sinewave_yaxis", tag="sinewave_ch2_series")
\ No newline at end of file
+            add_channel_series("sinewave", "sinewave_yaxis", ACQUISITION_CHANNELS)
\ No newline at end of file
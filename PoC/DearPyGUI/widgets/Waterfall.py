@@ -0,0 +1,72 @@
+# widgets/Waterfall.py
+
+import dearpygui.dearpygui as dpg
+import numpy as np
+
+# --- State Tampilan --- #
+
+class WaterfallView:
+    """
+    Menyimpan riwayat baris RGBA dalam ring buffer tetap dan menyalinnya
+    (terbaru di atas) ke satu raw texture yang dialokasikan sekali.
+    Tidak ada alokasi baru per update; hanya dua salinan slice ke texture.
+    """
+
+    def __init__(self, n_bins, depth):
+        self.n_bins = n_bins
+        self.depth = depth
+        self._ring = np.zeros((depth, n_bins, 4), dtype=np.float32)
+        self._ring[..., 3] = 1.0
+        self._head = 0
+        # Buffer texture datar yang dipakai langsung oleh Dear PyGui (raw texture)
+        self.texture_data = np.zeros(depth * n_bins * 4, dtype=np.float32)
+        self._texture_rows = self.texture_data.reshape(depth, n_bins, 4)
+        self._dirty = False
+
+    def push_rows(self, rows):
+        """Menambahkan baris RGBA baru (k, bins, 4) ke ring."""
+        rows = rows[-self.depth:]
+        k = len(rows)
+        if k == 0:
+            return
+        first = min(k, self.depth - self._head)
+        self._ring[self._head:self._head + first] = rows[:first]
+        self._ring[:k - first] = rows[first:]
+        self._head = (self._head + k) % self.depth
+        self._dirty = True
+
+    def render(self, texture_tag):
+        """Menyalin ring ke texture (baris 0 = terbaru) jika ada data baru."""
+        if not self._dirty:
+            return
+        head = self._head
+        if head > 0:
+            np.copyto(self._texture_rows[:head], self._ring[head - 1::-1])
+            np.copyto(self._texture_rows[head:], self._ring[:head - 1:-1])
+        else:
+            np.copyto(self._texture_rows, self._ring[::-1])
+        dpg.set_value(texture_tag, self.texture_data)
+        self._dirty = False
+
+# --- Fungsi Pembuat Widget UI --- #
+
+def create_waterfall_texture(view: WaterfallView):
+    """Mendaftarkan raw texture waterfall. Dipanggil sebelum widget dibuat."""
+    with dpg.texture_registry():
+        dpg.add_raw_texture(width=view.n_bins, height=view.depth, default_value=view.texture_data,
+                            format=dpg.mvFormat_Float_rgba, tag="waterfall_texture")
+
+def create_waterfall_widget(view: WaterfallView, max_frequency):
+    """Membuat widget UI untuk spektrogram/waterfall."""
+    with dpg.group():
+        dpg.add_text("Waiting for STFT columns...", tag="waterfall_status_text")
+
+        with dpg.plot(label="Waterfall", height=-1, width=-1, tag="waterfall_plot"):
+            dpg.add_plot_axis(dpg.mvXAxis, label="Frequency (Hz)", tag="waterfall_xaxis")
+            with dpg.plot_axis(dpg.mvYAxis, label="History (terbaru di atas)", tag="waterfall_yaxis",
+                               no_tick_labels=True):
+                # uv default memetakan baris 0 texture (terbaru) ke tepi atas bounds
+                dpg.add_image_series("waterfall_texture", bounds_min=(0, 0), bounds_max=(max_frequency, view.depth),
+                                     tag="waterfall_series")
+            dpg.set_axis_limits("waterfall_xaxis", 0, max_frequency)
+            dpg.set_axis_limits("waterfall_yaxis", 0, view.depth)
@@ -1,12 +1,61 @@
 # UI/widgets/controller.py
 import dearpygui.dearpygui as dpg
 
-def create_controller_widget():
-    """Membuat widget untuk Controller."""
+def create_controller_widget(on_record=None):
+    """
+    Membuat widget untuk Controller. `on_record` dipanggil saat tombol Record
+    ditekan; None jika perekaman tidak tersedia (tombol dinonaktifkan).
+    """
     with dpg.group():
         dpg.add_text("System Controls")
         dpg.add_button(label="Start", width=-1)
         dpg.add_button(label="Stop", width=-1)
         dpg.add_separator()
+        dpg.add_button(label="Record", tag="record_button", width=-1, callback=on_record,
+                       enabled=on_record is not None)
+        dpg.add_text("Recorder idle" if on_record is not None else "Recording unavailable (process backend)",
+                     tag="record_status")
+        dpg.add_separator()
         dpg.add_slider_float(label="Gain", default_value=1.0, max_value=10.0)
-        dpg.add_input_text(label="IP Address", default_value="127.0.0.1")
\ No newline at end of file
+        dpg.add_input_text(label="IP Address", default_value="127.0.0.1")
+
+def update_recorder_status(recorder):
+    """Memperbarui label tombol dan status perekam (dipanggil berkala dari loop render)."""
+    if recorder.recording:
+        stats = recorder.stats()
+        dpg.set_item_label("record_button", "Stop Recording")
+        dpg.set_value("record_status", f"REC {stats['get']} frames, {stats['bytes'] / 1e6:.1f} MB, "
+                                       f"{stats['dropped']} dropped")
+    else:
+        dpg.set_item_label("record_button", "Record")
+
+# --- Kontrol Replay --- #
+
+REPLAY_SPEEDS = {"0.25x": 0.25, "0.5x": 0.5, "1x": 1.0, "2x": 2.0, "4x": 4.0, "10x": 10.0, "max": 0}
+
+def _toggle_replay_pause(replay):
+    if replay.paused:
+        replay.resume()
+    else:
+        replay.pause()
+
+def create_replay_controls(replay):
+    """Kontrol pemutaran untuk ReplaySource: pause/step, loop, kecepatan dan posisi frame."""
+    speed_label = next((label for label, speed in REPLAY_SPEEDS.items() if speed == replay.speed), "1x")
+    with dpg.group():
+        dpg.add_separator()
+        dpg.add_text("Replay")
+        with dpg.group(horizontal=True):
+            dpg.add_button(label="Pause", tag="replay_pause_button", callback=lambda: _toggle_replay_pause(replay))
+            dpg.add_button(label="Step", callback=lambda: replay.step())
+            dpg.add_checkbox(label="Loop", default_value=replay.loop,
+                             callback=lambda sender, value: setattr(replay, "loop", value))
+        dpg.add_combo(list(REPLAY_SPEEDS), label="Speed", default_value=speed_label,
+                      callback=lambda sender, value: replay.set_speed(REPLAY_SPEEDS[value]))
+        dpg.add_slider_int(label="Frame", tag="replay_position", min_value=0, max_value=len(replay) - 1,
+                           callback=lambda sender, value: replay.seek(value))
+
+def update_replay_status(replay):
+    dpg.set_item_label("replay_pause_button", "Play" if replay.paused else "Pause")
+    if not dpg.is_item_active("replay_position"): # Jangan menimpa slider yang sedang digeser
+        dpg.set_value("replay_position", min(replay.position, len(replay) - 1))
@@ -0,0 +1,70 @@
+# widgets/series.py
+
+import dearpygui.dearpygui as dpg
+import numpy as np
+
+# --- Lapisan Update Series --- #
+
+class SeriesUpdater:
+    """
+    Mengirim data ke satu line series Dear PyGui tanpa konversi .tolist().
+
+    Array NumPy diteruskan langsung (Dear PyGui membacanya lewat buffer protocol).
+    Jika sumbu x tidak berubah (x_key sama dengan update sebelumnya), hanya
+    y yang dikirim lewat configure_item. Frame yang tidak berubah sudah
+    disaring WaveformDecimator.update() (mengembalikan None), jadi tidak ada
+    pengecekan versi di sini.
+    """
+
+    def __init__(self, tag):
+        self.tag = tag
+        self._x_key = None
+
+    def update(self, x, y, x_key=None):
+        """Mengirim (x, y) ke series."""
+        y = np.ascontiguousarray(y, dtype=np.float64)
+        if x_key is not None and x_key == self._x_key:
+            dpg.configure_item(self.tag, y=y)
+        else:
+            dpg.set_value(self.tag, [np.ascontiguousarray(x, dtype=np.float64), y])
+            self._x_key = x_key
+
+    def clear(self):
+        dpg.set_value(self.tag, [[], []])
+        self._x_key = None
+
+# --- Series per Channel --- #
+
+def channel_series_tag(prefix, channel):
+    return f"{prefix}_ch{channel + 1}_series"
+
+def add_channel_series(prefix, parent, channels):
+    """Membuat satu line series per channel di axis `parent` (tag: <prefix>_ch<N>_series)."""
+    for channel in range(channels):
+        dpg.add_line_series([], [], label=f"CH{channel + 1}", parent=parent, tag=channel_series_tag(prefix, channel))
+
+class ChannelSeriesSet:
+    """
+    SeriesUpdater untuk semua channel sebuah plot. Series awal dibuat widget
+    (add_channel_series dengan ACQUISITION_CHANNELS); jika hasil membawa lebih
+    banyak channel, series baru ditambahkan ke axis `parent` alih-alih channel
+    sisanya terpotong diam-diam. Series milik channel yang tidak ada lagi dikosongkan.
+    """
+
+    def __init__(self, prefix, parent, channels):
+        self.prefix = prefix
+        self.parent = parent
+        self.updaters = [SeriesUpdater(channel_series_tag(prefix, channel)) for channel in range(channels)]
+        self._active = 0
+
+    def update(self, decimated, x_key=None):
+        """`decimated` berisi (x, y) per channel, urut sesuai channel."""
+        for channel, (x, y) in enumerate(decimated):
+            if channel == len(self.updaters):
+                dpg.add_line_series([], [], label=f"CH{channel + 1}", parent=self.parent,
+                                    tag=channel_series_tag(self.prefix, channel))
+                self.updaters.append(SeriesUpdater(channel_series_tag(self.prefix, channel)))
+            self.updaters[channel].update(x, y, x_key=x_key)
+        for updater in self.updaters[len(decimated):self._active]:
+            updater.clear()
+        self._active = len(decimated)
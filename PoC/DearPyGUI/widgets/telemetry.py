@@ -0,0 +1,39 @@
+# widgets/telemetry.py
+
+import dearpygui.dearpygui as dpg
+
+# --- Fungsi Pembuat Widget UI --- #
+
+def create_telemetry_overlay():
+    """Membuat jendela overlay telemetri (mengambang di atas layout utama)."""
+    with dpg.window(label="Telemetry", tag="telemetry_window", pos=(20, 20), width=560, height=420,
+                    no_collapse=True, no_focus_on_appearing=True):
+        dpg.add_text("Collecting...", tag="telemetry_text")
+
+def toggle_telemetry_overlay():
+    dpg.configure_item("telemetry_window", show=not dpg.is_item_shown("telemetry_window"))
+
+def format_telemetry(snapshot):
+    """Menyusun snapshot Telemetry menjadi teks tabel berlebar tetap."""
+    lines = [f"Uptime: {snapshot['uptime_s']:.1f} s"]
+    # Kanal lossless yang kehilangan pesan (mis. detektor tertinggal dari akuisisi)
+    for name, dropped in snapshot.get("sla_violations", {}).items():
+        lines.append(f"SLA VIOLATION: {name} lost {dropped} frames")
+    lines += ["", f"{'Stage':<24}{'n':>7}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}  (ms)"]
+    for name, stage in snapshot["stages"].items():
+        lines.append(f"{name:<24}{stage['count']:>7}{stage['p50_ms']:>9.2f}{stage['p90_ms']:>9.2f}"
+                     f"{stage['p99_ms']:>9.2f}{stage['max_ms']:>9.2f}")
+
+    lines += ["", f"{'Counter':<32}{'value':>10}"]
+    for name, value in snapshot["counters"].items():
+        lines.append(f"{name:<32}{value:>10}")
+
+    lines += ["", f"{'Channel':<20}{'put':>9}{'get':>9}{'dropped':>9}{'depth':>7}"]
+    for name, stats in snapshot["channels"].items():
+        lines.append(f"{name:<20}{stats.get('put', 0):>9}{stats.get('get', 0):>9}"
+                     f"{stats.get('dropped', 0):>9}{stats.get('depth', 0):>7}")
+    return "\n".join(lines)
+
+def update_telemetry_overlay(telemetry):
+    if dpg.is_item_shown("telemetry_window"):
+        dpg.set_value("telemetry_text", format_telemetry(telemetry.snapshot()))
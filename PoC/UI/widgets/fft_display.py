@@ -21,6 +21,8 @@ class FFTDesktopWidget(BaseWidget):
         self.data_file_path = "../data.bin"
         self.sample_rate = 20_000_000  # 20 MHz
         self.refresh_interval_ms = 100 # Refresh setiap 100 ms (10 FPS)
+        # Satu warna per channel interleaved dalam file
+        self.channel_colors = ['#FF5733', '#33CFFF']
 
         # Setup Canvas Matplotlib
         self.figure = Figure(figsize=(5, 3), facecolor='#303030')
@@ -86,26 +88,18 @@ class FFTDesktopWidget(BaseWidget):
                     ha='center', va='center', color='orange', fontsize=12)
             n_buffer = len(values)
         else:
-            # Proses FFT seperti biasa
-            ch1 = values[::2]
-            ch2 = values[1::2]
-            ch1 = ch1 - np.mean(ch1)
-            ch2 = ch2 - np.mean(ch2)
-
-            def compute_fft(channel, sample_rate):
-                n = len(channel)
-                if n == 0: return np.array([]), np.array([]), 0
-                fft_vals = np.fft.fft(channel)
-                mag = np.abs(fft_vals)[:n//2]
-                freqs = np.fft.fftfreq(n, d=1/self.sample_rate)[:n//2]
-                return freqs, mag, n
-
-            freqs_ch1, mag_ch1, n1 = compute_fft(ch1, self.sample_rate)
-            freqs_ch2, mag_ch2, n2 = compute_fft(ch2, self.sample_rate)
-
-            ax.plot(freqs_ch1, mag_ch1, color='#FF5733', label='CH1')
-            ax.plot(freqs_ch2, mag_ch2, color='#33CFFF', label='CH2')
-            n_buffer = n1 if n1 > 0 else len(values)
+            # Proses FFT untuk semua channel sekaligus (tanpa loop per channel)
+            n_channels = len(self.channel_colors)
+            n = len(values) // n_channels
+            channels = values[:n * n_channels].reshape(n, n_channels).T
+            channels = channels - channels.mean(axis=1, keepdims=True)
+
+            mags = np.abs(np.fft.rfft(channels, axis=1))[:, :n//2]
+            freqs = np.fft.rfftfreq(n, d=1/self.sample_rate)[:n//2]
+
+            for index, (mag, color) in enumerate(zip(mags, self.channel_colors)):
+                ax.plot(freqs, mag, color=color, label=f'CH{index + 1}')
+            n_buffer = n if n > 0 else len(values)
         
         # Pengaturan Tampilan Plot
         freq_res = self.sample_rate / n_buffer if n_buffer > 0 else 0